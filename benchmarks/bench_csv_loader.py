@@ -0,0 +1,66 @@
+"""Compare serial and process-pool CSV parsing to find where parallelism pays off.
+
+Usage::
+
+    python benchmarks/bench_csv_loader.py --rows 1000 5000 20000 50000 --workers 2 4
+
+For every feed size the script prints the best-of-N wall time of the serial
+loader and of each worker count, and reports the smallest size at which a
+parallel run beat the serial one (the crossover point).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from izzy_uploader.csv_loader import DEFAULT_CHUNK_SIZE, load_vehicles_from_csv
+from synthetic_feed import write_feed
+
+
+def time_load(path: Path, workers: int, chunk_size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        vehicles, errors = load_vehicles_from_csv(path, workers=workers, chunk_size=chunk_size)
+        best = min(best, time.perf_counter() - started)
+        assert vehicles and not errors
+    return best
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, os.cpu_count() or 2])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    worker_counts = sorted(set(args.workers))
+    print(f"{'rows':>8} {'serial':>9} " + " ".join(f"{f'{w} procs':>9}" for w in worker_counts))
+    crossover: Dict[int, int] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sorted(args.rows):
+            path = Path(tmp) / f"feed_{rows}.csv"
+            write_feed(path, rows)
+            serial = time_load(path, 1, args.chunk_size, args.repeat)
+            timings: List[float] = []
+            for workers in worker_counts:
+                elapsed = time_load(path, workers, args.chunk_size, args.repeat)
+                timings.append(elapsed)
+                if elapsed < serial:
+                    crossover.setdefault(workers, rows)
+            print(f"{rows:>8} {serial:>8.3f}s " + " ".join(f"{t:>8.3f}s" for t in timings))
+
+    for workers in worker_counts:
+        if workers in crossover:
+            print(f"{workers} processes beat the serial loader from {crossover[workers]} rows")
+        else:
+            print(f"{workers} processes never beat the serial loader in this range")
+
+
+if __name__ == "__main__":
+    main()
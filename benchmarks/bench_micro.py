@@ -0,0 +1,112 @@
+"""Micro-benchmarks of the per-vehicle hot paths of a synchronisation.
+
+Usage::
+
+    python benchmarks/bench_micro.py --rows 2000 --fleet 10000 --output results/micro.json
+
+Each case reports the best-of-``--repeat`` time per operation: row cleaning,
+model construction and payload serialisation per vehicle, and saving/loading
+the JSON state file for a fleet of ``--fleet`` vehicles.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from izzy_uploader.models import vehicle_from_row
+from izzy_uploader.normalizers import clean_row
+from izzy_uploader.state import VehicleStateStore
+from results import save_results
+from synthetic_feed import feed_rows
+
+
+def measure(name: str, operation: Callable[[], Any], *, operations: int, repeat: int) -> Dict[str, Any]:
+    """Time *operation* (which performs *operations* units of work) best-of-*repeat*."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    result = {
+        "name": name,
+        "operations": operations,
+        "seconds": best / operations,
+        "per_second": operations / best if best else None,
+    }
+    print(f"{name:<28} {best / operations * 1e6:>10.2f} us/op {result['per_second']:>12,.0f} op/s")
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--fleet", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    raw_rows = list(feed_rows(args.rows, seed=args.seed))
+    cleaned_rows = [clean_row(row) for row in raw_rows]
+    vehicles = [vehicle_from_row(row) for row in cleaned_rows]
+    results: List[Dict[str, Any]] = [
+        measure(
+            "clean_row",
+            lambda: [clean_row(row) for row in raw_rows],
+            operations=len(raw_rows),
+            repeat=args.repeat,
+        ),
+        measure(
+            "vehicle_from_row",
+            lambda: [vehicle_from_row(row) for row in cleaned_rows],
+            operations=len(cleaned_rows),
+            repeat=args.repeat,
+        ),
+        measure(
+            "to_api_payload",
+            lambda: [vehicle.to_api_payload() for vehicle in vehicles],
+            operations=len(vehicles),
+            repeat=args.repeat,
+        ),
+        measure(
+            "payload_fingerprint",
+            lambda: [vehicle.payload_fingerprint() for vehicle in vehicles],
+            operations=len(vehicles),
+            repeat=args.repeat,
+        ),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state.json"
+        store = VehicleStateStore(path)
+        for index in range(args.fleet):
+            store.upsert(
+                f"SYN{index:014d}", f"car-{index}", f"CONF{index:07d}", payload_hash=f"{index:064x}"
+            )
+        results.append(
+            measure(
+                "VehicleStateStore.save",
+                store.save,
+                operations=1,
+                repeat=args.repeat,
+            )
+        )
+        results.append(
+            measure(
+                "VehicleStateStore._load",
+                lambda: VehicleStateStore(path),
+                operations=1,
+                repeat=args.repeat,
+            )
+        )
+
+    if args.output:
+        save_results(args.output, "micro", vars(args) | {"output": str(args.output)}, results)
+
+
+if __name__ == "__main__":
+    main()
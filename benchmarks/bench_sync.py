@@ -0,0 +1,113 @@
+"""End-to-end synchronisation benchmark against the local stub API.
+
+Usage::
+
+    python benchmarks/bench_sync.py --vehicles 1000 5000 --workers 1 8 \\
+        --latency lognormal:0.02,0.5 --output results/sync.json
+
+For every feed size and worker count the script replays a day of partner
+updates through the real CSV loader, HTTP client and state store:
+
+``initial``   first import, every vehicle is created;
+``noop``      the same feed again, nothing is sent;
+``update``    a new revision re-pricing ``--changed-ratio`` of the vehicles;
+``close``     the last 5% of vehicles disappear from the feed (close-missing).
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from izzy_uploader.client import IzzyleaseClient
+from izzy_uploader.csv_loader import load_vehicles_from_csv
+from izzy_uploader.pipelines.import_pipeline import VehicleSynchronizer
+from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.stub_server import LatencyModel, StubApiServer
+from results import save_results
+from synthetic_feed import write_feed
+
+CLOSED_SHARE = 0.05
+
+
+def run_scenario(
+    stub: StubApiServer, workdir: Path, vehicles: int, workers: int, args: argparse.Namespace
+) -> List[Dict[str, Any]]:
+    stub.reset()
+    state_file = workdir / f"state_{vehicles}_{workers}.json"
+    state_store = VehicleStateStore(state_file)
+    kept = vehicles - int(vehicles * CLOSED_SHARE)
+    phases = [
+        ("initial", vehicles, 0, False),
+        ("noop", vehicles, 0, False),
+        ("update", vehicles, 1, False),
+        ("close", kept, 1, True),
+    ]
+    results: List[Dict[str, Any]] = []
+    with IzzyleaseClient(stub.service_config(state_file, pool_size=max(workers, 1))) as client:
+        synchronizer = VehicleSynchronizer(client, state_store, max_workers=workers)
+        for phase, rows, revision, close_missing in phases:
+            feed = workdir / f"feed_{rows}_{revision}.csv"
+            if not feed.exists():
+                write_feed(
+                    feed, rows, seed=args.seed, revision=revision, changed_ratio=args.changed_ratio
+                )
+            stub.stats.reset()
+            started = time.perf_counter()
+            parsed, errors = load_vehicles_from_csv(feed)
+            parsed_at = time.perf_counter()
+            report = synchronizer.run(parsed, close_missing=close_missing)
+            state_store.save()
+            finished = time.perf_counter()
+            stats = stub.stats.snapshot()
+            result = {
+                "name": f"{phase}/{vehicles}/{workers}",
+                "phase": phase,
+                "vehicles": vehicles,
+                "workers": workers,
+                "seconds": finished - started,
+                "parse_seconds": parsed_at - started,
+                "sync_seconds": finished - parsed_at,
+                "vehicles_per_second": rows / (finished - started),
+                "requests": stats["total_requests"],
+                "max_in_flight": stats["max_in_flight"],
+                "report": report.as_dict(),
+                "row_errors": len(errors),
+            }
+            results.append(result)
+            print(
+                f"{phase:<8} {vehicles:>7} {workers:>4} {result['seconds']:>9.3f}s "
+                f"{result['parse_seconds']:>8.3f}s {result['requests']:>9} "
+                f"{result['vehicles_per_second']:>10,.0f}"
+            )
+    state_store.close()
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency", default="0.01", help="stub latency model, e.g. uniform:0.01,0.05")
+    parser.add_argument("--changed-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    print(f"{'phase':<8} {'vehicles':>7} {'wrk':>4} {'total':>10} {'parse':>9} {'requests':>9} {'veh/s':>10}")
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp, StubApiServer(
+        latency=LatencyModel.parse(args.latency), seed=args.seed
+    ) as stub:
+        for vehicles in args.vehicles:
+            for workers in args.workers:
+                results.extend(run_scenario(stub, Path(tmp), vehicles, workers, args))
+
+    if args.output:
+        save_results(args.output, "sync", vars(args) | {"output": str(args.output)}, results)
+
+
+if __name__ == "__main__":
+    main()
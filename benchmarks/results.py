@@ -0,0 +1,106 @@
+"""Storage and comparison of benchmark results.
+
+Every benchmark writes one JSON document: the environment it ran in, its
+parameters and a list of results, each identified by ``name`` and carrying a
+``seconds`` measurement. Two such files can be compared to spot regressions::
+
+    python benchmarks/results.py baseline.json current.json --threshold 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code revision the benchmark ran on."""
+
+    try:
+        version: Optional[str] = metadata.version("izzy-uploader")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "izzy_uploader": version,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(
+    path: Path, benchmark: str, parameters: Dict[str, Any], results: List[Dict[str, Any]]
+) -> None:
+    document = {
+        "benchmark": benchmark,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "parameters": parameters,
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Results written to {path}")
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], *, threshold: float = 0.1
+) -> List[str]:
+    """Return a line per result slower than *baseline* by more than *threshold*."""
+
+    previous = {result["name"]: result["seconds"] for result in baseline["results"]}
+    regressions: List[str] = []
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if not before:
+            continue
+        change = result["seconds"] / before - 1
+        if change > threshold:
+            regressions.append(
+                f"{result['name']}: {before:.6f}s -> {result['seconds']:.6f}s ({change:+.0%})"
+            )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, threshold=args.threshold)
+    for line in regressions:
+        print(line)
+    if regressions:
+        sys.exit(1)
+    print(f"No result slower than {args.threshold:.0%} compared to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Deterministic generator of partner-style vehicle CSV feeds for benchmarks.
+
+The feed follows ``_Planning/izzylease_lista_pol_import_pojazdow.csv``: Polish
+enum spellings, literal ``NULL`` values, comma decimals and timestamps in
+``availableFrom``. The same ``seed`` always produces the same file, and a
+``revision`` re-prices a ``changed_ratio`` share of the vehicles, so a pair of
+feeds models a day-to-day partner update.
+
+Usage::
+
+    python benchmarks/synthetic_feed.py feed.csv --rows 10000 --seed 1
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+
+COLUMNS = [
+    "configurationNumber",
+    "vin",
+    "category",
+    "make",
+    "model",
+    "manufactureYear",
+    "mileage",
+    "engineCode",
+    "cubicCapacity",
+    "acceleration",
+    "fuelType",
+    "power",
+    "transmissionType",
+    "driveWheels",
+    "type",
+    "carClass",
+    "doors",
+    "color",
+    "availableFrom",
+    "firstRegistrationDate",
+    "description",
+    "pricing_listPrice",
+    "pricing_salesPrice",
+    "pricing_miniPrice",
+    "locationId",
+]
+MODELS = [
+    ("Kia", "Sportage"),
+    ("Kia", "Ceed"),
+    ("Suzuki", "Sx4"),
+    ("Toyota", "Corolla"),
+    ("Skoda", "Octavia"),
+    ("BMW", "Seria 3"),
+    ("Volkswagen", "Passat"),
+    ("Renault", "Trafic"),
+]
+CATEGORIES = ["osobowy", "osobowy", "osobowy", "dostawczy"]
+FUELS = [
+    "ETYLINA",
+    "Benzyna",
+    "Olej napędowy",
+    "HYBRYDA (ETYLINA + NAPĘD ELEKTR.)",
+    "Elektryczny",
+    "LPG",
+]
+GEARBOXES = [
+    "Manualna",
+    "Automatyczna hydrauliczna (klasyczna)",
+    "Automatyczna dwusprzęgłowa (DCT, DSG)",
+]
+DRIVES = ["Na przednie koła", "Na tylne koła", "4x4 (stały)", "4x4 (automatyczny)"]
+TYPES = ["SUV", "Kombi", "Sedan", "Hatchback", "Coupe", "Minivan", "Van"]
+CAR_CLASSES = ["NULL", "NULL", "", "Business", "Family"]
+COLORS = ["Niebieski", "Srebrny", "Czarny", "Biały", "Czerwony", "Szary"]
+EQUIPMENT = ["ABS", "ASR", "ESP", "Klimatyzacja", "Nawigacja", "Kamera cofania", "Tempomat"]
+ENGINE_CODES = ["NULL", "", "B48", "G4FJ", "1.5 TSI", "D4FE"]
+LOCATIONS = ["128", "129", "204", "NULL"]
+
+
+def feed_rows(
+    count: int, *, seed: int = 0, revision: int = 0, changed_ratio: float = 0.0
+) -> Iterator[Dict[str, str]]:
+    """Yield *count* raw CSV rows; vehicle ``i`` is identical across calls."""
+
+    for index in range(count):
+        yield _row(index, seed, revision, changed_ratio)
+
+
+def write_feed(
+    path: Path,
+    rows: int,
+    *,
+    seed: int = 0,
+    revision: int = 0,
+    changed_ratio: float = 0.0,
+) -> None:
+    """Write a feed of *rows* distinct vehicles to *path*."""
+
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(
+            feed_rows(rows, seed=seed, revision=revision, changed_ratio=changed_ratio)
+        )
+
+
+# -- internals --------------------------------------------------
+def _row(index: int, seed: int, revision: int, changed_ratio: float) -> Dict[str, str]:
+    # Seeding per vehicle keeps each row stable regardless of the feed size.
+    rng = random.Random(f"{seed}:{index}")
+    make, model = rng.choice(MODELS)
+    year = rng.randint(2014, 2025)
+    list_price = rng.randrange(40_000, 400_000, 100)
+    sales_price = list_price - rng.randrange(0, 20_000, 100)
+    if revision and random.Random(f"{seed}:{index}:{revision}").random() < changed_ratio:
+        sales_price -= 500 * revision
+    equipment = rng.sample(EQUIPMENT, rng.randint(0, 5))
+    return {
+        "configurationNumber": f"AAU{seed % 100:02d}{index:07d}IE",
+        "vin": f"SYN{seed % 100:02d}{index:012d}",
+        "category": rng.choice(CATEGORIES),
+        "make": make,
+        "model": model,
+        "manufactureYear": str(year),
+        "mileage": _number(rng, rng.randint(5, 250_000), decimals=rng.random() < 0.5),
+        "engineCode": rng.choice(ENGINE_CODES),
+        "cubicCapacity": _number(rng, rng.choice([998, 1373, 1498, 1591, 1998, 2487])),
+        "acceleration": rng.choice(["NULL", "", f"{rng.uniform(5, 14):.1f}".replace(".", ",")]),
+        "fuelType": rng.choice(FUELS),
+        "power": _number(rng, rng.randint(70, 400)),
+        "transmissionType": rng.choice(GEARBOXES),
+        "driveWheels": rng.choice(DRIVES),
+        "type": rng.choice(TYPES),
+        "carClass": rng.choice(CAR_CLASSES),
+        "doors": rng.choice(["0", "3", "4", "5", "NULL"]),
+        "color": rng.choice(COLORS),
+        "availableFrom": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 15:01:50",
+        "firstRegistrationDate": rng.choice(["NULL", f"{year}-{rng.randint(1, 12):02d}-01"]),
+        "description": " | ".join(equipment + equipment[:1]) if equipment else "NULL",
+        "pricing_listPrice": _number(rng, list_price),
+        "pricing_salesPrice": _number(rng, sales_price),
+        "pricing_miniPrice": _number(rng, sales_price),
+        "locationId": rng.choice(LOCATIONS),
+    }
+
+
+def _number(rng: random.Random, value: int, *, decimals: bool = True) -> str:
+    if not decimals:
+        return str(value)
+    # The partner export mixes "1591.00" and "1591,00" within the same file.
+    return f"{value}.00" if rng.random() < 0.5 else f"{value},00"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--revision", type=int, default=0)
+    parser.add_argument("--changed-ratio", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    write_feed(
+        args.output,
+        args.rows,
+        seed=args.seed,
+        revision=args.revision,
+        changed_ratio=args.changed_ratio,
+    )
+    print(f"Wrote {args.rows} vehicles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 from .cli import cli
 from .client import IzzyleaseClient
 from .config import ServiceConfig
-from .csv_loader import CsvRowError, load_vehicles_from_csv
+from .csv_loader import CsvRowError, iter_vehicles_from_csv, load_vehicles_from_csv
 from .pipelines.import_pipeline import PipelineReport, VehicleSynchronizer
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "IzzyleaseClient",
     "ServiceConfig",
     "load_vehicles_from_csv",
+    "iter_vehicles_from_csv",
     "CsvRowError",
     "PipelineReport",
     "VehicleSynchronizer",
@@ -0,0 +1,507 @@
+"""Asyncio-native HTTP client for the Izzylease API.
+
+The client mirrors :class:`~izzy_uploader.client.IzzyleaseClient` but runs on an
+event loop. It uses ``aiohttp`` when installed (``pip install -e .[async]``) and
+otherwise falls back to a small keep-alive HTTP/1.1 transport built on
+``asyncio`` streams, so it works with the standard library alone.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import ssl
+import time
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple
+
+from .auth import OAuthTokenProvider, default_ssl_context
+from .circuit import CircuitBreaker, is_outage
+from .config import ServiceConfig
+from .models import CarRemovalReason, Vehicle
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy
+from .http_common import (
+    ApiError,
+    check_response,
+    created_car_id,
+    decode_body,
+    request_headers,
+    transport_failure,
+)
+from .token_cache import TokenCache
+from .transport import IDEMPOTENT_METHODS, HttpResponse, PoolKey, TransportError, split_url
+
+try:  # pragma: no cover - optional dependency
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+LOGGER = logging.getLogger(__name__)
+
+_RETRIES: contextvars.ContextVar[int] = contextvars.ContextVar("izzy_retries", default=0)
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncTransport(Protocol):
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> HttpResponse: ...
+
+    async def close(self) -> None: ...
+
+
+class AsyncIzzyleaseClient:
+    """Asynchronous wrapper around the Izzylease dealer API."""
+
+    def __init__(
+        self,
+        config: ServiceConfig,
+        token_provider: Optional[OAuthTokenProvider] = None,
+        *,
+        transport: Optional[AsyncTransport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        use_aiohttp: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+    ):
+        self._config = config
+        self._token_provider = token_provider or OAuthTokenProvider(
+            config.token_url,
+            config.client_id,
+            config.client_secret,
+            timeout=config.timeout,
+            cache=TokenCache(config.token_cache_file) if config.token_cache_file else None,
+        )
+        if transport is None:
+            if use_aiohttp is None:
+                use_aiohttp = aiohttp is not None
+            if use_aiohttp:
+                transport = AiohttpTransport(
+                    max_idle=config.pool_size,
+                    max_connections=max_connections,
+                    idle_timeout=config.pool_idle_timeout,
+                    timeout=config.timeout,
+                    ssl_context=default_ssl_context(),
+                )
+            else:
+                transport = StreamTransport(
+                    max_idle=config.pool_size,
+                    idle_timeout=config.pool_idle_timeout,
+                    timeout=config.timeout,
+                    ssl_context=default_ssl_context(),
+                )
+        self._transport = transport
+        self._retry_policy = retry_policy or RetryPolicy(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+        )
+        if rate_limiter is None and config.rate_limit > 0:
+            rate_limiter = TokenBucket(config.rate_limit, config.rate_burst or None)
+        self._rate_limiter = rate_limiter
+        if circuit_breaker is None and config.circuit_failure_threshold > 0:
+            circuit_breaker = CircuitBreaker(
+                config.circuit_failure_threshold,
+                failure_rate=config.circuit_failure_rate,
+                reset_timeout=config.circuit_reset_timeout,
+            )
+        self._circuit_breaker = circuit_breaker
+
+    @property
+    def last_retry_count(self) -> int:
+        """Retries performed by the most recent API call made in the current task."""
+
+        return _RETRIES.get()
+
+    async def aclose(self) -> None:
+        """Release pooled connections."""
+
+        await self._transport.close()
+
+    async def __aenter__(self) -> "AsyncIzzyleaseClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    # -- API helpers -------------------------------------------------
+    async def create_vehicle(self, vehicle: Vehicle) -> str:
+        """Create a vehicle and return the created car identifier."""
+
+        LOGGER.debug("Creating vehicle %s", vehicle.configuration_number or vehicle.vin)
+        response = await self._request(
+            "POST", "/external/cars", json_payload=vehicle.to_api_payload()
+        )
+        return created_car_id(response)
+
+    async def update_vehicle(self, car_id: str, vehicle: Vehicle) -> None:
+        """Update an existing vehicle."""
+
+        LOGGER.debug("Updating vehicle %s", car_id)
+        await self._request(
+            "PUT", f"/external/cars/{car_id}", json_payload=vehicle.to_api_payload()
+        )
+
+    async def delete_vehicle(
+        self, car_id: str, reason: CarRemovalReason = CarRemovalReason.DELETED
+    ) -> None:
+        """Remove a vehicle from the platform."""
+
+        LOGGER.debug("Deleting vehicle %s with reason %s", car_id, reason.value)
+        body: Dict[str, Any] = {"reason": reason.value}
+        await self._request("DELETE", f"/external/cars/{car_id}", json_payload=body)
+
+    # -- HTTP helper -------------------------------------------------
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_payload: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        url = f"{self._config.api_base_url}{path}"
+        data = json.dumps(json_payload).encode("utf-8") if json_payload is not None else None
+
+        LOGGER.debug("Request %s %s payload=%s", method, url, json_payload)
+        _RETRIES.set(0)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._send(method, url, data)
+                break
+            except ApiError as exc:
+                if not exc.retryable or attempt >= self._retry_policy.max_attempts:
+                    raise
+                delay = self._retry_policy.backoff(attempt, exc.retry_after)
+                LOGGER.warning(
+                    "%s %s failed (%s); retrying in %.2fs (attempt %d/%d)",
+                    method,
+                    path,
+                    exc,
+                    delay,
+                    attempt + 1,
+                    self._retry_policy.max_attempts,
+                )
+                _RETRIES.set(_RETRIES.get() + 1)
+                await asyncio.sleep(delay)
+
+        return decode_body(response)
+
+    async def _send(self, method: str, url: str, data: Optional[bytes]) -> HttpResponse:
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return await self._exchange(method, url, data)
+        ticket = breaker.before_call()
+        try:
+            response = await self._exchange(method, url, data)
+        except ApiError as exc:
+            breaker.record(ticket, failed=is_outage(exc.status))
+            raise
+        except BaseException:
+            breaker.release(ticket)
+            raise
+        breaker.record(ticket, failed=False)
+        return response
+
+    async def _exchange(self, method: str, url: str, data: Optional[bytes]) -> HttpResponse:
+        token = await self._get_token()
+        response = await self._transmit(method, url, data, token)
+        invalidate = getattr(self._token_provider, "invalidate", None)
+        if response.status == 401 and invalidate is not None:
+            # A revoked or prematurely expired token: refresh it and replay once.
+            LOGGER.warning("Access token rejected for %s %s; refreshing it", method, url)
+            await asyncio.to_thread(invalidate, token)
+            _RETRIES.set(_RETRIES.get() + 1)
+            response = await self._transmit(method, url, data, await self._get_token())
+        return check_response(method, response, self._retry_policy, self._rate_limiter)
+
+    async def _get_token(self) -> str:
+        cached_token = getattr(self._token_provider, "cached_token", None)
+        if cached_token is not None:
+            token = cached_token()
+            if token is not None:
+                return token
+        # Fetching a token uses blocking I/O, so keep it off the event loop.
+        return await asyncio.to_thread(self._token_provider.get_token)
+
+    async def _transmit(
+        self, method: str, url: str, data: Optional[bytes], token: str
+    ) -> HttpResponse:
+        headers = request_headers(token, data)
+        if self._rate_limiter is not None:
+            delay = self._rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        try:
+            return await self._transport.request(method, url, body=data, headers=headers)
+        except TransportError as exc:
+            raise transport_failure(method, exc) from exc
+
+
+class StreamTransport:
+    """Keep-alive HTTP/1.1 transport built on :func:`asyncio.open_connection`.
+
+    Supports exactly what the Izzylease API needs: fixed-length request bodies
+    and responses delimited by ``Content-Length``, chunked encoding or EOF.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle: int = 10,
+        idle_timeout: float = 4.0,
+        timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self._max_idle = max_idle
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._ssl_context = ssl_context
+        self._idle: Dict[PoolKey, List[Tuple[_Connection, float]]] = {}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> HttpResponse:
+        key, target = split_url(url)
+        connection, reused = await self._acquire(key)
+        payload = _serialise_request(method, target, key, body, headers)
+        try:
+            await self._write(connection, payload)
+        except (OSError, asyncio.TimeoutError) as exc:
+            _close(connection)
+            if not reused:
+                raise _stream_error(exc) from exc
+            # The server closed the connection before the request was sent, so
+            # it cannot have processed it; any method may go out again.
+            LOGGER.debug("Pooled connection to %s was closed by the server; reconnecting", key[1])
+            connection = await self._connect(key)
+            reused = False
+            try:
+                await self._write(connection, payload)
+            except (OSError, asyncio.TimeoutError) as retry_exc:
+                _close(connection)
+                raise _stream_error(retry_exc) from retry_exc
+        try:
+            response, keep_alive = await self._read(connection, method)
+        except (ConnectionError, asyncio.IncompleteReadError) as exc:
+            _close(connection)
+            if not reused or method.upper() not in IDEMPOTENT_METHODS:
+                raise TransportError(str(exc) or exc.__class__.__name__) from exc
+            LOGGER.debug("Pooled connection to %s was closed by the server; reconnecting", key[1])
+            connection = await self._connect(key)
+            try:
+                await self._write(connection, payload)
+                response, keep_alive = await self._read(connection, method)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as retry_exc:
+                _close(connection)
+                raise _stream_error(retry_exc) from retry_exc
+        except (OSError, asyncio.TimeoutError, ValueError) as exc:
+            _close(connection)
+            raise _stream_error(exc) from exc
+
+        if keep_alive:
+            self._release(key, connection)
+        else:
+            _close(connection)
+        return response
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                _close(connection)
+
+    # -- internals --------------------------------------------------
+    async def _acquire(self, key: PoolKey) -> Tuple[_Connection, bool]:
+        now = time.monotonic()
+        connections = self._idle.get(key)
+        while connections:
+            connection, released_at = connections.pop()
+            if now - released_at <= self._idle_timeout and not connection[0].at_eof():
+                return connection, True
+            _close(connection)
+        return await self._connect(key), False
+
+    def _release(self, key: PoolKey, connection: _Connection) -> None:
+        connections = self._idle.setdefault(key, [])
+        if len(connections) < self._max_idle:
+            connections.append((connection, time.monotonic()))
+        else:
+            _close(connection)
+
+    async def _connect(self, key: PoolKey) -> _Connection:
+        scheme, host, port = key
+        try:
+            return await asyncio.wait_for(
+                asyncio.open_connection(
+                    host, port, ssl=self._ssl_context if scheme == "https" else None
+                ),
+                timeout=self._timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise TransportError(str(exc) or exc.__class__.__name__, connect_failed=True) from exc
+
+    async def _write(self, connection: _Connection, payload: bytes) -> None:
+        writer = connection[1]
+        writer.write(payload)
+        await asyncio.wait_for(writer.drain(), timeout=self._timeout)
+
+    async def _read(self, connection: _Connection, method: str) -> Tuple[HttpResponse, bool]:
+        return await asyncio.wait_for(_read_response(connection[0], method), timeout=self._timeout)
+
+
+class AiohttpTransport:
+    """Transport backed by an ``aiohttp.ClientSession`` (optional dependency).
+
+    aiohttp has no separate bound on idle connections: its connector limit
+    caps open connections, idle or busy. It is set to the larger of
+    ``max_idle`` and ``max_connections`` (the caller's in-flight limit) so the
+    connector never queues requests the synchronizer meant to run in parallel;
+    without ``max_connections`` it is unlimited.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_idle: int = 10,
+        max_connections: Optional[int] = None,
+        idle_timeout: float = 4.0,
+        timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        if aiohttp is None:  # pragma: no cover - optional dependency
+            raise RuntimeError("aiohttp is not installed; install izzy-uploader[async]")
+        self._limit = max(max_idle, max_connections) if max_connections else 0
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._ssl_context = ssl_context
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> HttpResponse:  # pragma: no cover - exercised only with aiohttp installed
+        session = self._get_session()
+        try:
+            async with session.request(method, url, data=body, headers=headers) as resp:
+                data = await resp.read()
+                return HttpResponse(
+                    status=resp.status,
+                    reason=resp.reason or "",
+                    headers={name.lower(): value for name, value in resp.headers.items()},
+                    body=data,
+                )
+        except aiohttp.ClientConnectorError as exc:
+            raise TransportError(str(exc), connect_failed=True) from exc
+        except asyncio.TimeoutError as exc:
+            raise TransportError("Request timed out") from exc
+        except aiohttp.ClientError as exc:
+            raise TransportError(str(exc) or exc.__class__.__name__) from exc
+
+    async def close(self) -> None:  # pragma: no cover - exercised only with aiohttp installed
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":  # pragma: no cover - optional dependency
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit,
+                keepalive_timeout=self._idle_timeout,
+                ssl=self._ssl_context,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+        return self._session
+
+
+def _serialise_request(
+    method: str,
+    target: str,
+    key: PoolKey,
+    body: Optional[bytes],
+    headers: Optional[Mapping[str, str]],
+) -> bytes:
+    scheme, host, port = key
+    default_port = 443 if scheme == "https" else 80
+    lines = [
+        f"{method} {target} HTTP/1.1",
+        f"Host: {host}" if port == default_port else f"Host: {host}:{port}",
+        f"Content-Length: {len(body or b'')}",
+        "Connection: keep-alive",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + (body or b"")
+
+
+async def _read_response(reader: asyncio.StreamReader, method: str) -> Tuple[HttpResponse, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Remote end closed connection without response")
+    version, status_raw, *reason_parts = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    status = int(status_raw)
+    reason = reason_parts[0] if reason_parts else ""
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        body = await _read_chunked(reader)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return HttpResponse(status=status, reason=reason, headers=headers, body=body), keep_alive
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            # Skip optional trailers up to the terminating blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+def _stream_error(exc: BaseException) -> TransportError:
+    return TransportError(str(exc) or exc.__class__.__name__)
+
+
+def _close(connection: _Connection) -> None:
+    connection[1].close()
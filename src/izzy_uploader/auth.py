@@ -2,45 +2,245 @@
 from __future__ import annotations
 
 import json
+import logging
 import ssl
 import threading
 import time
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
 from urllib import error, parse, request
 
+from .token_cache import CachedToken, TokenCache, TokenCacheError
+
 try:  # pragma: no cover - optional dependency
     import certifi
 except ImportError:  # pragma: no cover - optional dependency
     certifi = None
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 class OAuthTokenError(RuntimeError):
     """Raised when fetching an OAuth access token fails."""
 
 
+# Share of ``expires_in`` after which a background refresh starts.
+DEFAULT_REFRESH_RATIO = 0.8
+# Tokens are treated as expired this many seconds early to absorb clock skew.
+EXPIRY_SAFETY_WINDOW = 60.0
+# Delay before retrying a failed background refresh while the token is valid.
+REFRESH_RETRY_DELAY = 5.0
+
+
+@dataclass(frozen=True)
+class _Token:
+    value: str
+    expires_at: float
+    refresh_at: float
+
+
+class _Refresh:
+    """One in-flight token request whose outcome is shared by every waiter."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.token: Optional[_Token] = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> str:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        assert self.token is not None
+        return self.token.value
+
+
 class OAuthTokenProvider:
-    """Fetches and caches OAuth2 access tokens using the client credentials flow."""
+    """Fetches and caches OAuth2 access tokens using the client credentials flow.
+
+    A valid token is returned without locking. Once ``refresh_ratio`` of its
+    lifetime has passed a background thread fetches the next one, so callers
+    never wait for ``/oauth/token`` while the current token is still valid. When
+    no valid token is left, concurrent callers share a single request.
+
+    With a :class:`~izzy_uploader.token_cache.TokenCache` other processes'
+    tokens are reused until their refresh point, and newly fetched tokens are
+    stored for them.
+    """
 
-    def __init__(self, token_url: str, client_id: str, client_secret: str, *, timeout: float = 10.0):
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        *,
+        timeout: float = 10.0,
+        refresh_ratio: float = DEFAULT_REFRESH_RATIO,
+        cache: Optional[TokenCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < refresh_ratio <= 1:
+            raise ValueError("refresh_ratio must be within (0, 1]")
         self._token_url = token_url
         self._client_id = client_id
         self._client_secret = client_secret
         self._timeout = timeout
+        self._refresh_ratio = refresh_ratio
+        self._cache = cache
+        self._cache_key = TokenCache.key(token_url, client_id)
+        self._clock = clock
         self._lock = threading.Lock()
-        self._access_token: Optional[str] = None
-        self._expires_at: float = 0.0
+        self._token: Optional[_Token] = None
+        self._rejected: Optional[str] = None
+        self._refresh: Optional[_Refresh] = None
         self._ssl_context = _build_default_ssl_context()
 
     def get_token(self) -> str:
         """Return a valid access token, refreshing it when necessary."""
 
+        token = self.cached_token()
+        if token is not None:
+            return token
+        refresh, owner = self._join_refresh()
+        if owner:
+            self._run_refresh(refresh)
+        return refresh.wait()
+
+    def cached_token(self) -> Optional[str]:
+        """Return the current token without blocking, or ``None`` if it must be fetched.
+
+        Past the refresh point the next token is requested in the background,
+        so this is safe to call from an event loop.
+        """
+
+        # The token is replaced atomically, so no lock is needed.
+        token = self._token
+        now = self._clock()
+        if token is None or now >= token.expires_at:
+            return None
+        if now >= token.refresh_at:
+            self._refresh_in_background()
+        return token.value
+
+    def invalidate(self, token: str) -> None:
+        """Forget *token* after the API rejected it (HTTP 401).
+
+        Only the token the caller actually used is dropped, so threads reporting
+        the same rejected token trigger a single refresh in :meth:`get_token`.
+        """
+
         with self._lock:
-            if self._access_token and time.time() < self._expires_at:
-                return self._access_token
-            return self._refresh_token()
+            current = self._token
+            if current is None or current.value != token:
+                return
+            self._token = None
+            self._rejected = token
+        if self._cache is not None:
+            try:
+                with self._cache.session() as session:
+                    session.discard(self._cache_key, token)
+            except TokenCacheError as exc:
+                LOGGER.warning("Token cache unavailable: %s", exc)
 
     # ------------------------------------------------------------------ #
-    def _refresh_token(self) -> str:
+    def _join_refresh(self) -> Tuple[_Refresh, bool]:
+        """Return the in-flight refresh and whether the caller has to run it."""
+
+        with self._lock:
+            if self._refresh is not None:
+                return self._refresh, False
+            self._refresh = _Refresh()
+            return self._refresh, True
+
+    def _refresh_in_background(self) -> None:
+        refresh, owner = self._join_refresh()
+        if owner:
+            threading.Thread(
+                target=self._run_refresh,
+                args=(refresh, True),
+                name="izzy-token-refresh",
+                daemon=True,
+            ).start()
+
+    def _run_refresh(self, refresh: _Refresh, background: bool = False) -> None:
+        try:
+            refresh.token = self._obtain_token()
+        except Exception as exc:  # pylint: disable=broad-except
+            refresh.error = exc
+            if background:
+                LOGGER.warning("Background access token refresh failed: %s", exc)
+                self._postpone_refresh()
+        else:
+            self._token = refresh.token
+        finally:
+            if refresh.token is None and refresh.error is None:
+                refresh.error = OAuthTokenError("Access token refresh was interrupted")
+            with self._lock:
+                self._refresh = None
+            refresh.done.set()
+
+    def _obtain_token(self) -> _Token:
+        if self._cache is None:
+            return self._issue(*self._fetch_token())
+        try:
+            with self._cache.session() as session:
+                # Holding the file lock while fetching makes other processes
+                # wait for this token instead of requesting their own.
+                cached = session.get(self._cache_key)
+                if cached is not None and self._reusable(cached):
+                    return self._from_cache(cached)
+                token, expires_in = self._fetch_token()
+                now = time.time()
+                session.put(self._cache_key, CachedToken(token, now, now + expires_in))
+                return self._issue(token, expires_in)
+        except TokenCacheError as exc:
+            LOGGER.warning("Token cache unavailable: %s", exc)
+            return self._issue(*self._fetch_token())
+
+    def _issue(self, token: str, expires_in: float) -> _Token:
+        now = self._clock()
+        expires_at = now + max(0.0, expires_in - EXPIRY_SAFETY_WINDOW)
+        return _Token(
+            value=token,
+            expires_at=expires_at,
+            refresh_at=min(now + expires_in * self._refresh_ratio, expires_at),
+        )
+
+    def _reusable(self, cached: CachedToken) -> bool:
+        current = self._token
+        if current is not None and current.value == cached.access_token:
+            return False  # the token being refreshed
+        if cached.access_token == self._rejected:
+            return False
+        lifetime = cached.expires_at - cached.issued_at
+        return time.time() < cached.issued_at + lifetime * self._refresh_ratio
+
+    def _from_cache(self, cached: CachedToken) -> _Token:
+        # Cached times are wall-clock; convert them to this provider's clock.
+        offset = self._clock() - time.time()
+        expires_at = cached.expires_at - EXPIRY_SAFETY_WINDOW + offset
+        refresh_at = cached.issued_at + (cached.expires_at - cached.issued_at) * self._refresh_ratio
+        return _Token(
+            value=cached.access_token,
+            expires_at=expires_at,
+            refresh_at=min(refresh_at + offset, expires_at),
+        )
+
+    def _postpone_refresh(self) -> None:
+        # Keep serving the still-valid token and retry later instead of on
+        # every call.
+        token = self._token
+        if token is not None:
+            self._token = _Token(
+                value=token.value,
+                expires_at=token.expires_at,
+                refresh_at=min(self._clock() + REFRESH_RETRY_DELAY, token.expires_at),
+            )
+
+    def _fetch_token(self) -> Tuple[str, float]:
+        """Request a new token; return it with its lifetime in seconds."""
+
         payload = parse.urlencode(
             {
                 "client_id": self._client_id,
@@ -64,12 +264,7 @@ class OAuthTokenProvider:
             expires_in = float(data.get("expires_in", 0))
         except (ValueError, KeyError, TypeError) as exc:
             raise OAuthTokenError("Access token response is malformed") from exc
-
-        # Refresh slightly before real expiry to avoid race conditions.
-        safety_window = 60.0
-        self._access_token = str(token)
-        self._expires_at = time.time() + max(0.0, expires_in - safety_window)
-        return self._access_token
+        return str(token), expires_in
 
 
 def _build_default_ssl_context() -> ssl.SSLContext:
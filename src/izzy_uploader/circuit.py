@@ -0,0 +1,147 @@
+"""Circuit breaker that stops calling the Izzylease API during outages."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Number of recent calls the failure rate is computed over.
+DEFAULT_WINDOW = 20
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker.
+
+    The circuit opens after ``failure_threshold`` consecutive failures, or when
+    at least ``failure_rate`` of the last ``window`` calls failed (0 disables
+    the rate check). While open every call fails immediately with
+    :class:`CircuitOpenError`. After ``reset_timeout`` seconds a single probe
+    call is let through (half-open): its success closes the circuit, its
+    failure opens it for another ``reset_timeout``.
+
+    Only outage symptoms count as failures (transport errors and 5xx
+    responses); the caller decides by passing ``failed`` to :meth:`record`.
+
+    :meth:`before_call` returns a ticket naming the phase that admitted the
+    call. Every state change starts a new phase and results of calls admitted
+    in an earlier one are ignored, so only the probe itself can close or
+    re-open a half-open circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        *,
+        failure_rate: float = 0.5,
+        window: int = DEFAULT_WINDOW,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self._failure_threshold = failure_threshold
+        self._failure_rate = failure_rate
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> int:
+        """Return a ticket for one call; raise :class:`CircuitOpenError` if none may be made."""
+
+        with self._lock:
+            if self._state == CLOSED:
+                return self._generation
+            if self._state == OPEN:
+                remaining = self._opened_at + self._reset_timeout - self._clock()
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"API unavailable: circuit open for another {remaining:.0f}s"
+                    )
+                self._state = HALF_OPEN
+                self._generation += 1
+            if self._probe_in_flight:
+                raise CircuitOpenError("API unavailable: waiting for the probe request")
+            self._probe_in_flight = True
+            return self._generation
+
+    def record(self, ticket: int, *, failed: bool) -> None:
+        """Record the outcome of the call :meth:`before_call` issued *ticket* to."""
+
+        with self._lock:
+            if ticket != self._generation:
+                return  # a call admitted before the circuit last changed state
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    self._trip("probe request failed")
+                else:
+                    LOGGER.info("API recovered; closing the circuit")
+                    self._state = CLOSED
+                    self._generation += 1
+                    self._consecutive_failures = 0
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(failed)
+            if not failed:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self._failure_threshold:
+                self._trip(f"{self._consecutive_failures} consecutive failures")
+            elif self._rate_exceeded():
+                failures = sum(self._outcomes)
+                self._trip(f"{failures} of the last {len(self._outcomes)} calls failed")
+
+    def release(self, ticket: int) -> None:
+        """Forget a call that ended without a verdict on the API's health."""
+
+        with self._lock:
+            if ticket == self._generation and self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    # -- internals --------------------------------------------------
+    def _rate_exceeded(self) -> bool:
+        outcomes = self._outcomes
+        if self._failure_rate <= 0 or len(outcomes) < (outcomes.maxlen or 0):
+            return False
+        return sum(outcomes) / len(outcomes) >= self._failure_rate
+
+    def _trip(self, reason: str) -> None:
+        LOGGER.error(
+            "Opening the API circuit for %.0fs: %s", self._reset_timeout, reason
+        )
+        self._state = OPEN
+        self._generation += 1
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+
+def is_outage(status: Optional[int]) -> bool:
+    """Whether a failed call with *status* (``None`` = transport error) signals an outage."""
+
+    return status is None or status >= 500
@@ -1,17 +1,28 @@
 """Command line entry point for the Izzy Uploader service."""
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import sys
 from pathlib import Path
+from typing import Iterable, List, Optional
 
 import click
 
 from .config import ServiceConfig
-from .csv_loader import load_vehicles_from_csv
+from .csv_loader import CsvRowError, iter_vehicles_from_csv, load_vehicles_from_csv
+from .async_client import AsyncIzzyleaseClient
 from .client import IzzyleaseClient
+from .journal import JournalError, RunJournal
+from .models import Vehicle
+from .pipelines.async_pipeline import AsyncVehicleSynchronizer
 from .pipelines.import_pipeline import PipelineReport, VehicleSynchronizer
-from .state import VehicleStateStore
+from .pipelines.plan import SyncPlan, build_sync_plan
+from .pipelines.progress import ProgressCallback, SyncProgress
+from .state import StateStore, migrate_json_state, open_state_store
+from .stub_server import FaultInjection, LatencyModel, StubApiServer
+from .timing import STATE_LOAD, RunTimings
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 LOGGER = logging.getLogger(__name__)
@@ -26,18 +37,197 @@ def cli() -> None:
 @click.argument("csv_path", type=click.Path(exists=True, path_type=Path))
 @click.option("--close-missing", is_flag=True, help="Close vehicles that are missing from the CSV file.")
 @click.option("--update-prices", is_flag=True, help="Update prices for existing vehicles if they changed.")
+@click.option(
+    "--max-delete-ratio",
+    type=click.FloatRange(min=0.0, max=1.0),
+    default=None,
+    help="With --close-missing, abort if more than this share of known vehicles (0-1) would be "
+    "closed. Defaults to IZZYLEASE_MAX_DELETE_RATIO; 0 disables the check.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of vehicles synchronised in parallel.",
+)
+@click.option(
+    "--asyncio",
+    "use_asyncio",
+    is_flag=True,
+    help="Run requests on an asyncio event loop instead of threads (--concurrency = in-flight limit).",
+)
+@click.option(
+    "--adaptive",
+    is_flag=True,
+    help="Tune the number of in-flight requests to the API's latency and errors "
+    "(--concurrency = upper bound).",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Send updates even for vehicles whose payload did not change since the last run.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Start synchronising while the CSV is still being parsed (duplicates skipped per row).",
+)
+@click.option(
+    "--parse-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Processes used to parse and normalise the CSV (worth it for feeds of tens of thousands of rows).",
+)
+@click.option(
+    "--progress/--no-progress",
+    default=None,
+    help="Print a live progress line to stderr (default: only when stderr is a terminal).",
+)
+@click.option(
+    "--resume",
+    "resume_run",
+    metavar="RUN_ID",
+    help="Resume an interrupted run: skip operations it completed and finish the rest.",
+)
 @click.option("--json", "as_json", is_flag=True, help="Print the pipeline report as JSON.")
-def sync_command(csv_path: Path, close_missing: bool, update_prices: bool, as_json: bool) -> None:
+def sync_command(
+    csv_path: Path,
+    close_missing: bool,
+    update_prices: bool,
+    max_delete_ratio: Optional[float],
+    concurrency: int,
+    use_asyncio: bool,
+    adaptive: bool,
+    force: bool,
+    stream: bool,
+    parse_workers: int,
+    progress: Optional[bool],
+    resume_run: Optional[str],
+    as_json: bool,
+) -> None:
     """Synchronise vehicles defined in *CSV_PATH* with the Izzylease platform."""
 
     config = ServiceConfig.from_env()
-    client = IzzyleaseClient(config)
-    state_store = VehicleStateStore(config.state_file)
+    if max_delete_ratio is None:
+        max_delete_ratio = config.max_delete_ratio
+    journal_dir = config.state_file.parent / "runs"
+    journal: Optional[RunJournal] = None
+    if resume_run:
+        try:
+            journal = RunJournal.resume(journal_dir, resume_run)
+        except JournalError as exc:
+            raise click.ClickException(str(exc)) from exc
+        recorded_csv = journal.options.get("csv")
+        if recorded_csv is not None and Path(recorded_csv).resolve() != csv_path.resolve():
+            journal.close()
+            raise click.UsageError(
+                f"Run {journal.run_id} was started with {recorded_csv}; "
+                f"resume it with the same CSV file instead of {csv_path}"
+            )
+        # The resumed run keeps the options it was started with.
+        close_missing = bool(journal.options.get("close_missing", close_missing))
+        force = bool(journal.options.get("force", force))
+        max_delete_ratio = float(journal.options.get("max_delete_ratio", max_delete_ratio))
+        click.echo(
+            f"Resuming run {journal.run_id}: {journal.completed_count} operations already done",
+            err=True,
+        )
+    timings = RunTimings()
+    try:
+        with timings.stage(STATE_LOAD):
+            state_store = open_state_store(config.state_file, config.state_backend)
+        vehicles: Iterable[Vehicle]
+        csv_errors: List[CsvRowError]
+        if stream:
+            csv_errors = []
+            vehicles = iter_vehicles_from_csv(
+                csv_path, on_error=csv_errors.append, workers=parse_workers, timings=timings
+            )
+        else:
+            vehicles, csv_errors = load_vehicles_from_csv(
+                csv_path, workers=parse_workers, timings=timings
+            )
+    except BaseException:
+        if journal is not None:
+            journal.close()
+        raise
+    if journal is None:
+        # Created only once the inputs loaded, so a failed start leaves no journal behind.
+        journal = RunJournal.create(
+            journal_dir,
+            {
+                "csv": str(csv_path.resolve()),
+                "close_missing": close_missing,
+                "force": force,
+                "max_delete_ratio": max_delete_ratio,
+            },
+        )
+        click.echo(f"Run id: {journal.run_id}", err=True)
 
-    vehicles, csv_errors = load_vehicles_from_csv(csv_path)
+    interactive = sys.stderr.isatty()
+    if progress is None:
+        progress = interactive
+    progress_callback = _progress_printer(interactive) if progress else None
 
-    synchronizer = VehicleSynchronizer(client, state_store)
-    report = synchronizer.run(vehicles, close_missing=close_missing, update_prices=update_prices)
+    try:
+        if use_asyncio:
+            report = asyncio.run(
+                _run_async(
+                    config,
+                    state_store,
+                    vehicles,
+                    max_in_flight=concurrency,
+                    adaptive=adaptive,
+                    close_missing=close_missing,
+                    max_delete_ratio=max_delete_ratio,
+                    force=force,
+                    stream=stream,
+                    progress_callback=progress_callback,
+                    journal=journal,
+                    timings=timings,
+                )
+            )
+        else:
+            with IzzyleaseClient(config) as client:
+                synchronizer = VehicleSynchronizer(
+                    client,
+                    state_store,
+                    max_workers=concurrency,
+                    adaptive=adaptive,
+                    progress_callback=progress_callback,
+                )
+                report = synchronizer.run(
+                    vehicles,
+                    close_missing=close_missing,
+                    update_prices=update_prices,
+                    force=force,
+                    stream=stream,
+                    journal=journal,
+                    max_delete_ratio=max_delete_ratio,
+                    timings=timings,
+                )
+    except BaseException:
+        journal.close()
+        click.echo(
+            f"Run {journal.run_id} interrupted; continue it with --resume {journal.run_id}",
+            err=True,
+        )
+        raise
+    else:
+        if report.skipped:
+            # Skipped operations are not journaled, so resuming retries exactly them.
+            journal.close()
+            click.echo(
+                f"{report.skipped} operations skipped while the API was unavailable; "
+                f"retry them with --resume {journal.run_id}",
+                err=True,
+            )
+        else:
+            journal.finish()
+    finally:
+        state_store.close()
 
     for csv_error in csv_errors:
         report.record_error(
@@ -48,6 +238,211 @@ def sync_command(csv_path: Path, close_missing: bool, update_prices: bool, as_js
     _emit_report(report, as_json=as_json)
 
 
+async def _run_async(
+    config: ServiceConfig,
+    state_store: StateStore,
+    vehicles: Iterable[Vehicle],
+    *,
+    max_in_flight: int,
+    adaptive: bool,
+    close_missing: bool,
+    max_delete_ratio: float,
+    force: bool,
+    stream: bool,
+    progress_callback: Optional[ProgressCallback] = None,
+    journal: Optional[RunJournal] = None,
+    timings: Optional[RunTimings] = None,
+) -> PipelineReport:
+    async with AsyncIzzyleaseClient(config, max_connections=max_in_flight) as client:
+        synchronizer = AsyncVehicleSynchronizer(
+            client,
+            state_store,
+            max_in_flight=max_in_flight,
+            adaptive=adaptive,
+            progress_callback=progress_callback,
+        )
+        return await synchronizer.run(
+            vehicles,
+            close_missing=close_missing,
+            force=force,
+            stream=stream,
+            journal=journal,
+            max_delete_ratio=max_delete_ratio,
+            timings=timings,
+        )
+
+
+@cli.command("plan")
+@click.argument("csv_path", type=click.Path(exists=True, path_type=Path))
+@click.option("--close-missing", is_flag=True, help="Include deletions of vehicles missing from the CSV file.")
+@click.option("--force", is_flag=True, help="Plan updates even for unchanged vehicles.")
+@click.option(
+    "--max-delete-ratio",
+    type=click.FloatRange(min=0.0, max=1.0),
+    default=None,
+    help="With --close-missing, abort if more than this share of known vehicles (0-1) would be "
+    "closed. Defaults to IZZYLEASE_MAX_DELETE_RATIO; 0 disables the check.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Concurrency assumed for the duration estimate.",
+)
+@click.option(
+    "--latency",
+    type=click.FloatRange(min=0),
+    default=0.3,
+    show_default=True,
+    help="Assumed seconds per API request for the duration estimate.",
+)
+@click.option("--parse-workers", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option("--json", "as_json", is_flag=True, help="Print the plan, including every operation, as JSON.")
+def plan_command(
+    csv_path: Path,
+    close_missing: bool,
+    force: bool,
+    max_delete_ratio: Optional[float],
+    concurrency: int,
+    latency: float,
+    parse_workers: int,
+    as_json: bool,
+) -> None:
+    """Show what syncing *CSV_PATH* would do, using only the local state (no API calls)."""
+
+    config = ServiceConfig.from_env()
+    vehicles, csv_errors = load_vehicles_from_csv(csv_path, workers=parse_workers)
+    state_store = open_state_store(config.state_file, config.state_backend)
+    try:
+        plan = build_sync_plan(
+            vehicles,
+            state_store,
+            close_missing=close_missing,
+            force=force,
+            max_delete_ratio=(
+                config.max_delete_ratio if max_delete_ratio is None else max_delete_ratio
+            ),
+        )
+    finally:
+        state_store.close()
+
+    plan.errors.extend(
+        f"CSV line {csv_error.line_number}: {csv_error.message}" for csv_error in csv_errors
+    )
+    estimate = plan.estimate_duration(
+        rate_limit=config.rate_limit,
+        rate_burst=config.rate_burst,
+        concurrency=concurrency,
+        latency=latency,
+    )
+    _emit_plan(plan, estimate, as_json=as_json)
+
+
+@cli.command("stub-server")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8099, show_default=True)
+@click.option(
+    "--latency",
+    default="0",
+    show_default=True,
+    help="Response delay in seconds: 0.05, uniform:0.01,0.2, normal:0.05,0.01 or lognormal:0.05,0.5.",
+)
+@click.option("--throttle-rate", type=click.FloatRange(0, 1), default=0.0, help="Share of 429 responses.")
+@click.option("--error-rate", type=click.FloatRange(0, 1), default=0.0, help="Share of 503 responses.")
+@click.option(
+    "--timeout-rate",
+    type=click.FloatRange(0, 1),
+    default=0.0,
+    help="Share of requests held open and dropped without a response.",
+)
+@click.option("--timeout-delay", type=float, default=30.0, show_default=True)
+@click.option("--retry-after", type=float, default=1.0, show_default=True, help="Retry-After sent with 429.")
+@click.option("--seed", type=int, default=None, help="Seed for reproducible latency and faults.")
+def stub_server_command(
+    host: str,
+    port: int,
+    latency: str,
+    throttle_rate: float,
+    error_rate: float,
+    timeout_rate: float,
+    timeout_delay: float,
+    retry_after: float,
+    seed: Optional[int],
+) -> None:
+    """Serve a local Izzylease API stub for load and integration testing."""
+
+    try:
+        latency_model = LatencyModel.parse(latency)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--latency") from exc
+    stub = StubApiServer(
+        host,
+        port,
+        latency=latency_model,
+        faults=FaultInjection(
+            throttle_rate=throttle_rate,
+            server_error_rate=error_rate,
+            timeout_rate=timeout_rate,
+            retry_after=retry_after,
+            timeout_delay=timeout_delay,
+        ),
+        seed=seed,
+    )
+    click.echo(f"Stub API listening on {stub.url} (statistics: {stub.url}/__stats)")
+    click.echo(
+        f"  export IZZYLEASE_API_BASE_URL={stub.url} "
+        f"IZZYLEASE_CLIENT_ID={stub.client_id} IZZYLEASE_CLIENT_SECRET={stub.client_secret}"
+    )
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        click.echo(json.dumps(stub.stats.snapshot(), indent=2))
+
+
+@cli.command("migrate-state")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("target", type=click.Path(dir_okay=False, path_type=Path))
+def migrate_state_command(source: Path, target: Path) -> None:
+    """Copy the JSON state file *SOURCE* into the SQLite database *TARGET*."""
+
+    migrated = migrate_json_state(source, target)
+    click.echo(f"Migrated {migrated} vehicles from {source} to {target}")
+
+
+def _progress_printer(interactive: bool) -> ProgressCallback:
+    """Return a callback that redraws one stderr line on a terminal, or appends lines otherwise."""
+
+    width = 0
+
+    def show(snapshot: SyncProgress) -> None:
+        nonlocal width
+        line = snapshot.format_line()
+        if not interactive:
+            click.echo(line, err=True)
+            return
+        padding = " " * max(width - len(line), 0)
+        width = len(line)
+        click.echo(f"\r{line}{padding}", err=True, nl=snapshot.finished)
+
+    return show
+
+
+def _emit_plan(plan: SyncPlan, estimate: float, *, as_json: bool) -> None:
+    payload = plan.as_dict(include_details=as_json)
+    payload["estimated_seconds"] = round(estimate, 1)
+    if as_json:
+        click.echo(json.dumps(payload, ensure_ascii=False, indent=2))
+        return
+    click.echo("Synchronisation plan (no changes made):")
+    for key, value in payload.items():
+        click.echo(f"  - {key}: {value}")
+    for message in plan.errors:
+        click.echo(f"  ! {message}")
+
+
 def _emit_report(report: PipelineReport, *, as_json: bool) -> None:
     if as_json:
         click.echo(json.dumps(report.as_dict(include_details=True), ensure_ascii=False, indent=2))
@@ -55,6 +450,13 @@ def _emit_report(report: PipelineReport, *, as_json: bool) -> None:
         click.echo("Synchronisation finished:")
         for key, value in report.as_dict().items():
             click.echo(f"  - {key}: {value}")
+        click.echo(f"  - duration: {report.timings.total:.1f}s")
+        if report.concurrency is not None:
+            controller = report.concurrency
+            click.echo(
+                f"  - concurrency: {controller.limit} (peak {controller.peak}, "
+                f"{len(controller.history) - 1} adjustments)"
+            )
 
 
 if __name__ == "__main__":  # pragma: no cover - entry point
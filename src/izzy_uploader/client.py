@@ -3,12 +3,26 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, Optional
-from urllib import error, request
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 
 from .auth import OAuthTokenProvider, default_ssl_context
+from .circuit import CircuitBreaker, is_outage
 from .config import ServiceConfig
+from .http_common import (
+    ApiError,
+    check_response,
+    created_car_id,
+    decode_body,
+    request_headers,
+    transport_failure,
+)
 from .models import CarRemovalReason, Vehicle
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy
+from .token_cache import TokenCache
+from .transport import ConnectionPool, HttpResponse, TransportError
 
 LOGGER = logging.getLogger(__name__)
 
@@ -16,15 +30,65 @@ LOGGER = logging.getLogger(__name__)
 class IzzyleaseClient:
     """Wrapper around the Izzylease dealer API."""
 
-    def __init__(self, config: ServiceConfig, token_provider: Optional[OAuthTokenProvider] = None):
+    def __init__(
+        self,
+        config: ServiceConfig,
+        token_provider: Optional[OAuthTokenProvider] = None,
+        *,
+        transport: Optional[ConnectionPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self._config = config
         self._token_provider = token_provider or OAuthTokenProvider(
             config.token_url,
             config.client_id,
             config.client_secret,
             timeout=config.timeout,
+            cache=TokenCache(config.token_cache_file) if config.token_cache_file else None,
+        )
+        self._transport = transport or ConnectionPool(
+            max_size=config.pool_size,
+            idle_timeout=config.pool_idle_timeout,
+            timeout=config.timeout,
+            ssl_context=default_ssl_context(),
+        )
+        self._retry_policy = retry_policy or RetryPolicy(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
         )
-        self._ssl_context = default_ssl_context()
+        if rate_limiter is None and config.rate_limit > 0:
+            rate_limiter = TokenBucket(config.rate_limit, config.rate_burst or None)
+        self._rate_limiter = rate_limiter
+        if circuit_breaker is None and config.circuit_failure_threshold > 0:
+            circuit_breaker = CircuitBreaker(
+                config.circuit_failure_threshold,
+                failure_rate=config.circuit_failure_rate,
+                reset_timeout=config.circuit_reset_timeout,
+            )
+        self._circuit_breaker = circuit_breaker
+        self._sleep = sleep
+        self._local = threading.local()
+
+    @property
+    def last_retry_count(self) -> int:
+        """Retries performed by the most recent API call made on the current thread."""
+
+        return getattr(self._local, "retries", 0)
+
+    def close(self) -> None:
+        """Release pooled connections."""
+
+        self._transport.close()
+
+    def __enter__(self) -> "IzzyleaseClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     # -- API helpers -------------------------------------------------
     def create_vehicle(self, vehicle: Vehicle) -> str:
@@ -33,10 +97,7 @@ class IzzyleaseClient:
         LOGGER.debug("Creating vehicle %s", vehicle.configuration_number or vehicle.vin)
         payload = vehicle.to_api_payload()
         response = self._request("POST", "/external/cars", json_payload=payload)
-        try:
-            return str(response["id"])
-        except (KeyError, TypeError) as exc:
-            raise RuntimeError("Unexpected response while creating vehicle") from exc
+        return created_car_id(response)
 
     def update_vehicle(self, car_id: str, vehicle: Vehicle) -> None:
         """Update an existing vehicle."""
@@ -65,28 +126,70 @@ class IzzyleaseClient:
     ) -> Any:
         url = f"{self._config.api_base_url}{path}"
         data: Optional[bytes] = None
-        headers = {
-            "Authorization": f"Bearer {self._token_provider.get_token()}",
-            "Accept": "application/json",
-        }
         if json_payload is not None:
             data = json.dumps(json_payload).encode("utf-8")
-            headers["Content-Type"] = "application/json"
 
         LOGGER.debug("Request %s %s payload=%s", method, url, json_payload)
-        req = request.Request(url, data=data, headers=headers, method=method)
+        self._local.retries = 0
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._send(method, url, data)
+                break
+            except ApiError as exc:
+                if not exc.retryable or attempt >= self._retry_policy.max_attempts:
+                    raise
+                delay = self._retry_policy.backoff(attempt, exc.retry_after)
+                LOGGER.warning(
+                    "%s %s failed (%s); retrying in %.2fs (attempt %d/%d)",
+                    method,
+                    path,
+                    exc,
+                    delay,
+                    attempt + 1,
+                    self._retry_policy.max_attempts,
+                )
+                self._local.retries += 1
+                self._sleep(delay)
+
+        return decode_body(response)
+
+    def _send(self, method: str, url: str, data: Optional[bytes]) -> HttpResponse:
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return self._exchange(method, url, data)
+        ticket = breaker.before_call()
+        try:
+            response = self._exchange(method, url, data)
+        except ApiError as exc:
+            breaker.record(ticket, failed=is_outage(exc.status))
+            raise
+        except BaseException:
+            breaker.release(ticket)
+            raise
+        breaker.record(ticket, failed=False)
+        return response
+
+    def _exchange(self, method: str, url: str, data: Optional[bytes]) -> HttpResponse:
+        token = self._token_provider.get_token()
+        response = self._transmit(method, url, data, token)
+        invalidate = getattr(self._token_provider, "invalidate", None)
+        if response.status == 401 and invalidate is not None:
+            # A revoked or prematurely expired token: refresh it and replay once.
+            LOGGER.warning("Access token rejected for %s %s; refreshing it", method, url)
+            invalidate(token)
+            self._local.retries += 1
+            response = self._transmit(method, url, data, self._token_provider.get_token())
+        return check_response(method, response, self._retry_policy, self._rate_limiter)
+
+    def _transmit(
+        self, method: str, url: str, data: Optional[bytes], token: str
+    ) -> HttpResponse:
+        headers = request_headers(token, data)
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
         try:
-            with request.urlopen(  # type: ignore[arg-type]
-                req, timeout=self._config.timeout, context=self._ssl_context
-            ) as resp:
-                raw = resp.read()
-                if not raw:
-                    return {}
-                return json.loads(raw.decode("utf-8"))
-        except error.HTTPError as exc:  # pragma: no cover - network failure path
-            body = exc.read().decode("utf-8", errors="ignore")
-            raise RuntimeError(
-                f"API request failed with status {exc.code}: {body or exc.reason}"
-            ) from exc
-        except error.URLError as exc:  # pragma: no cover - network failure path
-            raise RuntimeError(f"API request failed: {exc.reason}") from exc
+            return self._transport.request(method, url, body=data, headers=headers)
+        except TransportError as exc:
+            raise transport_failure(method, exc) from exc
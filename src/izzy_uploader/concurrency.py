@@ -0,0 +1,185 @@
+"""Adaptive (AIMD) limit on the number of API calls kept in flight."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .circuit import CircuitOpenError, is_outage
+
+LOGGER = logging.getLogger(__name__)
+
+START = "start"
+INCREASE = "increase"
+OVERLOAD = "overload"
+LATENCY = "latency"
+
+
+class AdaptiveConcurrency:
+    """Additive-increase/multiplicative-decrease controller for in-flight calls.
+
+    Calls are observed in windows of ``limit`` completions, roughly one round
+    trip at the current concurrency. A window whose smoothed latency stayed
+    within ``latency_tolerance`` times the best smoothed latency seen so far
+    raises the limit by one. A throttled or failing call (429, 5xx, transport
+    error, or a call that needed retries) multiplies the limit by ``backoff``
+    at once; so does a window whose latency spiked. After a decrease the calls
+    already in flight are ignored, so a single burst of errors only backs off
+    once.
+
+    Every change is kept in :attr:`history` with its offset from the start.
+    All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        *,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff = backoff
+        self._latency_tolerance = latency_tolerance
+        self._smoothing = smoothing
+        self._clock = clock
+        self._started = clock()
+        self._limit = min(max(initial_limit or min_limit, min_limit), max_limit)
+        self._peak = self._limit
+        self._window = self._limit
+        self._completed = 0
+        self._recovering = False
+        self._smoothed: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._history: List[Dict[str, object]] = []
+        self._lock = threading.Lock()
+        self._log_change(START)
+
+    @property
+    def limit(self) -> int:
+        """Number of calls that may currently be in flight."""
+
+        return self._limit
+
+    @property
+    def peak(self) -> int:
+        """Highest limit reached so far."""
+
+        return self._peak
+
+    @property
+    def history(self) -> List[Dict[str, object]]:
+        with self._lock:
+            return list(self._history)
+
+    def record(self, seconds: float, *, overloaded: bool = False) -> None:
+        """Record one finished call that took *seconds*."""
+
+        with self._lock:
+            self._completed += 1
+            if overloaded:
+                if not self._recovering:
+                    self._decrease(OVERLOAD)
+                    return
+            elif self._smoothed is None:
+                self._smoothed = self._baseline = seconds
+            else:
+                self._smoothed += self._smoothing * (seconds - self._smoothed)
+                self._baseline = min(self._baseline or self._smoothed, self._smoothed)
+            if self._completed >= self._window:
+                self._end_window()
+
+    @contextmanager
+    def measure(self, retries: Callable[[], int] = lambda: 0) -> Iterator[None]:
+        """Time one client call and record it; *retries* reports the client's retries.
+
+        Calls rejected by an open circuit breaker never reached the API and
+        are not recorded.
+        """
+
+        started = self._clock()
+        try:
+            yield
+        except CircuitOpenError:
+            raise
+        except Exception as exc:
+            self.record(
+                self._clock() - started, overloaded=is_overload(exc) or retries() > 0
+            )
+            raise
+        self.record(self._clock() - started, overloaded=retries() > 0)
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            history = list(self._history)
+        return {
+            "min_limit": self._min_limit,
+            "max_limit": self._max_limit,
+            "final_limit": self._limit,
+            "peak_limit": self._peak,
+            "history": history,
+        }
+
+    # -- internals --------------------------------------------------
+    def _end_window(self) -> None:
+        if self._recovering:
+            self._recovering = False
+        elif self._latency_spiked():
+            if self._limit > self._min_limit:
+                self._decrease(LATENCY)
+                return
+            # Already at the floor: this is how fast the API is right now.
+            self._baseline = self._smoothed
+        elif self._limit < self._max_limit:
+            self._limit += 1
+            self._peak = max(self._peak, self._limit)
+            self._log_change(INCREASE)
+        self._completed = 0
+        self._window = self._limit
+
+    def _latency_spiked(self) -> bool:
+        if self._smoothed is None or self._baseline is None:
+            return False
+        return self._smoothed > self._baseline * self._latency_tolerance
+
+    def _decrease(self, reason: str) -> None:
+        previous = self._limit
+        self._limit = max(self._min_limit, int(previous * self._backoff))
+        # Wait for the other calls started under the old limit before judging again.
+        self._completed = 0
+        self._window = previous - 1
+        self._recovering = True
+        if self._limit != previous:
+            LOGGER.info(
+                "Reducing API concurrency from %d to %d (%s)", previous, self._limit, reason
+            )
+            self._log_change(reason)
+
+    def _log_change(self, reason: str) -> None:
+        self._history.append(
+            {
+                "seconds": round(self._clock() - self._started, 3),
+                "limit": self._limit,
+                "reason": reason,
+            }
+        )
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Whether a failed call shows the API is overloaded (429, 5xx or transport error)."""
+
+    if not hasattr(exc, "status"):
+        return False  # not an API response, e.g. an unexpected payload
+    status = exc.status  # type: ignore[attr-defined]
+    return status == 429 or is_outage(status)
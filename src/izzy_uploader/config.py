@@ -22,6 +22,19 @@ class ServiceConfig:
     dealer_id: Optional[str]
     state_file: Path
     timeout: float = 10.0
+    pool_size: int = 10
+    pool_idle_timeout: float = 4.0
+    state_backend: Optional[str] = None
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 30.0
+    rate_limit: float = 0.0
+    rate_burst: float = 0.0
+    max_delete_ratio: float = 0.0
+    token_cache_file: Optional[Path] = None
+    circuit_failure_threshold: int = 5
+    circuit_failure_rate: float = 0.5
+    circuit_reset_timeout: float = 30.0
 
     @staticmethod
     def from_env(prefix: str = "IZZYLEASE_") -> "ServiceConfig":
@@ -41,6 +54,17 @@ class ServiceConfig:
         token_url = os.getenv(f"{prefix}TOKEN_URL") or f"{base_url.rstrip('/')}/oauth/token"
         dealer_id = os.getenv(f"{prefix}DEALER_ID") or None
         state_file_env = os.getenv(f"{prefix}STATE_FILE")
+        state_backend = os.getenv(f"{prefix}STATE_BACKEND") or None
+        if state_file_env and state_file_env.startswith("sqlite:"):
+            # ``sqlite:///path/to/state.db`` selects the SQLite backend explicitly.
+            state_file_env = state_file_env[len("sqlite:"):]
+            if state_file_env.startswith("//"):
+                state_file_env = state_file_env[2:]
+            state_backend = "sqlite"
+        if state_backend not in (None, "json", "sqlite"):
+            raise MissingConfiguration(
+                f"Invalid state backend provided via {prefix}STATE_BACKEND: {state_backend}"
+            )
         if state_file_env:
             state_file = Path(state_file_env).expanduser().resolve()
         else:
@@ -54,6 +78,28 @@ class ServiceConfig:
                 f"Invalid timeout value provided via {prefix}TIMEOUT"
             ) from exc
 
+        pool_size = _env_int(f"{prefix}POOL_SIZE", 10)
+        pool_idle_timeout = _env_float(f"{prefix}POOL_IDLE_TIMEOUT", 4.0)
+        retry_max_attempts = max(1, _env_int(f"{prefix}RETRY_MAX_ATTEMPTS", 3))
+        retry_base_delay = _env_float(f"{prefix}RETRY_BASE_DELAY", 0.5)
+        retry_max_delay = _env_float(f"{prefix}RETRY_MAX_DELAY", 30.0)
+        rate_limit = max(0.0, _env_float(f"{prefix}RATE_LIMIT", 0.0))
+        rate_burst = max(0.0, _env_float(f"{prefix}RATE_BURST", 0.0))
+        max_delete_ratio = _env_float(f"{prefix}MAX_DELETE_RATIO", 0.0)
+        if not 0.0 <= max_delete_ratio <= 1.0:
+            raise MissingConfiguration(
+                f"{prefix}MAX_DELETE_RATIO must be between 0 and 1 (0 disables the limit)"
+            )
+
+        circuit_failure_threshold = max(0, _env_int(f"{prefix}CIRCUIT_FAILURES", 5))
+        circuit_failure_rate = _env_float(f"{prefix}CIRCUIT_FAILURE_RATE", 0.5)
+        if not 0.0 <= circuit_failure_rate <= 1.0:
+            raise MissingConfiguration(
+                f"{prefix}CIRCUIT_FAILURE_RATE must be between 0 and 1 (0 disables the check)"
+            )
+        circuit_reset_timeout = max(0.0, _env_float(f"{prefix}CIRCUIT_RESET_TIMEOUT", 30.0))
+        token_cache_file = _token_cache_path(os.getenv(f"{prefix}TOKEN_CACHE"), state_file)
+
         return ServiceConfig(
             api_base_url=base_url.rstrip("/"),
             token_url=token_url,
@@ -62,11 +108,54 @@ class ServiceConfig:
             dealer_id=dealer_id,
             state_file=state_file,
             timeout=timeout,
+            pool_size=pool_size,
+            pool_idle_timeout=pool_idle_timeout,
+            state_backend=state_backend,
+            retry_max_attempts=retry_max_attempts,
+            retry_base_delay=retry_base_delay,
+            retry_max_delay=retry_max_delay,
+            rate_limit=rate_limit,
+            rate_burst=rate_burst,
+            max_delete_ratio=max_delete_ratio,
+            token_cache_file=token_cache_file,
+            circuit_failure_threshold=circuit_failure_threshold,
+            circuit_failure_rate=circuit_failure_rate,
+            circuit_reset_timeout=circuit_reset_timeout,
         )
 
 
+def _token_cache_path(raw: Optional[str], state_file: Path) -> Optional[Path]:
+    # "1"/"true" keeps the cache next to the state file; any other value is a path.
+    value = (raw or "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return state_file.parent / "token_cache.json"
+    return Path(value).expanduser().resolve()
+
+
 def _require_env(name: str) -> str:
     value = os.getenv(name)
     if not value:
         raise MissingConfiguration(f"Missing required configuration variable: {name}")
     return value
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise MissingConfiguration(f"Invalid integer value provided via {name}") from exc
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise MissingConfiguration(f"Invalid numeric value provided via {name}") from exc
@@ -2,12 +2,32 @@
 from __future__ import annotations
 
 import csv
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .models import Vehicle, vehicle_from_row
 from .normalizers import clean_row
+from .timing import CSV_PARSE, NORMALISATION, RunTimings
+
+# Rows handed to a worker process at once; large enough to amortise pickling.
+DEFAULT_CHUNK_SIZE = 2000
 
 
 class CsvValidationError(Exception):
@@ -33,29 +53,154 @@ class CsvRowError:
         return f"{label}: {self.message}"
 
 
-def load_vehicles_from_csv(path: Path) -> Tuple[List[Vehicle], List[CsvRowError]]:
-    """Load vehicles from a CSV file returning records and validation errors."""
+def load_vehicles_from_csv(
+    path: Path,
+    *,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timings: Optional[RunTimings] = None,
+) -> Tuple[List[Vehicle], List[CsvRowError]]:
+    """Parse *path* into vehicles and row errors; see :func:`iter_vehicles_from_csv`."""
 
-    vehicles: List[Vehicle] = []
     errors: List[CsvRowError] = []
+    vehicles = list(
+        iter_vehicles_from_csv(
+            path,
+            on_error=errors.append,
+            workers=workers,
+            chunk_size=chunk_size,
+            timings=timings,
+        )
+    )
+    return vehicles, errors
+
+
+def iter_vehicles_from_csv(
+    path: Path,
+    *,
+    on_error: Optional[Callable[[CsvRowError], None]] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timings: Optional[RunTimings] = None,
+) -> Iterator[Vehicle]:
+    """Yield vehicles from a CSV file one row at a time.
+
+    Rows failing validation are passed to *on_error* (when given) instead of
+    being yielded, so callers can start processing before the file is parsed.
+
+    With *workers* > 1 rows are normalised in chunks of *chunk_size* on a
+    process pool. Results are merged in file order, so vehicles and errors
+    (including line numbers) are identical to the single-process path. It only
+    pays off for large feeds; see ``benchmarks/bench_csv_loader.py``.
+
+    With *timings* the time spent reading CSV records and normalising them is
+    added to the ``csv_parse`` and ``normalisation`` stages; on a process pool
+    the latter is the time spent waiting for worker results.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
 
     with path.open("r", newline="", encoding="utf-8") as fp:
-        reader = csv.DictReader(fp)
-        line_number = 1  # account for header
-        for row in reader:
-            line_number += 1
+        rows = _numbered_rows(csv.DictReader(fp))
+        if timings is not None:
+            rows = _timed(rows, timings, CSV_PARSE)
+        results: Iterable[_RowResult]
+        if workers > 1:
+            results = _parse_in_processes(rows, workers, chunk_size, timings)
+        elif timings is not None:
+            results = _timed_rows(rows, timings)
+        else:
+            results = (_parse_row(number, row) for number, row in rows)
+        for result in results:
+            if isinstance(result, CsvRowError):
+                if on_error is not None:
+                    on_error(result)
+                continue
+            yield result
+
+
+_RowResult = Union[Vehicle, CsvRowError]
+_I = TypeVar("_I")
+
+
+def _numbered_rows(reader: Iterable[Dict[str, str]]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    # Line 1 is the header; numbering follows data rows, as reported to users.
+    return enumerate(reader, start=2)
+
+
+def _parse_row(line_number: int, row: Dict[str, str]) -> _RowResult:
+    try:
+        return vehicle_from_row(clean_row(row))
+    except Exception as exc:  # pylint: disable=broad-except
+        return CsvRowError(
+            line_number=line_number,
+            message=str(exc),
+            vin=(row.get("vin") or "").strip() or None,
+        )
+
+
+def _timed(iterator: Iterator[_I], timings: RunTimings, stage: str) -> Iterator[_I]:
+    # Time is accumulated locally and added once to keep per-row overhead low.
+    elapsed = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
             try:
-                vehicles.append(vehicle_from_row(clean_row(row)))
-            except Exception as exc:  # pylint: disable=broad-except
-                errors.append(
-                    CsvRowError(
-                        line_number=line_number,
-                        message=str(exc),
-                        vin=(row.get("vin") or "").strip() or None,
-                    )
-                )
-
-    return vehicles, errors
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - started
+            yield item
+    finally:
+        timings.add_stage(stage, elapsed)
+
+
+def _timed_rows(
+    rows: Iterator[Tuple[int, Dict[str, str]]], timings: RunTimings
+) -> Iterator[_RowResult]:
+    elapsed = 0.0
+    try:
+        for line_number, row in rows:
+            started = time.perf_counter()
+            result = _parse_row(line_number, row)
+            elapsed += time.perf_counter() - started
+            yield result
+    finally:
+        timings.add_stage(NORMALISATION, elapsed)
+
+
+def _parse_chunk(chunk: List[Tuple[int, Dict[str, str]]]) -> List[_RowResult]:
+    return [_parse_row(line_number, row) for line_number, row in chunk]
+
+
+def _parse_in_processes(
+    rows: Iterator[Tuple[int, Dict[str, str]]],
+    workers: int,
+    chunk_size: int,
+    timings: Optional[RunTimings] = None,
+) -> Iterator[_RowResult]:
+    # At most two chunks per worker are in flight so memory stays bounded.
+    waited = 0.0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future[List[_RowResult]]] = deque()
+            while True:
+                while len(pending) < workers * 2:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_parse_chunk, chunk))
+                if not pending:
+                    return
+                started = time.perf_counter()
+                results = pending.popleft().result()
+                waited += time.perf_counter() - started
+                yield from results
+    finally:
+        if timings is not None:
+            timings.add_stage(NORMALISATION, waited)
 
 
 def assert_no_errors(errors: Iterable[CsvRowError]) -> None:
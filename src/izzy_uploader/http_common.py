@@ -0,0 +1,103 @@
+"""Request/response handling shared by the blocking and asyncio API clients."""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy, parse_retry_after
+from .transport import IDEMPOTENT_METHODS, HttpResponse, TransportError
+
+
+class ApiError(RuntimeError):
+    """Raised when an API request fails.
+
+    ``status`` is ``None`` for transport failures. ``retryable`` tells whether
+    repeating the same request may succeed.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def request_headers(token: str, data: Optional[bytes]) -> Dict[str, str]:
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/json",
+    }
+    if data is not None:
+        headers["Content-Type"] = "application/json"
+    return headers
+
+
+def transport_failure(method: str, exc: TransportError) -> ApiError:
+    # A POST that reached the server may have been applied; only repeat it
+    # when the connection was never established.
+    return ApiError(
+        f"API request failed: {exc}",
+        retryable=method in IDEMPOTENT_METHODS or exc.connect_failed,
+    )
+
+
+def check_response(
+    method: str,
+    response: HttpResponse,
+    retry_policy: RetryPolicy,
+    rate_limiter: Optional[TokenBucket],
+) -> HttpResponse:
+    """Return *response* if it succeeded, otherwise raise :class:`ApiError`.
+
+    Feeds throttling signals to *rate_limiter* and decides whether the failed
+    *method* may be retried.
+    """
+
+    if rate_limiter is not None:
+        if response.status == 429:
+            rate_limiter.on_throttled()
+        elif response.status < 400:
+            rate_limiter.on_success()
+    if response.status >= 400:
+        body = response.body.decode("utf-8", errors="ignore")
+        retry_after = parse_retry_after(response.header("Retry-After"))
+        raise ApiError(
+            f"API request failed with status {response.status}: {body or response.reason}",
+            status=response.status,
+            retryable=retryable_status(method, response.status, retry_after, retry_policy),
+            retry_after=retry_after,
+        )
+    return response
+
+
+def retryable_status(
+    method: str, status: int, retry_after: Optional[float], retry_policy: RetryPolicy
+) -> bool:
+    if not retry_policy.is_retryable_status(status):
+        return False
+    if method in IDEMPOTENT_METHODS:
+        return True
+    # A gateway error or timeout may follow a committed POST; repeat it only
+    # when the server says it did not process the request.
+    return status == 429 or (status == 503 and retry_after is not None)
+
+
+def decode_body(response: HttpResponse) -> Any:
+    if not response.body:
+        return {}
+    return json.loads(response.body.decode("utf-8"))
+
+
+def created_car_id(response: Any) -> str:
+    try:
+        return str(response["id"])
+    except (KeyError, TypeError) as exc:
+        raise RuntimeError("Unexpected response while creating vehicle") from exc
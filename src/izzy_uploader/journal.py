@@ -0,0 +1,173 @@
+"""Append-only journal of completed sync operations used to resume crashed runs."""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional
+
+from .models import Vehicle
+from .state import StateStore
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking only
+    from .pipelines.import_pipeline import PipelineReport
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+DELETED = "deleted"
+
+_RUN_ID_PATTERN = re.compile(r"^[0-9A-Za-z-]+$")
+
+
+class JournalError(RuntimeError):
+    """Raised when a run journal cannot be created or resumed."""
+
+
+class RunJournal:
+    """JSON-lines journal of one synchronisation run.
+
+    The first line holds the run options; every completed operation is appended
+    and flushed as soon as it succeeds, so a crashed run can be resumed without
+    re-sending finished requests and without losing car ids that never reached
+    the state file. Finished runs delete their journal.
+    """
+
+    def __init__(self, path: Path, run_id: str, options: Dict[str, Any]):
+        self.path = path
+        self.run_id = run_id
+        self.options = options
+        self._completed: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._handle = path.open("a", encoding="utf-8")
+
+    @classmethod
+    def create(cls, directory: Path, options: Dict[str, Any]) -> "RunJournal":
+        directory.mkdir(parents=True, exist_ok=True)
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        path = directory / f"{run_id}.jsonl"
+        journal = cls(path, run_id, options)
+        journal._write({"run_id": run_id, "started_at": time.time(), "options": options})
+        return journal
+
+    @classmethod
+    def resume(cls, directory: Path, run_id: str) -> "RunJournal":
+        if not _RUN_ID_PATTERN.match(run_id):
+            raise JournalError(f"Invalid run id: {run_id}")
+        path = directory / f"{run_id}.jsonl"
+        if not path.exists():
+            raise JournalError(
+                f"Run journal {run_id} not found in {directory} (finished runs are removed)"
+            )
+        lines = _read_lines(path)
+        header = next(lines, None)
+        if header is None or header.get("run_id") != run_id:
+            raise JournalError(f"Run journal {path} is corrupt")
+        completed = {entry["vin"]: entry for entry in lines if "vin" in entry}
+        with path.open("rb+") as handle:
+            handle.seek(-1, 2)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")  # terminate a line cut short by the crash
+        journal = cls(path, run_id, header.get("options") or {})
+        journal._completed = completed
+        return journal
+
+    @property
+    def completed_count(self) -> int:
+        return len(self._completed)
+
+    def record(
+        self,
+        action: str,
+        vin: str,
+        car_id: str,
+        *,
+        configuration_number: Optional[str] = None,
+        payload_hash: Optional[str] = None,
+    ) -> None:
+        entry: Dict[str, Any] = {"action": action, "vin": vin, "car_id": car_id}
+        if configuration_number is not None:
+            entry["configuration_number"] = configuration_number
+        if payload_hash is not None:
+            entry["payload_hash"] = payload_hash
+        with self._lock:
+            self._completed[vin] = entry
+            self._write(entry)
+
+    def pending(
+        self, vehicles: Iterable[Vehicle], state_store: StateStore, report: "PipelineReport"
+    ) -> Iterator[Vehicle]:
+        """Yield vehicles not completed in an earlier attempt; replay the others."""
+
+        for vehicle in vehicles:
+            if not self.replay(vehicle.vin, state_store, report):
+                yield vehicle
+
+    def replay(self, vin: str, state_store: StateStore, report: "PipelineReport") -> bool:
+        """Re-apply a completed operation for *vin* to the state and report.
+
+        Returns ``False`` when *vin* still has to be processed.
+        """
+
+        entry = self._completed.get(vin)
+        if entry is None:
+            return False
+        action, car_id = entry["action"], entry["car_id"]
+        if action == CREATED:
+            state_store.upsert(
+                vin,
+                car_id,
+                entry.get("configuration_number"),
+                payload_hash=entry.get("payload_hash"),
+            )
+            report.record_created(vin, car_id)
+        elif action == UPDATED:
+            state_store.mark_active(vin)
+            state_store.set_payload_hash(vin, entry.get("payload_hash"))
+            report.record_updated(vin, car_id)
+        elif action == UNCHANGED:
+            report.record_unchanged(vin, car_id)
+        elif action == DELETED:
+            state_store.mark_deleted(vin)
+            report.record_deleted(vin, car_id)
+        else:
+            return False
+        return True
+
+    def replay_deletions(self, state_store: StateStore, report: "PipelineReport") -> None:
+        """Re-apply deletions completed in an earlier attempt."""
+
+        for vin, entry in list(self._completed.items()):
+            if entry["action"] == DELETED:
+                self.replay(vin, state_store, report)
+
+    def finish(self) -> None:
+        """Close and remove the journal after the run completed."""
+
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+    # -- internals --------------------------------------------------
+    def _write(self, entry: Dict[str, Any]) -> None:
+        # Flushing hands each line to the OS, which is enough to survive a
+        # killed process; a full fsync per request would dominate run time.
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+
+def _read_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # The last line may be cut short when the process was killed.
+                continue
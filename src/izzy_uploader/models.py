@@ -1,6 +1,8 @@
 """Domain models used by the Izzy Uploader service."""
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
@@ -82,6 +84,14 @@ class Vehicle:
         # Drop keys with ``None`` values to keep the payload leaner.
         return {key: value for key, value in payload.items() if value is not None}
 
+    def payload_fingerprint(self) -> str:
+        """Return a stable hash of :meth:`to_api_payload` used for change detection."""
+
+        canonical = json.dumps(
+            self.to_api_payload(), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 
 def vehicle_from_row(row: Dict[str, str]) -> Vehicle:
     """Create a :class:`Vehicle` instance from a CSV row."""
@@ -4,15 +4,25 @@ from __future__ import annotations
 import json
 import os
 import re
+import tempfile
+import threading
+import time
 import unicodedata
+from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
 CONFIG_ROOT = Path(__file__).resolve().parent.parent / "config"
 DEFAULT_LOCATION_MAP_PATH = CONFIG_ROOT / "location_map.json"
 LOCATION_MAP_ENV = "IZZYLEASE_LOCATION_MAP_FILE"
+# How often (seconds) the location map file is stat()-ed for changes.
+LOCATION_MAP_CHECK_INTERVAL = 1.0
 DEFAULT_ENGINE_CODE = "-"
+# Distinct raw values per enum column are few; this bounds the memo table.
+ENUM_CACHE_SIZE = 4096
 
 
 def clean_row(row: Dict[str, str]) -> Dict[str, str]:
@@ -20,14 +30,14 @@ def clean_row(row: Dict[str, str]) -> Dict[str, str]:
 
     cleaned: Dict[str, str] = {key: _prepare_value(value) for key, value in row.items()}
 
-    cleaned["category"] = _map_enum(cleaned.get("category"), CATEGORY_MAP)
-    cleaned["fuelType"] = _map_enum(cleaned.get("fuelType"), FUEL_MAP)
-    cleaned["transmissionType"] = _map_enum(cleaned.get("transmissionType"), TRANSMISSION_MAP)
-    cleaned["driveWheels"] = _map_enum(cleaned.get("driveWheels"), DRIVE_WHEELS_MAP)
-    cleaned["type"] = _map_enum(cleaned.get("type"), VEHICLE_TYPE_MAP)
+    cleaned["category"] = _map_enum(cleaned.get("category"), "category")
+    cleaned["fuelType"] = _map_enum(cleaned.get("fuelType"), "fuel")
+    cleaned["transmissionType"] = _map_enum(cleaned.get("transmissionType"), "transmission")
+    cleaned["driveWheels"] = _map_enum(cleaned.get("driveWheels"), "drive_wheels")
+    cleaned["type"] = _map_enum(cleaned.get("type"), "vehicle_type")
     cleaned["segment"] = _normalise_segment(cleaned.get("segment"))
     cleaned["carClass"] = _map_enum(
-        cleaned.get("carClass"), CAR_CLASS_MAP, default_upper=False, allow_empty=True
+        cleaned.get("carClass"), "car_class", default_upper=False, allow_empty=True
     )
 
     if not cleaned["carClass"]:
@@ -116,19 +126,26 @@ def _normalise_date(raw: str) -> str:
 
 def _map_enum(
     value: Optional[str],
-    mapping: Dict[str, str],
+    mapping_name: str,
     *,
     default_upper: bool = True,
     allow_empty: bool = False,
 ) -> str:
     if not value:
         return "" if allow_empty else ""
+    return _resolve_enum(mapping_name, value, default_upper)
 
-    if mapping is TRANSMISSION_MAP and value:
+
+@lru_cache(maxsize=ENUM_CACHE_SIZE)
+def _resolve_enum(mapping_name: str, value: str, default_upper: bool) -> str:
+    """Resolve *value* against ``ENUM_MAPS[mapping_name]``; memoised per raw value."""
+
+    mapping = ENUM_MAPS[mapping_name]
+    if mapping_name == "transmission":
         raw_upper = value.upper()
         if "DSG" in raw_upper or "DCT" in raw_upper:
             return "AUTOMATIC"
-    if mapping is DRIVE_WHEELS_MAP and value:
+    if mapping_name == "drive_wheels":
         raw_upper = value.upper()
         if "4X4" in raw_upper:
             return "FOUR"
@@ -140,6 +157,24 @@ def _map_enum(
     return value.strip().upper() if default_upper else ""
 
 
+def enum_cache_info() -> Dict[str, int]:
+    """Return hit/miss statistics of the enum normalisation memo table."""
+
+    info = _resolve_enum.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": ENUM_CACHE_SIZE,
+    }
+
+
+def clear_enum_cache() -> None:
+    """Drop memoised enum resolutions (e.g. after changing ``ENUM_MAPS``)."""
+
+    _resolve_enum.cache_clear()
+
+
 def _map_location(value: Optional[str]) -> str:
     if not value:
         return ""
@@ -148,18 +183,64 @@ def _map_location(value: Optional[str]) -> str:
     return mapping.get(partner_id, "")
 
 
-def _load_location_map() -> Dict[str, str]:
-    if not hasattr(_load_location_map, "_cache"):
-        mapping_path = get_location_map_path()
-        if mapping_path.exists():
-            try:
-                with mapping_path.open("r", encoding="utf-8") as handle:
-                    _load_location_map._cache = json.load(handle)
-            except (OSError, json.JSONDecodeError):
-                _load_location_map._cache = {}
+@dataclass(frozen=True)
+class _LocationMapSnapshot:
+    path: Path
+    signature: Optional[Tuple[int, int, int]]
+    mapping: Mapping[str, str]
+    checked_at: float
+
+
+_location_snapshot: Optional[_LocationMapSnapshot] = None
+_location_lock = threading.Lock()
+
+
+def _load_location_map() -> Mapping[str, str]:
+    """Return the shared read-only location mapping, reloading it when the file changes.
+
+    The configured path is resolved and the file stat()-ed at most once per
+    ``LOCATION_MAP_CHECK_INTERVAL``; a new path, inode, mtime or size (e.g. a
+    save from another worker) triggers a reload. In between, a lookup costs one
+    clock read.
+    """
+
+    snapshot = _location_snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - snapshot.checked_at < LOCATION_MAP_CHECK_INTERVAL:
+        return snapshot.mapping
+    return _reload_location_map(now)
+
+
+def _reload_location_map(now: float) -> Mapping[str, str]:
+    global _location_snapshot  # pylint: disable=global-statement
+
+    path = get_location_map_path()
+    with _location_lock:
+        snapshot = _location_snapshot
+        signature = _file_signature(path)
+        if snapshot is not None and snapshot.path == path and snapshot.signature == signature:
+            mapping = snapshot.mapping
         else:
-            _load_location_map._cache = {}
-    return dict(getattr(_load_location_map, "_cache"))
+            mapping = MappingProxyType(_read_location_map(path) if signature else {})
+        _location_snapshot = _LocationMapSnapshot(path, signature, mapping, now)
+        return mapping
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _read_location_map(path: Path) -> Dict[str, str]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
 def _normalise_key(value: str) -> str:
@@ -196,7 +277,7 @@ def get_location_map_path() -> Path:
 def load_location_map() -> Dict[str, str]:
     """Return a copy of the location mapping."""
 
-    return _load_location_map()
+    return dict(_load_location_map())
 
 
 def save_location_map(mapping: Dict[str, str]) -> None:
@@ -204,15 +285,26 @@ def save_location_map(mapping: Dict[str, str]) -> None:
 
     path = get_location_map_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(mapping, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Replace the file atomically so concurrent readers never see a partial map.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(mapping, handle, ensure_ascii=False, indent=2)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
     refresh_location_map()
 
 
 def refresh_location_map() -> None:
     """Clear cached mapping so future lookups reload the file."""
 
-    if hasattr(_load_location_map, "_cache"):
-        delattr(_load_location_map, "_cache")
+    global _location_snapshot  # pylint: disable=global-statement
+
+    with _location_lock:
+        _location_snapshot = None
 
 
 def _normalise_segment(value: Optional[str]) -> str:
@@ -321,3 +413,12 @@ CAR_CLASS_MAP = {
     "sweet": "SWEET",
     "adrenaline": "ADRENALINE",
 }
+
+ENUM_MAPS: Dict[str, Dict[str, str]] = {
+    "category": CATEGORY_MAP,
+    "fuel": FUEL_MAP,
+    "transmission": TRANSMISSION_MAP,
+    "drive_wheels": DRIVE_WHEELS_MAP,
+    "vehicle_type": VEHICLE_TYPE_MAP,
+    "car_class": CAR_CLASS_MAP,
+}
@@ -0,0 +1,187 @@
+"""Asyncio counterpart of :mod:`izzy_uploader.pipelines.import_pipeline`."""
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Iterable, Optional, Set, TypeVar
+
+from ..async_client import AsyncIzzyleaseClient
+from ..models import Vehicle
+from ..journal import RunJournal
+from ..state import StateStore
+from ..timing import SYNC, RunTimings
+from .import_pipeline import PipelineReport, SynchronizerBase
+from .plan import CREATE, DELETE, SKIP, UPDATE
+from .progress import ProgressCallback, ProgressTracker
+
+_T = TypeVar("_T")
+
+
+class AsyncVehicleSynchronizer(SynchronizerBase):
+    """Coordinates vehicle synchronisation on a single event loop.
+
+    Behaves like :class:`~izzy_uploader.pipelines.import_pipeline.VehicleSynchronizer`
+    but keeps up to ``max_in_flight`` API calls outstanding at once without
+    spawning threads. With ``adaptive`` that number is tuned between one and
+    ``max_in_flight`` while the run progresses.
+    """
+
+    def __init__(
+        self,
+        client: AsyncIzzyleaseClient,
+        state_store: StateStore,
+        *,
+        max_in_flight: int = 100,
+        adaptive: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        progress_interval: float = 0.5,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        super().__init__(
+            state_store,
+            max_concurrency=max_in_flight,
+            adaptive=adaptive,
+            progress_callback=progress_callback,
+            progress_interval=progress_interval,
+        )
+        self._client = client
+
+    async def run(
+        self,
+        vehicles: Iterable[Vehicle],
+        *,
+        close_missing: bool = False,
+        update_prices: bool = False,  # retained for backward compatibility
+        force: bool = False,
+        stream: bool = False,
+        journal: Optional[RunJournal] = None,
+        max_delete_ratio: float = 0.0,
+        timings: Optional[RunTimings] = None,
+    ) -> PipelineReport:
+        """Synchronise *vehicles* with the API; see ``VehicleSynchronizer.run``."""
+
+        run = self._begin(
+            vehicles,
+            close_missing=close_missing,
+            stream=stream,
+            journal=journal,
+            max_delete_ratio=max_delete_ratio,
+            timings=timings,
+        )
+        if run.progress is None:
+            return run.report
+
+        with run.report.timings.stage(SYNC):
+            await self._execute(
+                partial(self._upsert_vehicle, force=force, journal=journal),
+                run.pending,
+                run.report,
+                run.progress,
+            )
+            if close_missing:
+                await self._execute(
+                    partial(self._delete_vehicle, journal=journal),
+                    self._vehicles_to_close(run, journal, max_delete_ratio=max_delete_ratio),
+                    run.report,
+                    run.progress,
+                )
+
+        return self._finish(run)
+
+    async def _execute(
+        self,
+        operation: Callable[[_T, PipelineReport], Awaitable[None]],
+        items: Iterable[_T],
+        report: PipelineReport,
+        progress: ProgressTracker,
+    ) -> None:
+        """Run *operation* for every item with at most ``max_in_flight`` pending.
+
+        An adaptive controller lowers that bound to its current limit.
+        """
+
+        tasks: Set["asyncio.Task[None]"] = set()
+
+        async def step(item: _T) -> None:
+            await operation(item, report)
+            progress.advance()
+
+        for item in items:
+            while len(tasks) >= self._capacity(report):
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            tasks.add(asyncio.create_task(step(item)))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    # -- helpers ---------------------------------------------------------
+    async def _upsert_vehicle(
+        self,
+        vehicle: Vehicle,
+        report: PipelineReport,
+        *,
+        force: bool = False,
+        journal: Optional[RunJournal] = None,
+    ) -> None:
+        fingerprint = vehicle.payload_fingerprint()
+        planned = self._plan_upsert(vehicle, fingerprint, report, force=force, journal=journal)
+        if planned.action == SKIP:
+            return
+        retries = 0
+        if planned.action == UPDATE:
+            assert planned.car_id is not None
+            try:
+                with self._api_call(report, UPDATE, vehicle.vin):
+                    await self._client.update_vehicle(planned.car_id, vehicle)
+            except Exception as exc:  # pylint: disable=broad-except
+                if not self._update_failed(exc, vehicle, planned.car_id, report):
+                    return
+                retries = self._last_retry_count()
+            else:
+                self._record_updated(vehicle, planned.car_id, fingerprint, report, journal)
+                return
+        await self._recreate_vehicle(
+            vehicle, report, fingerprint, previous_retries=retries, journal=journal
+        )
+
+    async def _recreate_vehicle(
+        self,
+        vehicle: Vehicle,
+        report: PipelineReport,
+        fingerprint: str,
+        *,
+        previous_retries: int = 0,
+        journal: Optional[RunJournal] = None,
+    ) -> None:
+        try:
+            with self._api_call(report, CREATE, vehicle.vin):
+                created_id = await self._client.create_vehicle(vehicle)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._create_failed(
+                exc, vehicle, report, retries=previous_retries + self._last_retry_count()
+            )
+            return
+        self._record_created(
+            vehicle,
+            created_id,
+            fingerprint,
+            report,
+            journal,
+            retries=previous_retries + self._last_retry_count(),
+        )
+
+    async def _delete_vehicle(
+        self, vin: str, report: PipelineReport, *, journal: Optional[RunJournal] = None
+    ) -> None:
+        car_id = self._state_store.get_car_id(vin)
+        if not car_id:
+            return
+        try:
+            with self._api_call(report, DELETE, vin):
+                await self._client.delete_vehicle(car_id)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._delete_failed(exc, vin, car_id, report)
+            return
+        self._record_deleted(vin, car_id, report, journal)
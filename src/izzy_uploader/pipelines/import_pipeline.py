@@ -2,15 +2,39 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional, Set
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, TypeVar
 
+from ..circuit import CircuitOpenError
 from ..client import IzzyleaseClient
+from ..concurrency import AdaptiveConcurrency
 from ..models import Vehicle, unique_vins
-from ..state import VehicleStateStore
+from ..journal import CREATED, DELETED, UNCHANGED, UPDATED, RunJournal
+from ..state import StateStore
+from ..timing import STATE_SAVE, SYNC, RunTimings
+from .plan import (
+    CREATE,
+    DELETE,
+    SKIP,
+    UPDATE,
+    PlannedOperation,
+    SyncPlan,
+    build_sync_plan,
+    deletion_limit_error,
+)
+from .progress import ProgressCallback, ProgressTracker
 
 LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Reason recorded for operations skipped while the API circuit is open.
+API_UNAVAILABLE = "API unavailable"
+
 
 @dataclass
 class PipelineReport:
@@ -18,140 +42,614 @@ class PipelineReport:
 
     created: int = 0
     updated: int = 0
+    unchanged: int = 0
     price_updates: int = 0  # kept for CLI compatibility, always zero in new flow
     closed: int = 0
+    skipped: int = 0
     errors: List[str] = field(default_factory=list)
     error_details: List[dict] = field(default_factory=list)
     created_vehicles: List[dict] = field(default_factory=list)
     updated_vehicles: List[dict] = field(default_factory=list)
+    unchanged_vehicles: List[dict] = field(default_factory=list)
     deleted_vehicles: List[dict] = field(default_factory=list)
+    skipped_vehicles: List[dict] = field(default_factory=list)
+    timings: RunTimings = field(default_factory=RunTimings, repr=False, compare=False)
+    concurrency: Optional[AdaptiveConcurrency] = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def as_dict(self, *, include_details: bool = False) -> dict[str, object]:
         payload: dict[str, object] = {
             "created": self.created,
             "updated": self.updated,
+            "unchanged": self.unchanged,
             "price_updates": self.price_updates,
             "closed": self.closed,
+            "skipped": self.skipped,
             "errors": len(self.errors),
         }
         if include_details:
             payload["detail"] = {
                 "created": self.created_vehicles,
                 "updated": self.updated_vehicles,
+                "unchanged": self.unchanged_vehicles,
                 "deleted": self.deleted_vehicles,
+                "skipped": self.skipped_vehicles,
                 "errors": self.error_details,
             }
+            payload["timings"] = self.timings.as_dict()
+            if self.concurrency is not None:
+                payload["concurrency"] = self.concurrency.as_dict()
         return payload
 
+    def record_created(self, vin: str, car_id: str, *, retries: int = 0) -> None:
+        with self._lock:
+            self.created += 1
+            self.created_vehicles.append(_detail(vin, car_id, retries))
+
+    def record_updated(self, vin: str, car_id: str, *, retries: int = 0) -> None:
+        with self._lock:
+            self.updated += 1
+            self.updated_vehicles.append(_detail(vin, car_id, retries))
+
+    def record_unchanged(self, vin: str, car_id: str) -> None:
+        with self._lock:
+            self.unchanged += 1
+            self.unchanged_vehicles.append(_detail(vin, car_id, 0))
+
+    def record_deleted(self, vin: str, car_id: str, *, retries: int = 0) -> None:
+        with self._lock:
+            self.closed += 1
+            self.deleted_vehicles.append(_detail(vin, car_id, retries))
+
+    def record_skipped(self, vin: str, car_id: Optional[str], reason: str) -> None:
+        """Record an operation that was not attempted, e.g. during an API outage."""
+
+        with self._lock:
+            self.skipped += 1
+            self.skipped_vehicles.append({"vin": vin, "car_id": car_id, "reason": reason})
+
     def record_error(
         self,
         message: str,
         vin: Optional[str] = None,
         car_id: Optional[str] = None,
+        *,
+        retries: int = 0,
     ) -> None:
-        self.errors.append(message)
-        self.error_details.append(
-            {
-                "vin": vin,
-                "car_id": car_id,
-                "error_message": message,
-            }
-        )
+        detail: dict = {
+            "vin": vin,
+            "car_id": car_id,
+            "error_message": message,
+        }
+        if retries:
+            detail["retries"] = retries
+        with self._lock:
+            self.errors.append(message)
+            self.error_details.append(detail)
 
+    def sort_details(self) -> None:
+        """Order detail lists by VIN so reports are stable regardless of scheduling."""
 
-class VehicleSynchronizer:
-    """Coordinates vehicle synchronisation with the remote API."""
+        with self._lock:
+            for details in (
+                self.created_vehicles,
+                self.updated_vehicles,
+                self.unchanged_vehicles,
+                self.deleted_vehicles,
+                self.skipped_vehicles,
+            ):
+                details.sort(key=lambda item: item["vin"])
+            paired = sorted(
+                zip(self.errors, self.error_details),
+                key=lambda item: (item[1]["vin"] is None, item[1]["vin"] or ""),
+            )
+            self.errors = [message for message, _ in paired]
+            self.error_details = [detail for _, detail in paired]
 
-    def __init__(self, client: IzzyleaseClient, state_store: VehicleStateStore):
-        self._client = client
+
+@dataclass
+class _SyncRun:
+    """Input of one run once the feed has been validated; ``progress`` is unset when aborted."""
+
+    report: PipelineReport
+    pending: Iterable[Vehicle] = ()
+    desired_vins: Set[str] = field(default_factory=set)
+    progress: Optional[ProgressTracker] = None
+
+
+class SynchronizerBase:
+    """Sync decisions and bookkeeping shared by the thread and asyncio synchronizers.
+
+    Subclasses only schedule work and issue the (possibly awaited) client calls;
+    which call a vehicle needs and how every outcome is recorded in the state
+    store, the journal and the report is decided here.
+    """
+
+    _client: Any
+
+    def __init__(
+        self,
+        state_store: StateStore,
+        *,
+        max_concurrency: int,
+        adaptive: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        progress_interval: float = 0.5,
+    ):
         self._state_store = state_store
+        self._max_concurrency = max_concurrency
+        self._adaptive = adaptive
+        self._progress_callback = progress_callback
+        self._progress_interval = progress_interval
 
-    def run(
+    def plan(
         self,
         vehicles: Iterable[Vehicle],
         *,
         close_missing: bool = False,
-        update_prices: bool = False,  # retained for backward compatibility
-    ) -> PipelineReport:
-        report = PipelineReport()
+        force: bool = False,
+        max_delete_ratio: float = 0.0,
+    ) -> SyncPlan:
+        """Return the operations a run would perform, without calling the API."""
 
-        try:
-            desired = unique_vins(vehicles)
-        except ValueError as exc:
-            report.record_error(str(exc))
-            return report
+        return build_sync_plan(
+            vehicles,
+            self._state_store,
+            close_missing=close_missing,
+            force=force,
+            max_delete_ratio=max_delete_ratio,
+        )
+
+    # -- run lifecycle ---------------------------------------------------
+    def _begin(
+        self,
+        vehicles: Iterable[Vehicle],
+        *,
+        close_missing: bool,
+        stream: bool,
+        journal: Optional[RunJournal],
+        max_delete_ratio: float,
+        timings: Optional[RunTimings],
+    ) -> _SyncRun:
+        report = PipelineReport(
+            timings=timings or RunTimings(),
+            concurrency=AdaptiveConcurrency(self._max_concurrency) if self._adaptive else None,
+        )
+        run = _SyncRun(report)
+
+        pending: Iterable[Vehicle]
+        if stream:
+            pending = _skip_duplicate_vins(vehicles, run.desired_vins, report)
+            if journal is not None:
+                pending = journal.pending(pending, self._state_store, report)
+            total: Optional[int] = None
+        else:
+            try:
+                desired = unique_vins(vehicles)
+            except ValueError as exc:
+                report.record_error(str(exc))
+                report.timings.finish()
+                return run
+            run.desired_vins = set(desired)
+            if close_missing:
+                known = set(self._state_store.known_vins())
+                limit_error = deletion_limit_error(
+                    len(known - run.desired_vins), len(known), max_delete_ratio
+                )
+                if limit_error:
+                    report.record_error(limit_error)
+                    report.timings.finish()
+                    return run
+            pending = desired.values()
+            if journal is not None:
+                pending = list(journal.pending(pending, self._state_store, report))
+            total = len(pending)
 
-        for vehicle in desired.values():
-            self._upsert_vehicle(vehicle, report)
+        run.pending = pending
+        run.progress = ProgressTracker(
+            self._progress_callback, report, total=total, interval=self._progress_interval
+        )
+        return run
+
+    def _vehicles_to_close(
+        self, run: _SyncRun, journal: Optional[RunJournal], *, max_delete_ratio: float
+    ) -> List[str]:
+        """VINs to delete with ``close_missing``; empty when the ratio guard trips."""
 
-        if close_missing:
-            self._close_missing_vehicles(set(desired), report)
+        if journal is not None:
+            journal.replay_deletions(self._state_store, run.report)
+        known = set(self._state_store.known_vins())
+        missing = known - run.desired_vins
+        limit_error = deletion_limit_error(len(missing), len(known), max_delete_ratio)
+        if limit_error:
+            LOGGER.error(limit_error)
+            run.report.record_error(limit_error)
+            return []
+        assert run.progress is not None
+        run.progress.add_total(len(missing))
+        return sorted(missing)
 
+    def _finish(self, run: _SyncRun) -> PipelineReport:
+        report = run.report
         try:
-            self._state_store.save()
+            with report.timings.stage(STATE_SAVE):
+                self._state_store.save()
         except Exception as exc:  # pylint: disable=broad-except
             LOGGER.exception("Failed to persist vehicle state")
             report.record_error(f"Failed to persist synchronisation state: {exc}")
 
+        report.sort_details()
+        report.timings.finish()
+        if run.progress is not None:
+            run.progress.finish()
         return report
 
-    # -- helpers ---------------------------------------------------------
-    def _upsert_vehicle(self, vehicle: Vehicle, report: PipelineReport) -> None:
-        vin_label = vehicle.vin
-        state_car_id = self._state_store.get_car_id(vin_label)
-        car_label = vehicle.configuration_number or vin_label
+    def _capacity(self, report: PipelineReport) -> int:
+        """Items that may be in flight now: the adaptive limit when enabled."""
+
+        if report.concurrency is None:
+            return self._max_concurrency
+        return report.concurrency.limit
+
+    # -- per-vehicle decisions and outcomes ------------------------------
+    def _plan_upsert(
+        self,
+        vehicle: Vehicle,
+        fingerprint: str,
+        report: PipelineReport,
+        *,
+        force: bool,
+        journal: Optional[RunJournal],
+    ) -> PlannedOperation:
+        """Choose the call *vehicle* needs; unchanged vehicles are recorded right away."""
+
+        car_id = self._state_store.get_car_id(vehicle.vin)
+        if not car_id:
+            return PlannedOperation(CREATE, vehicle.vin)
+        if not force and self._state_store.get_payload_hash(vehicle.vin) == fingerprint:
+            report.record_unchanged(vehicle.vin, car_id)
+            if journal is not None:
+                journal.record(UNCHANGED, vehicle.vin, car_id)
+            return PlannedOperation(SKIP, vehicle.vin, car_id)
+        return PlannedOperation(UPDATE, vehicle.vin, car_id)
+
+    def _record_updated(
+        self,
+        vehicle: Vehicle,
+        car_id: str,
+        fingerprint: str,
+        report: PipelineReport,
+        journal: Optional[RunJournal],
+    ) -> None:
+        self._state_store.mark_active(vehicle.vin)
+        self._state_store.set_payload_hash(vehicle.vin, fingerprint)
+        report.record_updated(vehicle.vin, car_id, retries=self._last_retry_count())
+        if journal is not None:
+            journal.record(UPDATED, vehicle.vin, car_id, payload_hash=fingerprint)
+
+    def _update_failed(
+        self, exc: Exception, vehicle: Vehicle, car_id: str, report: PipelineReport
+    ) -> bool:
+        """Record a failed update; return True when the vehicle should be recreated."""
+
+        car_label = vehicle.configuration_number or vehicle.vin
+        if isinstance(exc, CircuitOpenError):
+            report.record_skipped(vehicle.vin, car_id, API_UNAVAILABLE)
+            return False
+        if _is_not_found_error(exc):
+            LOGGER.info("Remote vehicle %s missing; attempting to recreate it", car_label)
+            return True
+        LOGGER.error("Failed to update vehicle %s", car_label, exc_info=exc)
+        report.record_error(
+            f"update failed: {exc}",
+            vin=vehicle.vin,
+            car_id=car_id,
+            retries=self._last_retry_count(),
+        )
+        return False
+
+    def _record_created(
+        self,
+        vehicle: Vehicle,
+        created_id: str,
+        fingerprint: str,
+        report: PipelineReport,
+        journal: Optional[RunJournal],
+        *,
+        retries: int,
+    ) -> None:
+        self._state_store.upsert(
+            vehicle.vin, created_id, vehicle.configuration_number, payload_hash=fingerprint
+        )
+        report.record_created(vehicle.vin, created_id, retries=retries)
+        if journal is not None:
+            journal.record(
+                CREATED,
+                vehicle.vin,
+                created_id,
+                configuration_number=vehicle.configuration_number,
+                payload_hash=fingerprint,
+            )
+
+    def _create_failed(
+        self, exc: Exception, vehicle: Vehicle, report: PipelineReport, *, retries: int
+    ) -> None:
+        if isinstance(exc, CircuitOpenError):
+            report.record_skipped(vehicle.vin, None, API_UNAVAILABLE)
+            return
+        LOGGER.error(
+            "Failed to create vehicle %s", vehicle.configuration_number or vehicle.vin, exc_info=exc
+        )
+        report.record_error(f"creation failed: {exc}", vin=vehicle.vin, retries=retries)
+
+    def _record_deleted(
+        self, vin: str, car_id: str, report: PipelineReport, journal: Optional[RunJournal]
+    ) -> None:
+        self._state_store.mark_deleted(vin)
+        report.record_deleted(vin, car_id, retries=self._last_retry_count())
+        if journal is not None:
+            journal.record(DELETED, vin, car_id)
+
+    def _delete_failed(
+        self, exc: Exception, vin: str, car_id: str, report: PipelineReport
+    ) -> None:
+        if isinstance(exc, CircuitOpenError):
+            report.record_skipped(vin, car_id, API_UNAVAILABLE)
+            return
+        LOGGER.error("Failed to delete vehicle with VIN %s", vin, exc_info=exc)
+        report.record_error(
+            f"deletion failed: {exc}", vin=vin, car_id=car_id, retries=self._last_retry_count()
+        )
+
+    @contextmanager
+    def _api_call(self, report: PipelineReport, operation: str, vin: str) -> Iterator[None]:
+        with report.timings.api_call(operation, vin):
+            if report.concurrency is None:
+                yield
+            else:
+                with report.concurrency.measure(self._last_retry_count):
+                    yield
+
+    def _last_retry_count(self) -> int:
+        # Test doubles and custom clients may not track retries.
+        return getattr(self._client, "last_retry_count", 0)
+
+
+class VehicleSynchronizer(SynchronizerBase):
+    """Coordinates vehicle synchronisation with the remote API."""
+
+    def __init__(
+        self,
+        client: IzzyleaseClient,
+        state_store: StateStore,
+        *,
+        max_workers: int = 1,
+        adaptive: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        progress_interval: float = 0.5,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        super().__init__(
+            state_store,
+            max_concurrency=max_workers,
+            adaptive=adaptive,
+            progress_callback=progress_callback,
+            progress_interval=progress_interval,
+        )
+        self._client = client
+
+    def run(
+        self,
+        vehicles: Iterable[Vehicle],
+        *,
+        close_missing: bool = False,
+        update_prices: bool = False,  # retained for backward compatibility
+        force: bool = False,
+        stream: bool = False,
+        journal: Optional[RunJournal] = None,
+        max_delete_ratio: float = 0.0,
+        timings: Optional[RunTimings] = None,
+    ) -> PipelineReport:
+        """Synchronise *vehicles* with the API.
+
+        Known vehicles whose payload fingerprint matches the one stored after the
+        last successful call are skipped unless *force* is set.
+
+        By default the whole feed is validated for duplicate VINs before the first
+        request. With *stream* the iterable is consumed lazily so syncing starts
+        while it is still being produced; duplicates are then reported and skipped
+        individually, and only the VINs are kept in memory.
+
+        When a ``progress_callback`` was given it receives a
+        :class:`~izzy_uploader.pipelines.progress.SyncProgress` snapshot at most
+        every ``progress_interval`` seconds and once more when the run ends. The
+        total (and so the ETA) is unknown while streaming.
+
+        With *close_missing*, *max_delete_ratio* (0 < ratio <= 1) aborts when more
+        than that share of the known fleet would be closed. Without *stream* the
+        check runs before any request is sent; while streaming it runs before the
+        deletions, once the full set of VINs is known.
+
+        With a *journal* every completed operation is recorded as it happens.
+        Vehicles already completed in a resumed journal are not sent again; their
+        outcome is replayed into the state store and the report instead.
+
+        Stage durations and per-operation API latencies are collected in
+        ``report.timings``. Pass *timings* to include stages measured before the
+        run (CSV parsing, state loading) and to start the wall clock earlier.
+
+        With ``adaptive`` the number of API calls in flight starts at one and is
+        tuned by an :class:`~izzy_uploader.concurrency.AdaptiveConcurrency`
+        controller up to ``max_workers``; its history ends up in
+        ``report.concurrency``.
+        """
+
+        run = self._begin(
+            vehicles,
+            close_missing=close_missing,
+            stream=stream,
+            journal=journal,
+            max_delete_ratio=max_delete_ratio,
+            timings=timings,
+        )
+        if run.progress is None:
+            return run.report
+
+        with run.report.timings.stage(SYNC):
+            self._execute(
+                partial(self._upsert_vehicle, force=force, journal=journal),
+                run.pending,
+                run.report,
+                run.progress,
+            )
+            if close_missing:
+                self._execute(
+                    partial(self._delete_vehicle, journal=journal),
+                    self._vehicles_to_close(run, journal, max_delete_ratio=max_delete_ratio),
+                    run.report,
+                    run.progress,
+                )
+
+        return self._finish(run)
+
+    def _execute(
+        self,
+        operation: Callable[[_T, PipelineReport], None],
+        items: Iterable[_T],
+        report: PipelineReport,
+        progress: ProgressTracker,
+    ) -> None:
+        """Apply *operation* to every item, fanning out over a thread pool when enabled.
+
+        Submission is bounded to twice the worker count so large feeds never queue
+        thousands of futures at once. An adaptive controller instead bounds the
+        submitted items to its current limit.
+        """
+
+        def step(item: _T) -> None:
+            operation(item, report)
+            progress.advance()
+
+        if self._max_concurrency == 1:
+            for item in items:
+                step(item)
+            return
+
+        def capacity() -> int:
+            limit = self._capacity(report)
+            return limit * 2 if report.concurrency is None else limit
 
-        if state_car_id:
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="izzy-sync"
+        ) as executor:
+            pending: Set[Future[None]] = set()
+            for item in items:
+                while len(pending) >= capacity():
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _propagate_failures(done)
+                pending.add(executor.submit(step, item))
+            done, _ = wait(pending)
+            _propagate_failures(done)
+
+    # -- helpers ---------------------------------------------------------
+    def _upsert_vehicle(
+        self,
+        vehicle: Vehicle,
+        report: PipelineReport,
+        *,
+        force: bool = False,
+        journal: Optional[RunJournal] = None,
+    ) -> None:
+        fingerprint = vehicle.payload_fingerprint()
+        planned = self._plan_upsert(vehicle, fingerprint, report, force=force, journal=journal)
+        if planned.action == SKIP:
+            return
+        retries = 0
+        if planned.action == UPDATE:
+            assert planned.car_id is not None
             try:
-                self._client.update_vehicle(state_car_id, vehicle)
-                report.updated += 1
-                report.updated_vehicles.append({"vin": vin_label, "car_id": state_car_id})
-                self._state_store.mark_active(vin_label)
-                return
+                with self._api_call(report, UPDATE, vehicle.vin):
+                    self._client.update_vehicle(planned.car_id, vehicle)
             except Exception as exc:  # pylint: disable=broad-except
-                if _is_not_found_error(exc):
-                    LOGGER.info(
-                        "Remote vehicle %s missing; attempting to recreate it", car_label
-                    )
-                    self._recreate_vehicle(vehicle, vin_label, report)
+                if not self._update_failed(exc, vehicle, planned.car_id, report):
                     return
-                LOGGER.exception("Failed to update vehicle %s", car_label)
-                report.record_error(f"update failed: {exc}", vin=vin_label, car_id=state_car_id)
+                retries = self._last_retry_count()
+            else:
+                self._record_updated(vehicle, planned.car_id, fingerprint, report, journal)
                 return
+        self._recreate_vehicle(
+            vehicle, report, fingerprint, previous_retries=retries, journal=journal
+        )
 
-        # No known car id – create fresh record.
-        self._recreate_vehicle(vehicle, vin_label, report)
-
-    def _recreate_vehicle(self, vehicle: Vehicle, vin_label: str, report: PipelineReport) -> None:
-        car_label = vehicle.configuration_number or vin_label
+    def _recreate_vehicle(
+        self,
+        vehicle: Vehicle,
+        report: PipelineReport,
+        fingerprint: str,
+        *,
+        previous_retries: int = 0,
+        journal: Optional[RunJournal] = None,
+    ) -> None:
         try:
-            created_id = self._client.create_vehicle(vehicle)
+            with self._api_call(report, CREATE, vehicle.vin):
+                created_id = self._client.create_vehicle(vehicle)
         except Exception as exc:  # pylint: disable=broad-except
-            LOGGER.exception("Failed to create vehicle %s", car_label)
-            report.record_error(f"creation failed: {exc}", vin=vin_label)
+            self._create_failed(
+                exc, vehicle, report, retries=previous_retries + self._last_retry_count()
+            )
             return
+        self._record_created(
+            vehicle,
+            created_id,
+            fingerprint,
+            report,
+            journal,
+            retries=previous_retries + self._last_retry_count(),
+        )
 
-        self._state_store.upsert(vin_label, created_id, vehicle.configuration_number)
-        report.created += 1
-        report.created_vehicles.append({"vin": vin_label, "car_id": created_id})
-        self._state_store.mark_active(vin_label)
-
-    def _close_missing_vehicles(self, desired_vins: Set[str], report: PipelineReport) -> None:
-        known_vins = set(self._state_store.known_vins())
-        for vin in known_vins - desired_vins:
-            car_id = self._state_store.get_car_id(vin)
-            if not car_id:
-                continue
-            try:
+    def _delete_vehicle(
+        self, vin: str, report: PipelineReport, *, journal: Optional[RunJournal] = None
+    ) -> None:
+        car_id = self._state_store.get_car_id(vin)
+        if not car_id:
+            return
+        try:
+            with self._api_call(report, DELETE, vin):
                 self._client.delete_vehicle(car_id)
-                self._state_store.mark_deleted(vin)
-                report.closed += 1
-                report.deleted_vehicles.append({"vin": vin, "car_id": car_id})
-            except Exception as exc:  # pylint: disable=broad-except
-                LOGGER.exception("Failed to delete vehicle with VIN %s", vin)
-                report.record_error(f"deletion failed: {exc}", vin=vin, car_id=car_id)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._delete_failed(exc, vin, car_id, report)
+            return
+        self._record_deleted(vin, car_id, report, journal)
+
+
+def _skip_duplicate_vins(
+    vehicles: Iterable[Vehicle], seen: Set[str], report: PipelineReport
+) -> Iterator[Vehicle]:
+    for vehicle in vehicles:
+        if vehicle.vin in seen:
+            report.record_error(f"Duplicate vehicle VIN detected: {vehicle.vin}", vin=vehicle.vin)
+            continue
+        seen.add(vehicle.vin)
+        yield vehicle
+
+
+def _propagate_failures(futures: Iterable[Future[None]]) -> None:
+    # Operations record their own API errors; anything escaping is a programming error.
+    for future in futures:
+        future.result()
+
+
+def _detail(vin: str, car_id: str, retries: int) -> dict:
+    detail: dict = {"vin": vin, "car_id": car_id}
+    if retries:
+        detail["retries"] = retries
+    return detail
 
 
 def _is_not_found_error(exc: Exception) -> bool:
+    status = getattr(exc, "status", None)
+    if status is not None:
+        return status == 404
     text = str(exc).lower()
     return "status 404" in text or ("404" in text and "not found" in text)
@@ -0,0 +1,147 @@
+"""Dry-run planning of a synchronisation against the local state store."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set
+
+from ..models import Vehicle, unique_vins
+from ..state import StateStore
+
+CREATE = "create"
+UPDATE = "update"
+SKIP = "skip"
+DELETE = "delete"
+
+
+@dataclass(frozen=True)
+class PlannedOperation:
+    """A single API call (or skipped vehicle) a sync run would perform."""
+
+    action: str
+    vin: str
+    car_id: Optional[str] = None
+
+    def as_dict(self) -> dict[str, object]:
+        return {"action": self.action, "vin": self.vin, "car_id": self.car_id}
+
+
+@dataclass
+class SyncPlan:
+    """Operations a synchronisation would perform, derived without network calls.
+
+    The plan assumes the remote side matches the state store: a vehicle deleted
+    remotely would be recreated during the real run (one extra request).
+    """
+
+    creates: List[PlannedOperation] = field(default_factory=list)
+    updates: List[PlannedOperation] = field(default_factory=list)
+    skips: List[PlannedOperation] = field(default_factory=list)
+    deletes: List[PlannedOperation] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def request_count(self) -> int:
+        """Number of vehicle API requests the run would send (excluding retries)."""
+
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+    def estimate_duration(
+        self,
+        *,
+        rate_limit: float = 0.0,
+        rate_burst: float = 0.0,
+        concurrency: int = 1,
+        latency: float = 0.3,
+    ) -> float:
+        """Project the run time in seconds.
+
+        The estimate is the slower of the client rate limit (``rate_limit``
+        requests per second after an initial ``rate_burst``; 0 disables it) and
+        ``concurrency`` workers each waiting ``latency`` seconds per request.
+        """
+
+        requests = self.request_count
+        by_latency = requests * latency / max(concurrency, 1)
+        by_rate = 0.0
+        if rate_limit > 0:
+            burst = rate_burst or max(rate_limit, 1.0)
+            by_rate = max(requests - burst, 0) / rate_limit
+        return max(by_latency, by_rate)
+
+    def as_dict(self, *, include_details: bool = False) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "create": len(self.creates),
+            "update": len(self.updates),
+            "skip": len(self.skips),
+            "delete": len(self.deletes),
+            "errors": len(self.errors),
+            "requests": self.request_count,
+        }
+        if include_details:
+            payload["operations"] = [
+                operation.as_dict()
+                for operation in (*self.creates, *self.updates, *self.skips, *self.deletes)
+            ]
+            payload["error_messages"] = list(self.errors)
+        return payload
+
+
+def deletion_limit_error(missing: int, fleet: int, max_ratio: float) -> Optional[str]:
+    """Return an error when closing *missing* of *fleet* vehicles exceeds *max_ratio*.
+
+    A ratio of 0 disables the check.
+    """
+
+    if max_ratio <= 0 or fleet == 0:
+        return None
+    ratio = missing / fleet
+    if ratio <= max_ratio:
+        return None
+    return (
+        f"Refusing to close {missing} of {fleet} vehicles ({ratio:.0%} exceeds the "
+        f"maximum delete ratio of {max_ratio:.0%}); check whether the feed is truncated"
+    )
+
+
+def build_sync_plan(
+    vehicles: Iterable[Vehicle],
+    state_store: StateStore,
+    *,
+    close_missing: bool = False,
+    force: bool = False,
+    max_delete_ratio: float = 0.0,
+) -> SyncPlan:
+    """Return the :class:`SyncPlan` for syncing *vehicles*; mirrors ``VehicleSynchronizer.run``."""
+
+    plan = SyncPlan()
+    try:
+        desired = unique_vins(vehicles)
+    except ValueError as exc:
+        plan.errors.append(str(exc))
+        return plan
+
+    missing: Set[str] = set()
+    if close_missing:
+        # Like the real run, an excessive deletion aborts before any operation.
+        known = set(state_store.known_vins())
+        missing = known - set(desired)
+        limit_error = deletion_limit_error(len(missing), len(known), max_delete_ratio)
+        if limit_error:
+            plan.errors.append(limit_error)
+            return plan
+
+    for vin in sorted(desired):
+        vehicle = desired[vin]
+        car_id = state_store.get_car_id(vin)
+        if not car_id:
+            plan.creates.append(PlannedOperation(CREATE, vin))
+        elif not force and state_store.get_payload_hash(vin) == vehicle.payload_fingerprint():
+            plan.skips.append(PlannedOperation(SKIP, vin, car_id))
+        else:
+            plan.updates.append(PlannedOperation(UPDATE, vin, car_id))
+
+    for vin in sorted(missing):
+        car_id = state_store.get_car_id(vin)
+        if car_id:
+            plan.deletes.append(PlannedOperation(DELETE, vin, car_id))
+    return plan
@@ -0,0 +1,134 @@
+"""Progress reporting for running synchronisations."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking only
+    from .import_pipeline import PipelineReport
+
+
+@dataclass(frozen=True)
+class SyncProgress:
+    """Snapshot of a running synchronisation passed to progress callbacks."""
+
+    processed: int
+    total: Optional[int]
+    created: int
+    updated: int
+    unchanged: int
+    closed: int
+    errors: int
+    elapsed: float
+    throughput: float
+    eta: Optional[float]
+    finished: bool = False
+
+    def as_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+    def format_line(self) -> str:
+        """Human readable one-line summary used by the CLI."""
+
+        if self.total:
+            position = f"{self.processed}/{self.total} ({self.processed * 100 // self.total}%)"
+        else:
+            position = str(self.processed)
+        parts = [
+            f"processed {position}",
+            f"created {self.created}",
+            f"updated {self.updated}",
+            f"unchanged {self.unchanged}",
+            f"closed {self.closed}",
+            f"errors {self.errors}",
+            f"{self.throughput:.1f}/s",
+        ]
+        if self.eta is not None and not self.finished:
+            parts.append(f"ETA {_format_duration(self.eta)}")
+        return " | ".join(parts)
+
+
+ProgressCallback = Callable[[SyncProgress], None]
+
+
+class ProgressTracker:
+    """Counts finished operations and emits throttled :class:`SyncProgress` snapshots."""
+
+    def __init__(
+        self,
+        callback: Optional[ProgressCallback],
+        report: "PipelineReport",
+        *,
+        total: Optional[int] = None,
+        interval: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._callback = callback
+        self._report = report
+        self._total = total
+        self._interval = interval
+        self._clock = clock
+        self._started = clock()
+        self._last_emit = float("-inf")
+        self._processed = 0
+        self._lock = threading.Lock()
+
+    def add_total(self, count: int) -> None:
+        """Extend the expected operation count (e.g. once deletions are known)."""
+
+        with self._lock:
+            if self._total is not None:
+                self._total += count
+
+    def advance(self) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            self._processed += 1
+            now = self._clock()
+            if now - self._last_emit < self._interval:
+                return
+            self._last_emit = now
+            snapshot = self._snapshot(now, finished=False)
+        self._callback(snapshot)
+
+    def finish(self) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            snapshot = self._snapshot(self._clock(), finished=True)
+        self._callback(snapshot)
+
+    # -- internals --------------------------------------------------
+    def _snapshot(self, now: float, *, finished: bool) -> SyncProgress:
+        elapsed = max(now - self._started, 0.0)
+        throughput = self._processed / elapsed if elapsed > 0 else 0.0
+        eta: Optional[float] = None
+        if self._total is not None and throughput > 0:
+            eta = max(self._total - self._processed, 0) / throughput
+        report = self._report
+        return SyncProgress(
+            processed=self._processed,
+            total=self._total,
+            created=report.created,
+            updated=report.updated,
+            unchanged=report.unchanged,
+            closed=report.closed,
+            errors=len(report.errors),
+            elapsed=elapsed,
+            throughput=throughput,
+            eta=eta,
+            finished=finished,
+        )
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
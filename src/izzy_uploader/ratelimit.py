@@ -0,0 +1,98 @@
+"""Client-side rate limiting for calls to the Izzylease API."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker issuing API calls.
+
+    ``rate`` is the sustained number of requests per second and ``burst`` the
+    number of requests that may be sent back to back after an idle period.
+    When the server throttles (:meth:`on_throttled`) the rate is halved, at most
+    once per ``cooldown`` seconds; each success (:meth:`on_success`) adds back a
+    small step so the configured rate is regained gradually, roughly
+    ``recovery_step`` requests/second per second.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        *,
+        min_rate: Optional[float] = None,
+        recovery_step: Optional[float] = None,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._max_rate = float(rate)
+        self._rate = float(rate)
+        self._burst = max(1.0, float(burst) if burst else float(rate))
+        self._min_rate = min_rate if min_rate is not None else max(self._max_rate * 0.05, 0.1)
+        self._recovery_step = (
+            recovery_step if recovery_step is not None else max(self._max_rate * 0.05, 0.05)
+        )
+        self._cooldown = cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self._burst
+        self._updated = clock()
+        self._last_throttle = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current (possibly reduced) sustained rate in requests per second."""
+
+        return self._rate
+
+    def acquire(self) -> None:
+        """Block until the caller may send one request."""
+
+        delay = self.reserve()
+        if delay > 0:
+            self._sleep(delay)
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it.
+
+        Reservations may drive the bucket negative, which queues callers in
+        arrival order without holding the lock while they wait.
+        """
+
+        with self._lock:
+            self._refill()
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._rate < self._max_rate:
+                self._refill()
+                self._rate = min(
+                    self._max_rate, self._rate + self._recovery_step / self._rate
+                )
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if now - self._last_throttle < self._cooldown:
+                return
+            self._refill()
+            self._last_throttle = now
+            self._rate = max(self._min_rate, self._rate / 2.0)
+
+    # -- internals --------------------------------------------------
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
@@ -0,0 +1,59 @@
+"""Retry policy for transient Izzylease API failures."""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Optional
+
+DEFAULT_RETRY_STATUSES: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    ``max_attempts`` counts the initial request, so ``1`` disables retries.
+    A ``Retry-After`` hint from the server replaces the computed delay but is
+    still bounded by ``max_delay``.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def backoff(
+        self,
+        attempt: int,
+        retry_after: Optional[float] = None,
+        *,
+        rng: Callable[[], float] = random.random,
+    ) -> float:
+        """Return the delay in seconds before the attempt following *attempt* (1-based)."""
+
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling * rng()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given either in seconds or as an HTTP date."""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - time.time())
@@ -3,12 +3,17 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import dataclass
+import sqlite3
+import threading
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Protocol
 
 LOGGER = logging.getLogger(__name__)
 
+SQLITE_SUFFIXES = {".sqlite", ".sqlite3", ".db"}
+STATE_BACKENDS = ("json", "sqlite")
+
 
 @dataclass
 class VehicleStateEntry:
@@ -16,59 +21,136 @@ class VehicleStateEntry:
     car_id: str
     configuration_number: Optional[str] = None
     active: bool = True
+    payload_hash: Optional[str] = None
+
+
+class StateStore(Protocol):
+    """Interface shared by the state store backends used by the pipeline."""
+
+    def get_car_id(self, vin: str) -> Optional[str]: ...
+
+    def get_payload_hash(self, vin: str) -> Optional[str]: ...
+
+    def upsert(
+        self,
+        vin: str,
+        car_id: str,
+        configuration_number: Optional[str],
+        payload_hash: Optional[str] = None,
+    ) -> None: ...
+
+    def set_payload_hash(self, vin: str, payload_hash: Optional[str]) -> None: ...
+
+    def mark_deleted(self, vin: str) -> None: ...
+
+    def mark_active(self, vin: str) -> None: ...
+
+    def known_vins(self) -> Iterable[str]: ...
+
+    def save(self) -> None: ...
+
+    def close(self) -> None: ...
 
 
 class VehicleStateStore:
-    """Stores mapping between VINs and remote car identifiers."""
+    """Stores mapping between VINs and remote car identifiers.
+
+    All methods are safe to call from concurrent pipeline workers.
+    """
 
     def __init__(self, path: Path):
         self._path = path
         self._entries: Dict[str, VehicleStateEntry] = {}
+        self._lock = threading.RLock()
         self._load()
 
     # -- public API -------------------------------------------------
     def get_car_id(self, vin: str) -> Optional[str]:
-        entry = self._entries.get(vin)
-        return entry.car_id if entry else None
-
-    def upsert(self, vin: str, car_id: str, configuration_number: Optional[str]) -> None:
-        entry = self._entries.get(vin)
-        if entry:
-            entry.car_id = car_id
-            entry.configuration_number = configuration_number
-            entry.active = True
-        else:
-            self._entries[vin] = VehicleStateEntry(
-                vin=vin,
-                car_id=car_id,
-                configuration_number=configuration_number,
-                active=True,
-            )
+        with self._lock:
+            entry = self._entries.get(vin)
+            return entry.car_id if entry else None
+
+    def get_payload_hash(self, vin: str) -> Optional[str]:
+        """Return the fingerprint of the last payload sent for an active vehicle."""
+
+        with self._lock:
+            entry = self._entries.get(vin)
+            return entry.payload_hash if entry and entry.active else None
+
+    def upsert(
+        self,
+        vin: str,
+        car_id: str,
+        configuration_number: Optional[str],
+        payload_hash: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            entry = self._entries.get(vin)
+            if entry:
+                entry.car_id = car_id
+                entry.configuration_number = configuration_number
+                entry.active = True
+                entry.payload_hash = payload_hash
+            else:
+                self._entries[vin] = VehicleStateEntry(
+                    vin=vin,
+                    car_id=car_id,
+                    configuration_number=configuration_number,
+                    active=True,
+                    payload_hash=payload_hash,
+                )
+
+    def set_payload_hash(self, vin: str, payload_hash: Optional[str]) -> None:
+        with self._lock:
+            entry = self._entries.get(vin)
+            if entry:
+                entry.payload_hash = payload_hash
 
     def mark_deleted(self, vin: str) -> None:
-        entry = self._entries.get(vin)
-        if entry:
-            entry.active = False
+        with self._lock:
+            entry = self._entries.get(vin)
+            if entry:
+                entry.active = False
 
     def mark_active(self, vin: str) -> None:
-        entry = self._entries.get(vin)
-        if entry:
-            entry.active = True
+        with self._lock:
+            entry = self._entries.get(vin)
+            if entry:
+                entry.active = True
 
     def known_vins(self) -> Iterable[str]:
-        return (vin for vin, entry in self._entries.items() if entry.active)
+        with self._lock:
+            return [vin for vin, entry in self._entries.items() if entry.active]
+
+    def vin_for_configuration_number(self, configuration_number: str) -> Optional[str]:
+        with self._lock:
+            for vin, entry in self._entries.items():
+                if entry.configuration_number == configuration_number:
+                    return vin
+            return None
+
+    def entries(self) -> List[VehicleStateEntry]:
+        """Return a snapshot of all stored entries, including inactive ones."""
+
+        with self._lock:
+            return [replace(entry) for entry in self._entries.values()]
+
+    def close(self) -> None:
+        """Release resources; the JSON store only persists through :meth:`save`."""
 
     def save(self) -> None:
-        payload = {
-            "vehicles": {
-                vin: {
-                    "car_id": entry.car_id,
-                    "configuration_number": entry.configuration_number,
-                    "active": entry.active,
+        with self._lock:
+            payload = {
+                "vehicles": {
+                    vin: {
+                        "car_id": entry.car_id,
+                        "configuration_number": entry.configuration_number,
+                        "active": entry.active,
+                        "payload_hash": entry.payload_hash,
+                    }
+                    for vin, entry in self._entries.items()
                 }
-                for vin, entry in self._entries.items()
             }
-        }
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
@@ -93,12 +175,184 @@ class VehicleStateStore:
                         configuration_number = None
                     active_raw = payload.get("active")
                     active = active_raw if isinstance(active_raw, bool) else True
+                    payload_hash = payload.get("payload_hash")
+                    if not isinstance(payload_hash, str):
+                        payload_hash = None
                     self._entries[vin] = VehicleStateEntry(
                         vin=vin,
                         car_id=car_id,
                         configuration_number=configuration_number,
                         active=active,
+                        payload_hash=payload_hash,
                     )
         except Exception as exc:  # pylint: disable=broad-except
             LOGGER.warning("Ignoring invalid state file %s: %s", self._path, exc)
             self._entries = {}
+
+
+class SqliteVehicleStateStore:
+    """SQLite-backed state store that commits every change as it happens.
+
+    Unlike :class:`VehicleStateStore` nothing is lost when a run is interrupted,
+    and writes cost a single row regardless of the fleet size.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vehicles (
+                    vin TEXT PRIMARY KEY,
+                    car_id TEXT NOT NULL,
+                    configuration_number TEXT,
+                    active INTEGER NOT NULL DEFAULT 1,
+                    payload_hash TEXT
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vehicles_configuration_number "
+                "ON vehicles (configuration_number)"
+            )
+
+    # -- public API -------------------------------------------------
+    def get_car_id(self, vin: str) -> Optional[str]:
+        row = self._fetchone("SELECT car_id FROM vehicles WHERE vin = ?", (vin,))
+        return row[0] if row else None
+
+    def get_payload_hash(self, vin: str) -> Optional[str]:
+        row = self._fetchone(
+            "SELECT payload_hash FROM vehicles WHERE vin = ? AND active = 1", (vin,)
+        )
+        return row[0] if row else None
+
+    def upsert(
+        self,
+        vin: str,
+        car_id: str,
+        configuration_number: Optional[str],
+        payload_hash: Optional[str] = None,
+    ) -> None:
+        self._execute(
+            """
+            INSERT INTO vehicles (vin, car_id, configuration_number, active, payload_hash)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (vin) DO UPDATE SET
+                car_id = excluded.car_id,
+                configuration_number = excluded.configuration_number,
+                active = 1,
+                payload_hash = excluded.payload_hash
+            """,
+            (vin, car_id, configuration_number, payload_hash),
+        )
+
+    def set_payload_hash(self, vin: str, payload_hash: Optional[str]) -> None:
+        self._execute("UPDATE vehicles SET payload_hash = ? WHERE vin = ?", (payload_hash, vin))
+
+    def mark_deleted(self, vin: str) -> None:
+        self._execute("UPDATE vehicles SET active = 0 WHERE vin = ?", (vin,))
+
+    def mark_active(self, vin: str) -> None:
+        self._execute("UPDATE vehicles SET active = 1 WHERE vin = ?", (vin,))
+
+    def known_vins(self) -> Iterable[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT vin FROM vehicles WHERE active = 1").fetchall()
+        return [row[0] for row in rows]
+
+    def vin_for_configuration_number(self, configuration_number: str) -> Optional[str]:
+        row = self._fetchone(
+            "SELECT vin FROM vehicles WHERE configuration_number = ? LIMIT 1",
+            (configuration_number,),
+        )
+        return row[0] if row else None
+
+    def entries(self) -> List[VehicleStateEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT vin, car_id, configuration_number, active, payload_hash FROM vehicles"
+            ).fetchall()
+        return [
+            VehicleStateEntry(
+                vin=vin,
+                car_id=car_id,
+                configuration_number=configuration_number,
+                active=bool(active),
+                payload_hash=payload_hash,
+            )
+            for vin, car_id, configuration_number, active, payload_hash in rows
+        ]
+
+    def import_entries(self, entries: Iterable[VehicleStateEntry]) -> int:
+        """Insert or replace *entries* in a single transaction, returning the count."""
+
+        rows = [
+            (
+                entry.vin,
+                entry.car_id,
+                entry.configuration_number,
+                int(entry.active),
+                entry.payload_hash,
+            )
+            for entry in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vehicles "
+                "(vin, car_id, configuration_number, active, payload_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def save(self) -> None:
+        """No-op kept for interface parity; every change is already committed."""
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- internals --------------------------------------------------
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def _fetchone(self, sql: str, params: tuple) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+
+def resolve_state_backend(path: Path, backend: Optional[str] = None) -> str:
+    """Return the backend name for *path*, inferring SQLite from the file suffix."""
+
+    if backend:
+        if backend not in STATE_BACKENDS:
+            raise ValueError(f"Unknown state backend: {backend}")
+        return backend
+    return "sqlite" if path.suffix.lower() in SQLITE_SUFFIXES else "json"
+
+
+def open_state_store(path: Path, backend: Optional[str] = None) -> StateStore:
+    """Open the state store configured for *path*."""
+
+    if resolve_state_backend(path, backend) == "sqlite":
+        return SqliteVehicleStateStore(path)
+    return VehicleStateStore(path)
+
+
+def migrate_json_state(source: Path, target: Path) -> int:
+    """Copy every entry from the JSON state file *source* into SQLite *target*."""
+
+    if not source.exists():
+        raise FileNotFoundError(f"State file not found: {source}")
+    entries = VehicleStateStore(source).entries()
+    store = SqliteVehicleStateStore(target)
+    try:
+        return store.import_entries(entries)
+    finally:
+        store.close()
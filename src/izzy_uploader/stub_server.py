@@ -0,0 +1,456 @@
+"""Local stand-in for the Izzylease API used for load and integration testing.
+
+The stub implements the OAuth client-credentials endpoint and the
+``/external/cars`` CRUD routes used by :class:`~izzy_uploader.client.IzzyleaseClient`
+on top of :mod:`http.server`. Latency, injected failures (429, 5xx and
+timeouts) and per-route request accounting are configurable, so the real HTTP
+path can be exercised and benchmarked without network access::
+
+    with StubApiServer(latency=LatencyModel.parse("lognormal:0.05,0.5")) as stub:
+        config = stub.service_config(state_file)
+        ...
+        print(stub.stats.snapshot())
+
+Run ``izzy-uploader stub-server`` to start it from the command line.
+"""
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from .config import ServiceConfig
+
+CARS_PREFIX = "/external/cars"
+TOKEN_PATH = "/oauth/token"
+STATS_PATH = "/__stats"
+RESET_PATH = "/__reset"
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Distribution of the artificial delay added to every API response (seconds).
+
+    ``fixed`` waits ``a``; ``uniform`` draws from ``[a, b]``; ``normal`` uses
+    mean ``a`` and deviation ``b``; ``lognormal`` uses median ``a`` and shape
+    ``b``, giving the long tail typical of real APIs.
+    """
+
+    distribution: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """Parse ``"0.05"``, ``"uniform:0.01,0.2"``, ``"normal:0.05,0.01"`` or
+        ``"lognormal:0.05,0.5"``."""
+
+        distribution, _, params = spec.partition(":")
+        if not params:
+            return cls("fixed", float(distribution))
+        values = [float(value) for value in params.split(",")]
+        if distribution not in ("fixed", "uniform", "normal", "lognormal") or len(values) > 2:
+            raise ValueError(f"Invalid latency specification: {spec}")
+        return cls(distribution, values[0], values[1] if len(values) > 1 else 0.0)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.distribution == "lognormal":
+            value = rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(value, 0.0)
+
+
+@dataclass(frozen=True)
+class FaultInjection:
+    """Probabilities of failing a cars request instead of serving it.
+
+    ``timeout_rate`` holds the connection for ``timeout_delay`` seconds and then
+    drops it without a response, which a client with a shorter timeout sees as
+    a read timeout.
+    """
+
+    throttle_rate: float = 0.0
+    server_error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    retry_after: Optional[float] = 1.0
+    timeout_delay: float = 30.0
+
+
+class StubStats:
+    """Thread-safe request accounting of a :class:`StubApiServer`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: Counter[str] = Counter()
+            self.statuses: Counter[int] = Counter()
+            self.injected: Counter[str] = Counter()
+            self.tokens_issued = 0
+            self.connections = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.latency_total = 0.0
+
+    def begin(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def end(self, status: Optional[int], latency: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.latency_total += latency
+            if status is not None:
+                self.statuses[status] += 1
+
+    def inject(self, fault: str) -> None:
+        with self._lock:
+            self.injected[fault] += 1
+
+    def token_issued(self) -> None:
+        with self._lock:
+            self.tokens_issued += 1
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "total_requests": sum(self.requests.values()),
+                "statuses": {str(status): count for status, count in self.statuses.items()},
+                "injected_faults": dict(self.injected),
+                "tokens_issued": self.tokens_issued,
+                "connections": self.connections,
+                "max_in_flight": self.max_in_flight,
+                "injected_latency_seconds": round(self.latency_total, 6),
+            }
+
+
+class StubApiServer:
+    """Threaded HTTP/1.1 server emulating the Izzylease dealer API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: LatencyModel = LatencyModel(),
+        faults: FaultInjection = FaultInjection(),
+        client_id: str = "stub-client",
+        client_secret: str = "stub-secret",
+        token_ttl: float = 3600.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.faults = faults
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_ttl = token_ttl
+        self.stats = StubStats()
+        self.cars: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, float] = {}
+        self._scripted: Deque[Tuple[int, Dict[str, str]]] = deque()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd = _StubHTTPServer((host, port), _handler_for(self))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def service_config(self, state_file: Path, **overrides: Any) -> ServiceConfig:
+        """Return a :class:`ServiceConfig` pointing at this stub."""
+
+        values: Dict[str, Any] = {
+            "api_base_url": self.url,
+            "token_url": f"{self.url}{TOKEN_PATH}",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "dealer_id": None,
+            "state_file": state_file,
+        }
+        values.update(overrides)
+        return ServiceConfig(**values)
+
+    def start(self) -> "StubApiServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="izzy-stub-api", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self) -> None:
+        """Forget stored cars, issued tokens and statistics."""
+
+        with self._lock:
+            self.cars.clear()
+            self._tokens.clear()
+            self._scripted.clear()
+        self.stats.reset()
+
+    def fail_next(
+        self, status: int, *, count: int = 1, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Answer the next *count* cars requests with *status* (and *headers*)."""
+
+        with self._lock:
+            self._scripted.extend([(status, dict(headers or {}))] * count)
+
+    def grant_token(self) -> str:
+        """Issue an access token directly, for clients given a fixed token."""
+
+        _, payload = self.issue_token(
+            {
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            }
+        )
+        return payload["access_token"]
+
+    def revoke_tokens(self) -> None:
+        """Invalidate every issued token, as a credential rotation would."""
+
+        with self._lock:
+            self._tokens.clear()
+
+    def __enter__(self) -> "StubApiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    # -- request handling (called from handler threads) ---------------
+    def issue_token(self, form: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        if form.get("grant_type") != "client_credentials":
+            return 400, {"error": "unsupported_grant_type"}
+        credentials = (form.get("client_id"), form.get("client_secret"))
+        if credentials != (self.client_id, self.client_secret):
+            return 401, {"error": "invalid_client"}
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.monotonic() + self.token_ttl
+        self.stats.token_issued()
+        return 200, {"access_token": token, "token_type": "Bearer", "expires_in": self.token_ttl}
+
+    def is_authorised(self, header: Optional[str]) -> bool:
+        if not header or not header.startswith("Bearer "):
+            return False
+        with self._lock:
+            expires_at = self._tokens.get(header[len("Bearer "):])
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def next_scripted_failure(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        with self._lock:
+            return self._scripted.popleft() if self._scripted else None
+
+    def draw_fault(self) -> Optional[str]:
+        faults = self.faults
+        with self._lock:
+            roll = self._rng.random()
+        for name, rate in (
+            ("throttle", faults.throttle_rate),
+            ("server_error", faults.server_error_rate),
+            ("timeout", faults.timeout_rate),
+        ):
+            if roll < rate:
+                return name
+            roll -= rate
+        return None
+
+    def draw_latency(self) -> float:
+        with self._lock:
+            return self.latency.sample(self._rng)
+
+    def handle_cars(
+        self, method: str, car_id: Optional[str], payload: Any
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        with self._lock:
+            if car_id is None:
+                if method != "POST":
+                    return 405, {"message": "Method Not Allowed"}
+                if not isinstance(payload, dict) or not payload.get("vin"):
+                    return 400, {"message": "vin is required"}
+                new_id = str(uuid.uuid4())
+                self.cars[new_id] = payload
+                return 201, {"id": new_id}
+            if car_id not in self.cars:
+                return 404, {"message": "Not Found"}
+            if method == "GET":
+                return 200, self.cars[car_id]
+            if method == "PUT":
+                if not isinstance(payload, dict):
+                    return 400, {"message": "Invalid payload"}
+                self.cars[car_id] = payload
+                return 204, None
+            if method == "DELETE":
+                del self.cars[car_id]
+                return 204, None
+        return 405, {"message": "Method Not Allowed"}
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 resets connections as soon as a
+    # benchmark opens more than a handful of them at once.
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def _handler_for(stub: StubApiServer) -> type:
+    class Handler(_StubHandler):
+        server_stub = stub
+
+    return Handler
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response waits for the client's delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+    server_stub: StubApiServer
+
+    def setup(self) -> None:
+        super().setup()
+        self.server_stub.stats.connection_opened()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:  # noqa: N802 - http.server naming
+        self._dispatch("DELETE")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+    def _dispatch(self, method: str) -> None:
+        stub = self.server_stub
+        path = self.path.split("?", 1)[0].rstrip("/")
+        body = self._read_body()
+
+        if path == STATS_PATH:
+            self._reply(200, stub.stats.snapshot())
+            return
+        if path == RESET_PATH and method == "POST":
+            stub.reset()
+            self._reply(204, None)
+            return
+
+        if path == TOKEN_PATH and method == "POST":
+            form = {key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()}
+            self._serve("POST /oauth/token", lambda: stub.issue_token(form), inject=False)
+            return
+
+        if path == CARS_PREFIX or path.startswith(CARS_PREFIX + "/"):
+            car_id = path[len(CARS_PREFIX) + 1:] or None
+            route = f"{method} {CARS_PREFIX}" + ("/{id}" if car_id else "")
+
+            def handle() -> Tuple[int, Optional[Dict[str, Any]]]:
+                if not stub.is_authorised(self.headers.get("Authorization")):
+                    return 401, {"message": "Unauthorized"}
+                try:
+                    payload = json.loads(body) if body else None
+                except ValueError:
+                    return 400, {"message": "Malformed JSON"}
+                return stub.handle_cars(method, car_id, payload)
+
+            self._serve(route, handle, inject=True)
+            return
+
+        self._reply(404, {"message": "Not Found"})
+
+    def _serve(self, route: str, handle: Any, *, inject: bool) -> None:
+        stub = self.server_stub
+        stub.stats.begin(route)
+        latency = stub.draw_latency()
+        status: Optional[int] = None
+        try:
+            time.sleep(latency)
+            scripted = stub.next_scripted_failure() if inject else None
+            if scripted is not None:
+                stub.stats.inject("scripted")
+                status, headers = scripted
+                self._reply(status, {"message": "Injected failure"}, headers)
+                return
+            fault = stub.draw_fault() if inject else None
+            if fault is not None:
+                stub.stats.inject(fault)
+            if fault == "timeout":
+                time.sleep(stub.faults.timeout_delay)
+                self.close_connection = True
+                return
+            if fault == "throttle":
+                status = 429
+                headers = {}
+                if stub.faults.retry_after is not None:
+                    headers["Retry-After"] = f"{stub.faults.retry_after:g}"
+                self._reply(status, {"message": "Too Many Requests"}, headers)
+                return
+            if fault == "server_error":
+                status = 503
+                self._reply(status, {"message": "Service Unavailable"})
+                return
+            status, payload = handle()
+            self._reply(status, payload)
+        finally:
+            stub.stats.end(status, latency)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _reply(
+        self,
+        status: int,
+        payload: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
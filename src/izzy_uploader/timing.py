@@ -0,0 +1,128 @@
+"""Stage timings and API latency statistics collected during a synchronisation."""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .circuit import CircuitOpenError
+
+CSV_PARSE = "csv_parse"
+NORMALISATION = "normalisation"
+STATE_LOAD = "state_load"
+SYNC = "sync"
+STATE_SAVE = "state_save"
+
+# How many of the slowest API calls are listed in the report.
+SLOWEST_CALLS = 10
+
+
+class RunTimings:
+    """Accumulates where the wall time of one run went.
+
+    Stages are summed, so a stage interleaved with others (CSV parsing while
+    streaming) reports the time actually spent in it. API latencies are kept
+    per operation (``create``, ``update``, ``delete``) and measured per client
+    call, including the client's own retries. All methods are thread-safe.
+    """
+
+    def __init__(
+        self, *, clock: Callable[[], float] = time.perf_counter, slowest: int = SLOWEST_CALLS
+    ):
+        self._clock = clock
+        self._slowest_limit = slowest
+        self._started = clock()
+        self._finished: Optional[float] = None
+        self._stages: Dict[str, float] = {}
+        self._latencies: Dict[str, List[float]] = {}
+        self._slowest: List[Tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[name] = self._stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.add_stage(name, self._clock() - started)
+
+    def record_latency(self, operation: str, vin: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(operation, []).append(seconds)
+            entry = (seconds, operation, vin)
+            if len(self._slowest) < self._slowest_limit:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    @contextmanager
+    def api_call(self, operation: str, vin: str) -> Iterator[None]:
+        """Time one client call; failed calls are recorded as well.
+
+        Calls rejected by an open circuit breaker never reached the API and
+        are left out.
+        """
+
+        started = self._clock()
+        try:
+            yield
+        except CircuitOpenError:
+            raise
+        except BaseException:
+            self.record_latency(operation, vin, self._clock() - started)
+            raise
+        self.record_latency(operation, vin, self._clock() - started)
+
+    def finish(self) -> None:
+        with self._lock:
+            self._finished = self._clock()
+
+    @property
+    def total(self) -> float:
+        end = self._finished if self._finished is not None else self._clock()
+        return end - self._started
+
+    def as_dict(self) -> dict[str, object]:
+        with self._lock:
+            stages = {name: round(seconds, 6) for name, seconds in self._stages.items()}
+            latencies = {
+                operation: _latency_summary(sorted(values))
+                for operation, values in sorted(self._latencies.items())
+            }
+            slowest = [
+                {"vin": vin, "operation": operation, "seconds": round(seconds, 6)}
+                for seconds, operation, vin in sorted(self._slowest, reverse=True)
+            ]
+        return {
+            "total_seconds": round(self.total, 6),
+            "stages": stages,
+            "api_latency": latencies,
+            "slowest_calls": slowest,
+        }
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of the already sorted *ordered* values."""
+
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _latency_summary(ordered: List[float]) -> dict[str, object]:
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 6),
+        "p50": round(percentile(ordered, 0.50), 6),
+        "p95": round(percentile(ordered, 0.95), 6),
+        "p99": round(percentile(ordered, 0.99), 6),
+        "max": round(ordered[-1], 6),
+    }
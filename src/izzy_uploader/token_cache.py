@@ -0,0 +1,127 @@
+"""File-based OAuth token cache shared by every process of one installation."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:  # pragma: no cover - optional dependency (unavailable on Windows)
+    import fcntl
+except ImportError:  # pragma: no cover - optional dependency
+    fcntl = None
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TokenCacheError(RuntimeError):
+    """Raised when the token cache file cannot be opened or locked."""
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """Access token with its issue and expiry time (Unix timestamps)."""
+
+    access_token: str
+    issued_at: float
+    expires_at: float
+
+
+class TokenCacheSession:
+    """Cache content read while the file lock is held."""
+
+    def __init__(self, entries: Dict[str, Any]):
+        self._entries = entries
+        self.dirty = False
+
+    def get(self, key: str) -> Optional[CachedToken]:
+        entry = self._entries.get(key)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            return CachedToken(
+                access_token=str(entry["access_token"]),
+                issued_at=float(entry["issued_at"]),
+                expires_at=float(entry["expires_at"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def put(self, key: str, token: CachedToken) -> None:
+        self._entries[key] = {
+            "access_token": token.access_token,
+            "issued_at": token.issued_at,
+            "expires_at": token.expires_at,
+        }
+        self.dirty = True
+
+    def discard(self, key: str, access_token: str) -> None:
+        """Remove the entry of *key* if it still holds *access_token*."""
+
+        cached = self.get(key)
+        if cached is not None and cached.access_token == access_token:
+            del self._entries[key]
+            self.dirty = True
+
+    def to_json(self) -> str:
+        return json.dumps(self._entries, indent=2)
+
+
+class TokenCache:
+    """JSON file of access tokens keyed by token endpoint and client id.
+
+    Every access holds an exclusive ``flock`` on the file, so a process that
+    fetches a new token while holding it makes the others wait and then reuse
+    that token. The file is created with mode 0600 as it holds credentials.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @staticmethod
+    def key(token_url: str, client_id: str) -> str:
+        return hashlib.sha256(f"{token_url}\0{client_id}".encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def session(self) -> Iterator[TokenCacheSession]:
+        """Lock the cache file and yield its content; changes are written on exit."""
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as exc:
+            raise TokenCacheError(f"Cannot open token cache {self.path}: {exc}") from exc
+        with os.fdopen(fd, "r+", encoding="utf-8") as handle:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                raw = handle.read()
+            except OSError as exc:
+                raise TokenCacheError(f"Cannot read token cache {self.path}: {exc}") from exc
+            session = TokenCacheSession(_parse(raw, self.path))
+            yield session
+            if session.dirty:
+                try:
+                    handle.seek(0)
+                    handle.truncate()
+                    handle.write(session.to_json())
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                except OSError as exc:
+                    # The token in hand is still valid; only sharing it failed.
+                    LOGGER.warning("Cannot write token cache %s: %s", self.path, exc)
+
+
+def _parse(raw: str, path: Path) -> Dict[str, Any]:
+    if not raw.strip():
+        return {}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        LOGGER.warning("Ignoring corrupt token cache %s", path)
+        return {}
+    return data if isinstance(data, dict) else {}
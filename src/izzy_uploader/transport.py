@@ -0,0 +1,227 @@
+"""Pooled keep-alive HTTP transport used by the Izzylease client."""
+from __future__ import annotations
+
+import http.client
+import logging
+import select
+import ssl
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+LOGGER = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, int]
+
+# Methods that may be sent again when it is unknown whether the server saw them.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+# Errors raised when the server silently dropped an idle keep-alive connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class TransportError(RuntimeError):
+    """Raised when a request cannot be delivered to the remote host.
+
+    ``connect_failed`` is set when the connection could not be established, i.e.
+    the request certainly never reached the server.
+    """
+
+    def __init__(self, message: str, *, connect_failed: bool = False):
+        super().__init__(message)
+        self.connect_failed = connect_failed
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    """Fully read HTTP response returned by :class:`ConnectionPool`."""
+
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: bytes
+
+    def header(self, name: str) -> Optional[str]:
+        return self.headers.get(name.lower())
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent HTTP(S) connections grouped per host.
+
+    Connections are checked out for the duration of a single request and
+    returned afterwards, so any number of worker threads can share one pool.
+    ``max_size`` bounds the idle connections kept per host; connections idle
+    for longer than ``idle_timeout`` seconds, or already closed by the server,
+    are closed instead of reused.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 10,
+        idle_timeout: float = 4.0,
+        timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._ssl_context = ssl_context
+        self._idle: Dict[PoolKey, Deque[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> HttpResponse:
+        """Send a request over a pooled connection and return the read response.
+
+        When a reused connection turns out to have been closed by the server,
+        the request is sent once more over a fresh connection if it failed
+        before it was fully sent, or if it is idempotent. A request that
+        reached the server may already have been applied, so for other
+        methods the failure is raised.
+        """
+
+        key, target = split_url(url)
+        connection, reused = self._acquire(key)
+        sent = False
+        try:
+            connection.request(method, target, body=body, headers=dict(headers or {}))
+            sent = True
+            response, will_close = _read_response(connection)
+        except (OSError, http.client.HTTPException) as exc:
+            if not reused or not _may_resend(method, exc, sent):
+                raise _transport_error(connection, exc) from exc
+            connection.close()
+            LOGGER.debug("Pooled connection to %s was closed by the server; reconnecting", key[1])
+            connection = self._connect(key)
+            try:
+                connection.request(method, target, body=body, headers=dict(headers or {}))
+                response, will_close = _read_response(connection)
+            except (OSError, http.client.HTTPException) as retry_exc:
+                raise _transport_error(connection, retry_exc) from retry_exc
+
+        if will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+        return response
+
+    def close(self) -> None:
+        """Close every idle connection held by the pool."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+    # -- internals --------------------------------------------------
+    def _acquire(self, key: PoolKey) -> Tuple[http.client.HTTPConnection, bool]:
+        expired = []
+        reusable: Optional[http.client.HTTPConnection] = None
+        now = time.monotonic()
+        with self._lock:
+            connections = self._idle.get(key)
+            while connections:
+                connection, released_at = connections.pop()
+                if now - released_at <= self._idle_timeout and not _is_dropped(connection):
+                    reusable = connection
+                    break
+                expired.append(connection)
+        for connection in expired:
+            connection.close()
+        if reusable is not None:
+            return reusable, True
+        return self._connect(key), False
+
+    def _release(self, key: PoolKey, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            connections = self._idle.setdefault(key, deque())
+            if len(connections) < self._max_size:
+                connections.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def _connect(self, key: PoolKey) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        connection: http.client.HTTPConnection
+        if scheme == "https":
+            connection = http.client.HTTPSConnection(
+                host, port, timeout=self._timeout, context=self._ssl_context
+            )
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=self._timeout)
+        # Connect eagerly so failures here are known not to have sent anything.
+        try:
+            connection.connect()
+        except (OSError, http.client.HTTPException) as exc:
+            connection.close()
+            raise TransportError(str(exc) or exc.__class__.__name__, connect_failed=True) from exc
+        return connection
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    """Whether the server closed an idle connection (it is readable before any request)."""
+
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _may_resend(method: str, exc: BaseException, sent: bool) -> bool:
+    """Whether a request that failed on a reused connection can go out once more."""
+
+    if not sent:
+        return True  # the server never received the whole request
+    return isinstance(exc, _STALE_CONNECTION_ERRORS) and method.upper() in IDEMPOTENT_METHODS
+
+
+def _read_response(connection: http.client.HTTPConnection) -> Tuple[HttpResponse, bool]:
+    raw = connection.getresponse()
+    data = raw.read()
+    response = HttpResponse(
+        status=raw.status,
+        reason=raw.reason,
+        headers={name.lower(): value for name, value in raw.getheaders()},
+        body=data,
+    )
+    return response, raw.will_close
+
+
+def _transport_error(
+    connection: http.client.HTTPConnection, exc: BaseException
+) -> TransportError:
+    connection.close()
+    return TransportError(str(exc) or exc.__class__.__name__)
+
+
+def split_url(url: str) -> Tuple[PoolKey, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in {"http", "https"} or not parts.hostname:
+        raise TransportError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    return (scheme, parts.hostname, port), target
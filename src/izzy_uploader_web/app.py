@@ -1,21 +1,24 @@
 """Minimal Flask UI for the Izzy Uploader."""
 from __future__ import annotations
 
+import io
 import json
 import os
-import tempfile
+import time
 import uuid
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from flask import (
     Blueprint,
     Flask,
+    Response,
     flash,
     redirect,
     render_template,
     request,
     send_file,
+    stream_with_context,
     url_for,
 )
 
@@ -28,12 +31,34 @@ from izzy_uploader.normalizers import (
     save_location_map,
 )
 from izzy_uploader.pipelines.import_pipeline import VehicleSynchronizer
-from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.pipelines.progress import ProgressCallback, SyncProgress
+from izzy_uploader.state import open_state_store
+from izzy_uploader.timing import STATE_LOAD, RunTimings
 
-REPORTS: Dict[str, Dict[str, str]] = {}
+from .jobs import DONE, FAILED, Job, JobQueue, JobRunner
+from .reports import DEFAULT_MAX_REPORTS, ReportStore
 
+MAX_CONCURRENCY = 16
+DATA_DIR_ENV = "IZZY_UPLOADER_DATA_DIR"
+REPORT_TTL_DAYS_ENV = "IZZY_UPLOADER_REPORT_TTL_DAYS"
+MAX_REPORTS_ENV = "IZZY_UPLOADER_MAX_REPORTS"
+REPORTS_PER_PAGE = 20
+# Progress events are polled from the job queue; each stream is closed after
+# SSE_MAX_DURATION seconds so it never pins a worker and EventSource reconnects.
+SSE_POLL_INTERVAL = 1.0
+SSE_MAX_DURATION = 30.0
 
-def create_app() -> Flask:
+
+def get_data_dir() -> Path:
+    """Return the directory holding uploads and the job queue."""
+
+    configured = os.getenv(DATA_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".izzy_uploader"
+
+
+def create_app(*, start_worker: bool = True) -> Flask:
     app = Flask(
         __name__,
         template_folder=str(Path(__file__).parent / "templates"),
@@ -41,6 +66,24 @@ def create_app() -> Flask:
     )
     app.config["SECRET_KEY"] = os.getenv("IZZY_UPLOADER_WEB_SECRET", "dev-secret")
     app.config["MAX_CONTENT_LENGTH"] = 20 * 1024 * 1024  # 20 MB
+    app.jinja_env.filters["datetime"] = _format_timestamp
+
+    data_dir = get_data_dir()
+    job_queue = JobQueue(data_dir / "jobs.sqlite")
+    report_store = ReportStore(
+        data_dir / "reports.sqlite",
+        ttl=float(os.getenv(REPORT_TTL_DAYS_ENV, "30")) * 24 * 3600,
+        max_reports=int(os.getenv(MAX_REPORTS_ENV, str(DEFAULT_MAX_REPORTS))),
+    )
+    job_runner = JobRunner(
+        job_queue,
+        lambda job: _run_sync_job(
+            job, report_store, progress_callback=_job_progress(job_queue, job.id)
+        ),
+    )
+    if start_worker:
+        job_runner.start()
+    app.extensions["izzy_job_runner"] = job_runner
 
     bp = Blueprint("web", __name__)
 
@@ -49,65 +92,91 @@ def create_app() -> Flask:
         return render_template("index.html")
 
     @bp.route("/upload", methods=["POST"])
-    def upload() -> str:
+    def upload():
         file = request.files.get("file")
         if file is None or file.filename == "":
             flash("Wybierz plik CSV.", "error")
             return redirect(url_for("web.index"))
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_csv:
-            file.save(tmp_csv.name)
-            tmp_csv_path = Path(tmp_csv.name)
-
-        vehicles, csv_errors = load_vehicles_from_csv(tmp_csv_path)
-        tmp_csv_path.unlink(missing_ok=True)
-
         try:
-            config = ServiceConfig.from_env()
+            ServiceConfig.from_env()
         except Exception as exc:  # pragma: no cover - environment misconfiguration
             flash(str(exc), "error")
             return render_template("result.html", errors=[str(exc)])
 
-        close_missing = request.form.get("close_missing") == "on"
-        update_prices = request.form.get("update_prices") == "on"
+        upload_dir = data_dir / "uploads"
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        csv_path = upload_dir / f"{uuid.uuid4()}.csv"
+        file.save(str(csv_path))
 
-        state_store = VehicleStateStore(config.state_file)
-        synchronizer = VehicleSynchronizer(IzzyleaseClient(config), state_store)
-        report = synchronizer.run(
-            vehicles,
-            close_missing=close_missing,
-            update_prices=update_prices,
-        )
+        options = {
+            "close_missing": request.form.get("close_missing") == "on",
+            "update_prices": request.form.get("update_prices") == "on",
+            "force": request.form.get("force") == "on",
+            "concurrency": _parse_concurrency(request.form.get("concurrency")),
+            "adaptive": request.form.get("adaptive") == "on",
+        }
+        job_id = job_queue.enqueue(csv_path, options)
+        job_runner.notify()
+        flash("Plik przyjęty – synchronizacja działa w tle.", "success")
+        return redirect(url_for("web.job_status", job_id=job_id))
 
-        for csv_error in csv_errors:
-            report.record_error(
-                f"CSV line {csv_error.line_number}: {csv_error.message}",
-                vin=csv_error.vin,
+    @bp.route("/jobs/<job_id>", methods=["GET"])
+    def job_status(job_id: str):
+        job = job_queue.get(job_id)
+        if job is None:
+            flash("Zadanie nie istnieje.", "error")
+            return redirect(url_for("web.index"))
+        if job.status == DONE:
+            stored = report_store.get(job.result["report_id"])
+            if stored is None:
+                flash("Raport wygasł lub nie istnieje.", "error")
+                return redirect(url_for("web.reports"))
+            return render_template(
+                "result.html",
+                report=stored[1].decode("utf-8"),
+                summary=job.result["summary"],
+                report_id=job.result["report_id"],
+                csv_errors=job.result["csv_errors"],
+                timings=job.result.get("timings"),
+                concurrency=job.result.get("concurrency"),
             )
+        if job.status == FAILED:
+            return render_template("result.html", errors=[job.error or "Nieznany błąd"])
+        return render_template("job.html", job=job)
 
-        report_data = report.as_dict(include_details=True)
-        report_json = json.dumps(report_data, ensure_ascii=False, indent=2)
-
-        report_id = str(uuid.uuid4())
-        report_path = Path(tempfile.gettempdir()) / f"izzy_report_{report_id}.json"
-        report_path.write_text(report_json, encoding="utf-8")
-        REPORTS[report_id] = {"path": str(report_path), "filename": f"report_{report_id}.json"}
-
-        return render_template(
-            "result.html",
-            report=report_json,
-            summary=report.as_dict(include_details=False),
-            report_id=report_id,
-            csv_errors=[err.format_for_display() for err in csv_errors],
+    @bp.route("/jobs/<job_id>/events", methods=["GET"])
+    def job_events(job_id: str):
+        if job_queue.get(job_id) is None:
+            return Response("Zadanie nie istnieje.", status=404)
+        return Response(
+            stream_with_context(_job_event_stream(job_queue, job_id)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
 
     @bp.route("/download/<report_id>", methods=["GET"])
     def download(report_id: str):
-        entry: Optional[Dict[str, str]] = REPORTS.get(report_id)
-        if not entry:
+        stored = report_store.get(report_id)
+        if stored is None:
             flash("Raport wygasł lub nie istnieje.", "error")
             return redirect(url_for("web.index"))
-        return send_file(entry["path"], as_attachment=True, download_name=entry["filename"])
+        entry, body = stored
+        return send_file(
+            io.BytesIO(body),
+            mimetype="application/json",
+            as_attachment=True,
+            download_name=entry.filename,
+        )
+
+    @bp.route("/reports", methods=["GET"])
+    def reports() -> str:
+        page = max(request.args.get("page", 1, type=int) or 1, 1)
+        entries, total = report_store.list_reports(page=page, per_page=REPORTS_PER_PAGE)
+        pages = max((total + REPORTS_PER_PAGE - 1) // REPORTS_PER_PAGE, 1)
+        return render_template(
+            "reports.html", entries=entries, page=page, pages=pages, total=total
+        )
 
     @bp.route("/locations", methods=["GET", "POST"])
     def locations() -> str:
@@ -139,5 +208,106 @@ def create_app() -> Flask:
     return app
 
 
+def _run_sync_job(
+    job: Job,
+    report_store: ReportStore,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """Run the synchronisation described by *job* and return its result payload."""
+
+    csv_path = Path(job.csv_path)
+    timings = RunTimings()
+    try:
+        vehicles, csv_errors = load_vehicles_from_csv(csv_path, timings=timings)
+    finally:
+        csv_path.unlink(missing_ok=True)
+
+    config = ServiceConfig.from_env()
+    options = job.options
+    with timings.stage(STATE_LOAD):
+        state_store = open_state_store(config.state_file, config.state_backend)
+    try:
+        with IzzyleaseClient(config) as client:
+            synchronizer = VehicleSynchronizer(
+                client,
+                state_store,
+                max_workers=int(options.get("concurrency", 1)),
+                adaptive=bool(options.get("adaptive")),
+                progress_callback=progress_callback,
+                progress_interval=SSE_POLL_INTERVAL,
+            )
+            report = synchronizer.run(
+                vehicles,
+                close_missing=bool(options.get("close_missing")),
+                max_delete_ratio=config.max_delete_ratio,
+                update_prices=bool(options.get("update_prices")),
+                force=bool(options.get("force")),
+                timings=timings,
+            )
+    finally:
+        state_store.close()
+
+    for csv_error in csv_errors:
+        report.record_error(
+            f"CSV line {csv_error.line_number}: {csv_error.message}",
+            vin=csv_error.vin,
+        )
+
+    summary = report.as_dict(include_details=False)
+    report_id = report_store.add(report.as_dict(include_details=True), summary)
+
+    return {
+        "report_id": report_id,
+        "summary": summary,
+        "csv_errors": [err.format_for_display() for err in csv_errors],
+        "timings": timings.as_dict(),
+        "concurrency": report.concurrency.as_dict() if report.concurrency else None,
+    }
+
+
+def _job_progress(job_queue: JobQueue, job_id: str) -> ProgressCallback:
+    def store(snapshot: SyncProgress) -> None:
+        job_queue.update_progress(job_id, snapshot.as_dict())
+
+    return store
+
+
+def _job_event_stream(job_queue: JobQueue, job_id: str) -> Iterator[str]:
+    """Yield Server-Sent Events with the progress of *job_id* until it finishes."""
+
+    yield f"retry: {int(SSE_POLL_INTERVAL * 1000)}\n\n"
+    deadline = time.monotonic() + SSE_MAX_DURATION
+    last_progress: Optional[Dict[str, Any]] = None
+    while True:
+        job = job_queue.get(job_id)
+        if job is None:
+            return
+        if job.progress and job.progress != last_progress:
+            last_progress = job.progress
+            yield _sse("progress", job.progress)
+        if job.finished:
+            yield _sse("done", {"status": job.status})
+            return
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(SSE_POLL_INTERVAL)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _format_timestamp(value: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
+
+
+def _parse_concurrency(raw: Optional[str]) -> int:
+    try:
+        value = int(raw or 1)
+    except ValueError:
+        return 1
+    return min(max(value, 1), MAX_CONCURRENCY)
+
+
 if __name__ == "__main__":  # pragma: no cover - manual launch helper
     create_app().run(debug=True)
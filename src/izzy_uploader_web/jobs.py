@@ -0,0 +1,314 @@
+"""Background execution of CSV synchronisation jobs for the web UI."""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# A running job whose worker has not reported for this long is considered dead.
+HEARTBEAT_TIMEOUT = 60.0
+HEARTBEAT_INTERVAL = 15.0
+
+
+@dataclass
+class Job:
+    """A queued or processed synchronisation request."""
+
+    id: str
+    status: str
+    csv_path: str
+    options: Dict[str, Any]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    progress: Dict[str, Any] = field(default_factory=dict)
+    heartbeat_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+class JobQueue:
+    """SQLite-backed job queue shared by every web worker process.
+
+    Only ``max_running`` jobs may be running across all processes at once;
+    synchronisations share one state file and must not overlap.
+    """
+
+    def __init__(self, path: Path, *, max_running: int = 1):
+        self._path = path
+        self._max_running = max_running
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    csv_path TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT,
+                    progress TEXT,
+                    heartbeat_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "progress" not in columns:  # queue created before progress tracking
+                conn.execute("ALTER TABLE jobs ADD COLUMN progress TEXT")
+            if "heartbeat_at" not in columns:  # queue created before heartbeats
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+
+    def enqueue(self, csv_path: Path, options: Dict[str, Any]) -> str:
+        job_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, csv_path, options, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, str(csv_path), json.dumps(options), time.time()),
+            )
+        return job_id
+
+    def claim_next(self) -> Optional[Job]:
+        """Atomically mark the oldest queued job as running and return it."""
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            running = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (RUNNING,)
+            ).fetchone()[0]
+            if running >= self._max_running:
+                return None
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, now, now, row[0]),
+            )
+        return self.get(row[0])
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a running job as done; ``False`` if it was failed in the meantime."""
+
+        return self._finish(job_id, DONE, result=json.dumps(result, ensure_ascii=False))
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Store the latest progress snapshot of a running job."""
+
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, heartbeat_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id),
+            )
+
+    def heartbeat(self, job_id: str) -> None:
+        """Record that the worker running *job_id* is still alive."""
+
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                (time.time(), job_id, RUNNING),
+            )
+
+    def fail(self, job_id: str, message: str) -> bool:
+        return self._finish(job_id, FAILED, error=message)
+
+    def fail_stale(
+        self, heartbeat_timeout: float = HEARTBEAT_TIMEOUT, max_runtime: Optional[float] = None
+    ) -> int:
+        """Fail running jobs whose worker died or hung.
+
+        A job is stale when its last heartbeat is older than *heartbeat_timeout*
+        seconds (the worker process is gone) or, with *max_runtime*, when it was
+        started longer ago than that. The uploaded CSV of a failed job is deleted.
+        """
+
+        now = time.time()
+        runtime_cutoff = now - max_runtime if max_runtime is not None else None
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            stale = conn.execute(
+                "SELECT id, csv_path FROM jobs "
+                "WHERE status = ? AND (COALESCE(heartbeat_at, started_at) < ? "
+                "OR started_at < COALESCE(?, started_at))",
+                (RUNNING, now - heartbeat_timeout, runtime_cutoff),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                [(FAILED, now, "Zadanie zostało przerwane.", job_id) for job_id, _ in stale],
+            )
+        for job_id, csv_path in stale:
+            LOGGER.warning("Job %s stopped reporting; marking it as failed", job_id)
+            Path(csv_path).unlink(missing_ok=True)
+        return len(stale)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, csv_path, options, created_at, started_at, finished_at, "
+                "result, error, progress, heartbeat_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row[0],
+            status=row[1],
+            csv_path=row[2],
+            options=json.loads(row[3]),
+            created_at=row[4],
+            started_at=row[5],
+            finished_at=row[6],
+            result=json.loads(row[7]) if row[7] else {},
+            error=row[8],
+            progress=json.loads(row[9]) if row[9] else {},
+            heartbeat_at=row[10],
+        )
+
+    # -- internals --------------------------------------------------
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        *,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        # Only a running job can finish: one already failed as stale stays failed.
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? "
+                "WHERE id = ? AND status = ?",
+                (status, time.time(), result, error, job_id, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per call keeps the queue usable from any thread or process.
+        conn = sqlite3.connect(str(self._path), timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+class JobRunner:
+    """Polls a :class:`JobQueue` and executes claimed jobs on a background thread.
+
+    While a job runs its heartbeat is refreshed every ``heartbeat_interval``
+    seconds; running jobs without a heartbeat for ``heartbeat_timeout`` seconds
+    (e.g. after a worker restart) are failed so the queue does not stay blocked.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[Job], Dict[str, Any]],
+        *,
+        poll_interval: float = 1.0,
+        max_runtime: float = 6 * 3600.0,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+    ):
+        self._queue = queue
+        self._handler = handler
+        self._poll_interval = poll_interval
+        self._max_runtime = max_runtime
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_timeout = heartbeat_timeout
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="izzy-job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def notify(self) -> None:
+        """Wake the dispatcher after a job was enqueued by this process."""
+
+        self._wakeup.set()
+
+    # -- internals --------------------------------------------------
+    def _loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._queue.fail_stale(self._heartbeat_timeout, self._max_runtime)
+                job = self._queue.claim_next()
+            except sqlite3.Error:
+                LOGGER.exception("Failed to poll job queue")
+                job = None
+            if job is None:
+                self._wakeup.wait(self._poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        LOGGER.info("Starting job %s", job.id)
+        finished = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._beat, args=(job.id, finished), name="izzy-job-heartbeat", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = self._handler(job)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.exception("Job %s failed", job.id)
+            self._queue.fail(job.id, str(exc))
+            return
+        finally:
+            finished.set()
+            heartbeat.join()
+        if self._queue.complete(job.id, result):
+            LOGGER.info("Finished job %s", job.id)
+        else:
+            LOGGER.warning("Job %s finished after it was failed as stale", job.id)
+
+    def _beat(self, job_id: str, finished: threading.Event) -> None:
+        while not finished.wait(self._heartbeat_interval):
+            try:
+                self._queue.heartbeat(job_id)
+            except sqlite3.Error:
+                LOGGER.exception("Failed to record heartbeat of job %s", job_id)
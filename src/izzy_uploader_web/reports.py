@@ -0,0 +1,169 @@
+"""Persistent storage of synchronisation reports shared by every web worker."""
+from __future__ import annotations
+
+import gzip
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_TTL = 30 * 24 * 3600.0
+DEFAULT_MAX_REPORTS = 500
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+@dataclass
+class ReportEntry:
+    """Metadata of a stored report, as shown in the report history."""
+
+    id: str
+    created_at: float
+    filename: str
+    summary: Dict[str, Any]
+    size: int
+
+
+class ReportStore:
+    """SQLite-backed repository of gzip-compressed JSON reports.
+
+    Reports older than ``ttl`` seconds are dropped, and the oldest ones are
+    evicted whenever more than ``max_reports`` reports or ``max_bytes``
+    compressed bytes are stored.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_reports: int = DEFAULT_MAX_REPORTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self._path = path
+        self._ttl = ttl
+        self._max_reports = max_reports
+        self._max_bytes = max_bytes
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reports (
+                    id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    filename TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    body BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at)")
+
+    def add(self, report: Dict[str, Any], summary: Dict[str, Any]) -> str:
+        """Store *report* and return its identifier."""
+
+        report_id = str(uuid.uuid4())
+        body = gzip.compress(
+            json.dumps(report, ensure_ascii=False, indent=2).encode("utf-8")
+        )
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO reports (id, created_at, filename, summary, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    report_id,
+                    time.time(),
+                    f"report_{report_id}.json",
+                    json.dumps(summary),
+                    len(body),
+                    body,
+                ),
+            )
+        self.evict()
+        return report_id
+
+    def get(self, report_id: str) -> Optional[Tuple[ReportEntry, bytes]]:
+        """Return the entry and the decompressed JSON document of *report_id*."""
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, created_at, filename, summary, size, body FROM reports "
+                "WHERE id = ? AND created_at >= ?",
+                (report_id, self._cutoff()),
+            ).fetchone()
+        if row is None:
+            return None
+        return _entry(row), gzip.decompress(row[5])
+
+    def list_reports(
+        self, *, page: int = 1, per_page: int = 20
+    ) -> Tuple[List[ReportEntry], int]:
+        """Return one page of reports (newest first) and the total report count."""
+
+        offset = (max(page, 1) - 1) * per_page
+        cutoff = self._cutoff()
+        with self._connect() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM reports WHERE created_at >= ?", (cutoff,)
+            ).fetchone()[0]
+            rows = conn.execute(
+                "SELECT id, created_at, filename, summary, size FROM reports "
+                "WHERE created_at >= ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (cutoff, per_page, offset),
+            ).fetchall()
+        return [_entry(row) for row in rows], total
+
+    def evict(self) -> int:
+        """Delete expired reports and the oldest ones over the count/size limits."""
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            removed = conn.execute(
+                "DELETE FROM reports WHERE created_at < ?", (self._cutoff(),)
+            ).rowcount
+            rows = conn.execute(
+                "SELECT id, size FROM reports ORDER BY created_at DESC"
+            ).fetchall()
+            kept_bytes = 0
+            excess: List[Tuple[str]] = []
+            for index, (report_id, size) in enumerate(rows):
+                kept_bytes += size
+                # The newest report is always kept, even when it alone exceeds max_bytes.
+                if index and (index >= self._max_reports or kept_bytes > self._max_bytes):
+                    excess.append((report_id,))
+            if excess:
+                conn.executemany("DELETE FROM reports WHERE id = ?", excess)
+        return removed + len(excess)
+
+    # -- internals --------------------------------------------------
+    def _cutoff(self) -> float:
+        return time.time() - self._ttl
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self._path), timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def _entry(row: tuple) -> ReportEntry:
+    return ReportEntry(
+        id=row[0],
+        created_at=row[1],
+        filename=row[2],
+        summary=json.loads(row[3]),
+        size=row[4],
+    )
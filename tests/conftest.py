@@ -0,0 +1,49 @@
+"""Helpers shared by the test modules."""
+from decimal import Decimal
+from typing import Optional
+
+from izzy_uploader.models import Vehicle
+
+
+class FakeClock:
+    """Manually advanced clock for code that takes a ``clock`` callable."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StaticTokenProvider:
+    def __init__(self, token: str = "token") -> None:
+        self.token = token
+
+    def get_token(self) -> str:
+        return self.token
+
+
+def make_vehicle(
+    vin: str, sales_price: str = "150000", *, configuration_number: Optional[str] = None
+) -> Vehicle:
+    return Vehicle(
+        configuration_number=configuration_number,
+        vin=vin,
+        category="PASSENGER",
+        make="Test",
+        model="Model",
+        manufacture_year=2020,
+        mileage=1000,
+        engine_code="ECODE",
+        cubic_capacity=1998.0,
+        acceleration=7.2,
+        fuel_type="PETROL",
+        power=180,
+        transmission_type="AUTOMATIC",
+        drive_wheels="FRONT",
+        vehicle_type="SALOON",
+        doors=4,
+        color="Blue",
+        list_price=Decimal("200000"),
+        sales_price=Decimal(sales_price),
+    )
@@ -0,0 +1,149 @@
+import asyncio
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pytest
+
+from izzy_uploader.async_client import AsyncIzzyleaseClient, _read_response
+from izzy_uploader.client import ApiError
+from izzy_uploader.pipelines.async_pipeline import AsyncVehicleSynchronizer
+from izzy_uploader.retry import RetryPolicy
+from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.stub_server import StubApiServer
+from conftest import StaticTokenProvider, make_vehicle
+
+
+class CachingTokenProvider(StaticTokenProvider):
+    def __init__(self, token: str) -> None:
+        super().__init__(token)
+        self.fetches = 0
+
+    def cached_token(self) -> Optional[str]:
+        return self.token if self.fetches else None
+
+    def get_token(self) -> str:
+        self.fetches += 1
+        return self.token
+
+
+@pytest.fixture()
+def stub() -> Iterator[StubApiServer]:
+    with StubApiServer(seed=11) as server:
+        yield server
+
+
+def make_client(
+    stub: StubApiServer, tmp_path: Path, token_provider: Optional[object] = None
+) -> AsyncIzzyleaseClient:
+    return AsyncIzzyleaseClient(
+        stub.service_config(tmp_path / "state.json"),
+        token_provider or StaticTokenProvider(stub.grant_token()),
+        retry_policy=RetryPolicy(max_attempts=1),
+        use_aiohttp=False,
+    )
+
+
+def test_async_client_round_trip(stub: StubApiServer, tmp_path: Path) -> None:
+    async def scenario() -> None:
+        async with make_client(stub, tmp_path) as client:
+            car_id = await client.create_vehicle(make_vehicle("VIN-A"))
+            assert car_id in stub.cars
+            await client.update_vehicle(car_id, make_vehicle("VIN-A", "140000"))
+            with pytest.raises(ApiError) as excinfo:
+                await client.update_vehicle("unknown", make_vehicle("VIN-A"))
+            assert excinfo.value.status == 404
+            await client.delete_vehicle(car_id)
+
+    asyncio.run(scenario())
+
+    stats = stub.stats.snapshot()
+    assert stats["requests"] == {
+        "POST /external/cars": 1,
+        "PUT /external/cars/{id}": 2,
+        "DELETE /external/cars/{id}": 1,
+    }
+    assert stats["connections"] == 1
+    assert stub.cars == {}
+
+
+def test_stream_transport_reads_chunked_responses() -> None:
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(
+            b"HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"7\r\n{\"id\": \r\n8\r\n\"car-1\"}\r\n0\r\n\r\n"
+        )
+        return await _read_response(reader, "POST")
+
+    response, keep_alive = asyncio.run(scenario())
+
+    assert (response.status, response.body, keep_alive) == (201, b'{"id": "car-1"}', True)
+
+
+def test_async_client_uses_cached_token_without_a_thread(
+    stub: StubApiServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    provider = CachingTokenProvider(stub.grant_token())
+    hops: List[object] = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args, **kwargs):
+        hops.append(func)
+        return await to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+
+    async def scenario() -> None:
+        async with make_client(stub, tmp_path, provider) as client:
+            car_id = await client.create_vehicle(make_vehicle("VIN-A"))
+            await client.update_vehicle(car_id, make_vehicle("VIN-A", "140000"))
+            await client.delete_vehicle(car_id)
+
+    asyncio.run(scenario())
+
+    assert provider.fetches == 1
+    assert hops == [provider.get_token]
+
+
+def test_async_pipeline_syncs_many_vehicles(stub: StubApiServer, tmp_path: Path) -> None:
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    state_store.upsert("VIN-GONE", "stale", None)
+    stub.cars["stale"] = {"vin": "VIN-GONE"}
+    vehicles = [make_vehicle(f"VIN-{index:03d}") for index in range(50)]
+
+    async def scenario():
+        async with make_client(stub, tmp_path) as client:
+            synchronizer = AsyncVehicleSynchronizer(client, state_store, max_in_flight=8)
+            first = await synchronizer.run(vehicles, close_missing=True)
+            second = await synchronizer.run(vehicles)
+            return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.created == 50
+    assert first.closed == 1
+    assert first.errors == []
+    assert [item["vin"] for item in first.created_vehicles] == sorted(
+        vehicle.vin for vehicle in vehicles
+    )
+    assert second.unchanged == 50
+    assert len(stub.cars) == 50 and "stale" not in stub.cars
+
+
+def test_async_pipeline_adapts_concurrency(stub: StubApiServer, tmp_path: Path) -> None:
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    vehicles = [make_vehicle(f"VIN-{index:03d}") for index in range(30)]
+
+    async def scenario():
+        async with make_client(stub, tmp_path) as client:
+            synchronizer = AsyncVehicleSynchronizer(
+                client, state_store, max_in_flight=8, adaptive=True
+            )
+            return await synchronizer.run(vehicles)
+
+    report = asyncio.run(scenario())
+
+    assert report.created == 30 and report.errors == []
+    assert report.concurrency is not None
+    assert report.concurrency.peak >= 2
+    assert all(1 <= entry["limit"] <= 8 for entry in report.concurrency.history)
@@ -0,0 +1,160 @@
+import json
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+from izzy_uploader.auth import REFRESH_RETRY_DELAY, OAuthTokenError, OAuthTokenProvider
+from izzy_uploader.token_cache import CachedToken, TokenCache
+from conftest import FakeClock
+
+
+class CountingProvider(OAuthTokenProvider):
+    def __init__(
+        self, clock: FakeClock, *, expires_in: float = 600.0, cache: Optional[TokenCache] = None
+    ) -> None:
+        super().__init__("https://auth.invalid/token", "id", "secret", cache=cache, clock=clock)
+        self.expires_in = expires_in
+        self.calls = 0
+        self.fetched = threading.Event()
+        self.gate: Optional[threading.Event] = None
+        self.failures: List[Exception] = []
+
+    def _fetch_token(self) -> Tuple[str, float]:
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        try:
+            if self.failures:
+                raise self.failures.pop(0)
+            return f"token-{self.calls}", self.expires_in
+        finally:
+            self.fetched.set()
+
+    def wait_for_refresh(self) -> None:
+        assert self.fetched.wait(5)
+        deadline = time.monotonic() + 5
+        while self._refresh is not None and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.fetched.clear()
+
+
+def test_token_is_refreshed_in_background_before_expiry() -> None:
+    clock = FakeClock(1000.0)
+    provider = CountingProvider(clock)
+
+    assert provider.get_token() == "token-1"
+    provider.wait_for_refresh()
+    clock.now += 470  # 78% of the lifetime
+    assert provider.get_token() == "token-1"
+    assert provider.calls == 1
+
+    clock.now += 20
+    assert provider.get_token() == "token-1"  # served while the refresh runs
+    provider.wait_for_refresh()
+    assert provider.calls == 2
+    assert provider.get_token() == "token-2"
+
+
+def test_concurrent_callers_share_one_refresh_of_an_expired_token() -> None:
+    provider = CountingProvider(FakeClock(1000.0))
+    provider.gate = threading.Event()
+    tokens: List[str] = []
+
+    def fetch() -> None:
+        tokens.append(provider.get_token())
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    provider.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert tokens == ["token-1"] * 8
+    assert provider.calls == 1
+
+
+def test_failed_background_refresh_keeps_serving_valid_token() -> None:
+    clock = FakeClock(1000.0)
+    provider = CountingProvider(clock)
+    provider.get_token()
+    provider.wait_for_refresh()
+
+    provider.failures.append(OAuthTokenError("boom"))
+    clock.now += 500
+    assert provider.get_token() == "token-1"
+    provider.wait_for_refresh()
+    assert provider.calls == 2
+
+    assert provider.get_token() == "token-1"  # retry is postponed
+    assert provider.calls == 2
+    clock.now += REFRESH_RETRY_DELAY
+    provider.get_token()
+    provider.wait_for_refresh()
+    assert provider.calls == 3
+    assert provider.get_token() == "token-3"
+
+
+def test_refresh_failure_without_valid_token_is_raised() -> None:
+    provider = CountingProvider(FakeClock(1000.0))
+    provider.failures.append(OAuthTokenError("boom"))
+
+    with pytest.raises(OAuthTokenError):
+        provider.get_token()
+    assert provider.get_token() == "token-2"
+
+
+def test_invalidate_drops_only_the_rejected_token(tmp_path: Path) -> None:
+    cache = TokenCache(tmp_path / "token_cache.json")
+    provider = CountingProvider(FakeClock(1000.0), cache=cache)
+    assert provider.get_token() == "token-1"
+
+    provider.invalidate("token-1")
+    provider.invalidate("token-1")  # a second thread reporting the same 401
+    assert provider.get_token() == "token-2"
+    provider.invalidate("token-1")  # late report of the old token
+    assert provider.get_token() == "token-2"
+    assert provider.calls == 2
+
+
+def test_token_cache_is_shared_between_providers(tmp_path: Path) -> None:
+    cache = TokenCache(tmp_path / "cache" / "token_cache.json")
+    first = CountingProvider(FakeClock(1000.0), cache=cache)
+    second = CountingProvider(FakeClock(1000.0), cache=TokenCache(cache.path))
+
+    assert first.get_token() == "token-1"
+    assert second.get_token() == "token-1"
+    assert (first.calls, second.calls) == (1, 0)
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+    assert "secret" not in cache.path.read_text(encoding="utf-8")
+
+
+def test_cached_token_past_its_refresh_point_is_replaced(tmp_path: Path) -> None:
+    cache = TokenCache(tmp_path / "token_cache.json")
+    key = TokenCache.key("https://auth.invalid/token", "id")
+    now = time.time()
+    with cache.session() as session:
+        session.put(key, CachedToken("old", issued_at=now - 500, expires_at=now + 100))
+    provider = CountingProvider(FakeClock(1000.0), cache=cache)
+
+    assert provider.get_token() == "token-1"
+    with cache.session() as session:
+        cached = session.get(key)
+    assert cached is not None and cached.access_token == "token-1"
+    assert cached.expires_at - cached.issued_at == pytest.approx(600)
+
+
+def test_corrupt_token_cache_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "token_cache.json"
+    path.write_text("{not json", encoding="utf-8")
+    provider = CountingProvider(FakeClock(1000.0), cache=TokenCache(path))
+
+    assert provider.get_token() == "token-1"
+    assert list(json.loads(path.read_text(encoding="utf-8"))) == [
+        TokenCache.key("https://auth.invalid/token", "id")
+    ]
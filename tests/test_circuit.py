@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from izzy_uploader.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from izzy_uploader.client import IzzyleaseClient
+from izzy_uploader.pipelines.import_pipeline import VehicleSynchronizer
+from izzy_uploader.retry import RetryPolicy
+from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.stub_server import FaultInjection, StubApiServer
+from conftest import FakeClock, make_vehicle
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(3, failure_rate=0, reset_timeout=10, clock=clock)
+
+    for _ in range(3):
+        breaker.record(breaker.before_call(), failed=True)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    probe = breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record(probe, failed=True)
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    breaker.record(breaker.before_call(), failed=False)
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_breaker_opens_on_failure_rate() -> None:
+    breaker = CircuitBreaker(10, failure_rate=0.5, window=4, clock=FakeClock())
+
+    for failed in (False, True, False, True):
+        breaker.record(breaker.before_call(), failed=failed)
+    assert breaker.state == OPEN
+
+
+def test_released_probe_lets_the_next_call_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(1, reset_timeout=5, clock=clock)
+    breaker.record(breaker.before_call(), failed=True)
+
+    clock.now = 5
+    breaker.release(breaker.before_call())
+    breaker.record(breaker.before_call(), failed=False)
+    assert breaker.state == CLOSED
+
+
+def test_late_result_of_an_earlier_call_does_not_decide_the_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(1, reset_timeout=5, clock=clock)
+    slow = breaker.before_call()  # still in flight when the circuit trips
+    breaker.record(breaker.before_call(), failed=True)
+    assert breaker.state == OPEN
+
+    clock.now = 5
+    probe = breaker.before_call()
+    breaker.record(slow, failed=False)
+    breaker.release(slow)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # the probe is still the only call let through
+
+    breaker.record(probe, failed=True)
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_skips_remaining_vehicles(tmp_path: Path) -> None:
+    with StubApiServer(faults=FaultInjection(server_error_rate=1.0), seed=1) as stub:
+        config = stub.service_config(
+            tmp_path / "state.json", circuit_failure_threshold=3, circuit_reset_timeout=60
+        )
+        client = IzzyleaseClient(config, retry_policy=RetryPolicy(max_attempts=2, base_delay=0))
+        with client:
+            report = VehicleSynchronizer(client, VehicleStateStore(config.state_file)).run(
+                [make_vehicle(f"VIN-{index:02d}", "150000") for index in range(10)]
+            )
+        cars_requests = stub.stats.snapshot()["requests"]["POST /external/cars"]
+
+    # A 500 on a create is not retried; the third failure opened the circuit, so
+    # every later vehicle was skipped without reaching the API.
+    assert cars_requests == 3
+    assert len(report.errors) == 3
+    assert report.skipped == 7
+    assert report.as_dict()["skipped"] == 7
+    assert report.skipped_vehicles[0] == {"vin": "VIN-03", "car_id": None, "reason": "API unavailable"}
@@ -0,0 +1,263 @@
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from izzy_uploader.client import ApiError, IzzyleaseClient
+from izzy_uploader.config import ServiceConfig
+from izzy_uploader.retry import RetryPolicy, parse_retry_after
+from izzy_uploader.stub_server import StubApiServer
+from izzy_uploader.transport import ConnectionPool, TransportError
+from conftest import StaticTokenProvider, make_vehicle
+
+
+@pytest.fixture()
+def stub() -> Iterator[StubApiServer]:
+    with StubApiServer(seed=5) as server:
+        yield server
+
+
+def make_client(stub: StubApiServer, tmp_path: Path, **kwargs) -> IzzyleaseClient:
+    return IzzyleaseClient(
+        stub.service_config(tmp_path / "state.json"),
+        StaticTokenProvider(stub.grant_token()),
+        **kwargs,
+    )
+
+
+def test_client_reuses_keep_alive_connection(stub: StubApiServer, tmp_path: Path) -> None:
+    with make_client(stub, tmp_path) as client:
+        car_id = client.create_vehicle(make_vehicle("VIN-A"))
+        client.update_vehicle(car_id, make_vehicle("VIN-A", "140000"))
+        client.update_vehicle(car_id, make_vehicle("VIN-A", "130000"))
+
+    stats = stub.stats.snapshot()
+    assert stats["total_requests"] == 3
+    assert stats["connections"] == 1
+
+
+def test_client_reports_http_errors(stub: StubApiServer, tmp_path: Path) -> None:
+    with make_client(stub, tmp_path) as client:
+        car_id = client.create_vehicle(make_vehicle("VIN-A"))
+        with pytest.raises(RuntimeError, match="status 404"):
+            client.update_vehicle("missing", make_vehicle("VIN-A"))
+        # The connection stays usable after an error response.
+        client.update_vehicle(car_id, make_vehicle("VIN-A"))
+
+    assert stub.stats.snapshot()["connections"] == 1
+
+
+def test_client_retries_transient_statuses(stub: StubApiServer, tmp_path: Path) -> None:
+    delays: List[float] = []
+    client = make_client(
+        stub,
+        tmp_path,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01),
+        sleep=delays.append,
+    )
+    with client:
+        car_id = client.create_vehicle(make_vehicle("VIN-A"))
+        stub.fail_next(503, count=2, headers={"Retry-After": "0"})
+        client.update_vehicle(car_id, make_vehicle("VIN-A", "140000"))
+        assert client.last_retry_count == 2
+
+    # Retry-After: 0 from the server overrides the jittered backoff.
+    assert delays == [0.0, 0.0]
+    assert stub.stats.snapshot()["requests"]["PUT /external/cars/{id}"] == 3
+
+
+def test_client_gives_up_after_max_attempts(stub: StubApiServer, tmp_path: Path) -> None:
+    stub.fail_next(503, count=5, headers={"Retry-After": "0"})
+    client = make_client(
+        stub, tmp_path, retry_policy=RetryPolicy(max_attempts=2), sleep=lambda _: None
+    )
+    with client, pytest.raises(ApiError) as excinfo:
+        client.update_vehicle("car-1", make_vehicle("VIN-A"))
+
+    assert excinfo.value.status == 503
+    assert client.last_retry_count == 1
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "retried"),
+    [
+        (429, {}, True),
+        (503, {"Retry-After": "0"}, True),
+        (503, {}, False),
+        (502, {}, False),
+        (504, {}, False),
+    ],
+)
+def test_create_is_retried_only_when_the_server_did_not_process_it(
+    stub: StubApiServer, tmp_path: Path, status: int, headers: dict, retried: bool
+) -> None:
+    stub.fail_next(status, headers=headers)
+    client = make_client(
+        stub,
+        tmp_path,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0),
+        sleep=lambda _: None,
+    )
+    with client:
+        if retried:
+            assert client.create_vehicle(make_vehicle("VIN-A")) in stub.cars
+        else:
+            with pytest.raises(ApiError) as excinfo:
+                client.create_vehicle(make_vehicle("VIN-A"))
+            assert excinfo.value.status == status and not excinfo.value.retryable
+
+    assert stub.stats.snapshot()["requests"]["POST /external/cars"] == (2 if retried else 1)
+
+
+def test_retry_policy_backoff_uses_full_jitter() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+    assert policy.backoff(1, rng=lambda: 1.0) == 1.0
+    assert policy.backoff(3, rng=lambda: 0.5) == 2.0
+    assert policy.backoff(10, rng=lambda: 1.0) == 5.0
+    assert policy.backoff(1, retry_after=60.0) == 5.0
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("not a date") is None
+
+
+OK_RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Length: 15\r\n\r\n{"id": "car-1"}'
+
+
+class DroppingServer:
+    """Answers the first request on each connection and drops the connection on the next."""
+
+    def __init__(self) -> None:
+        self.methods: List[str] = []
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def close(self) -> None:
+        self._socket.close()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rb") as stream:
+            for index in range(2):
+                if not self._read_request(stream):
+                    return
+                if index == 1:
+                    return  # applied, but the connection drops before the reply
+                connection.sendall(OK_RESPONSE)
+
+    def _read_request(self, stream) -> bool:
+        request_line = stream.readline()
+        if not request_line:
+            return False
+        length = 0
+        for line in iter(stream.readline, b"\r\n"):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        stream.read(length)
+        self.methods.append(request_line.split()[0].decode("ascii"))
+        return True
+
+
+class IdleClosingServer(DroppingServer):
+    """Answers every request but closes connections idle for *keep_alive* seconds.
+
+    With *reset* the connection is aborted (RST) instead of closed gracefully.
+    """
+
+    def __init__(self, keep_alive: float, *, reset: bool = False) -> None:
+        self.keep_alive = keep_alive
+        self.reset = reset
+        self.connections = 0
+        super().__init__()
+
+    def _handle(self, connection: socket.socket) -> None:
+        self.connections += 1
+        connection.settimeout(self.keep_alive)
+        with connection, connection.makefile("rb") as stream:
+            try:
+                while self._read_request(stream):
+                    connection.sendall(OK_RESPONSE)
+            except socket.timeout:
+                if self.reset:
+                    connection.setsockopt(
+                        socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+                    )
+
+
+@pytest.mark.parametrize(
+    ("method", "resent"), [("PUT", True), ("DELETE", True), ("POST", False)]
+)
+def test_dropped_keep_alive_connection_resends_only_idempotent_requests(
+    method: str, resent: bool
+) -> None:
+    server = DroppingServer()
+    pool = ConnectionPool(timeout=5)
+    try:
+        pool.request("GET", f"{server.url}/warm-up")
+        if resent:
+            assert pool.request(method, f"{server.url}/cars/1", body=b"{}").status == 200
+        else:
+            with pytest.raises(TransportError) as excinfo:
+                pool.request(method, f"{server.url}/cars", body=b"{}")
+            assert not excinfo.value.connect_failed
+    finally:
+        pool.close()
+        server.close()
+
+    assert server.methods == ["GET", method] + ([method] if resent else [])
+
+
+def test_connection_closed_by_the_server_while_idle_is_not_reused(tmp_path: Path) -> None:
+    server = IdleClosingServer(keep_alive=0.2)
+    config = ServiceConfig(
+        api_base_url=server.url,
+        token_url=f"{server.url}/oauth/token",
+        client_id="client",
+        client_secret="secret",
+        dealer_id=None,
+        state_file=tmp_path / "state.json",
+    )
+    client = IzzyleaseClient(
+        config, StaticTokenProvider(), retry_policy=RetryPolicy(max_attempts=1)
+    )
+    try:
+        with client:
+            client.update_vehicle("1", make_vehicle("VIN-1"))
+            time.sleep(0.5)
+            assert client.create_vehicle(make_vehicle("VIN-2")) == "car-1"
+    finally:
+        server.close()
+
+    assert server.methods == ["PUT", "POST"]
+    assert server.connections == 2
+
+
+def test_post_that_failed_to_send_on_a_reused_connection_is_resent(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    server = IdleClosingServer(keep_alive=0.2, reset=True)
+    # Reuse the aborted connection anyway, so the request fails while it is sent.
+    monkeypatch.setattr("izzy_uploader.transport._is_dropped", lambda connection: False)
+    pool = ConnectionPool(timeout=5)
+    try:
+        pool.request("GET", f"{server.url}/warm-up")
+        time.sleep(0.5)
+        assert pool.request("POST", f"{server.url}/cars", body=b"{}").status == 200
+    finally:
+        pool.close()
+        server.close()
+
+    assert server.methods == ["GET", "POST"]
+    assert server.connections == 2
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pytest
+
+from izzy_uploader.client import ApiError, IzzyleaseClient
+from izzy_uploader.concurrency import INCREASE, LATENCY, OVERLOAD, START, AdaptiveConcurrency
+from izzy_uploader.pipelines.import_pipeline import VehicleSynchronizer
+from izzy_uploader.retry import RetryPolicy
+from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.stub_server import FaultInjection, StubApiServer
+from conftest import FakeClock, make_vehicle
+
+
+def complete_window(controller: AdaptiveConcurrency, seconds: float = 0.1) -> None:
+    for _ in range(controller.limit):
+        controller.record(seconds)
+
+
+def test_limit_grows_by_one_per_window_while_latency_is_flat() -> None:
+    controller = AdaptiveConcurrency(4, clock=FakeClock())
+
+    limits = []
+    for _ in range(5):
+        complete_window(controller)
+        limits.append(controller.limit)
+
+    assert limits == [2, 3, 4, 4, 4]
+    assert [entry["reason"] for entry in controller.history] == [START] + [INCREASE] * 3
+
+
+def test_overload_halves_the_limit_once_per_burst() -> None:
+    clock = FakeClock()
+    controller = AdaptiveConcurrency(16, initial_limit=8, clock=clock)
+
+    clock.now = 2.5
+    for _ in range(8):  # every call in flight was throttled
+        controller.record(0.1, overloaded=True)
+    assert controller.limit == 4
+    assert controller.history[-1] == {"seconds": 2.5, "limit": 4, "reason": OVERLOAD}
+
+    complete_window(controller)
+    assert controller.limit == 5
+
+
+def test_latency_spike_backs_off() -> None:
+    controller = AdaptiveConcurrency(8, initial_limit=4, smoothing=1.0, clock=FakeClock())
+    complete_window(controller, 0.1)
+    assert controller.limit == 5
+
+    complete_window(controller, 0.5)
+    assert controller.limit == 2
+    assert controller.history[-1]["reason"] == LATENCY
+    assert controller.as_dict()["peak_limit"] == 5
+
+
+def test_measure_treats_throttling_and_retries_as_overload() -> None:
+    controller = AdaptiveConcurrency(8, initial_limit=4, clock=FakeClock())
+
+    with pytest.raises(ApiError):
+        with controller.measure():
+            raise ApiError("busy", status=429)
+    assert controller.limit == 2
+
+    controller = AdaptiveConcurrency(8, initial_limit=4, clock=FakeClock())
+    with pytest.raises(ApiError):
+        with controller.measure():
+            raise ApiError("missing", status=404)
+    with controller.measure(lambda: 1):
+        pass
+    assert controller.limit == 2
+
+
+def test_adaptive_pipeline_records_concurrency_history(tmp_path: Path) -> None:
+    faults = FaultInjection(throttle_rate=0.2, retry_after=None)
+    with StubApiServer(faults=faults, seed=3) as stub:
+        config = stub.service_config(tmp_path / "state.json", pool_size=8)
+        client = IzzyleaseClient(config, retry_policy=RetryPolicy(max_attempts=10, base_delay=0))
+        with client:
+            synchronizer = VehicleSynchronizer(
+                client, VehicleStateStore(config.state_file), max_workers=8, adaptive=True
+            )
+            report = synchronizer.run(
+                [make_vehicle(f"VIN-{index:02d}", "150000") for index in range(40)]
+            )
+
+    assert report.created == 40 and report.errors == []
+    concurrency = report.as_dict(include_details=True)["concurrency"]
+    history = concurrency["history"]
+    assert history[0] == {"seconds": 0.0, "limit": 1, "reason": START}
+    assert OVERLOAD in {entry["reason"] for entry in history}
+    assert all(1 <= entry["limit"] <= 8 for entry in history)
+    assert concurrency["max_limit"] == 8
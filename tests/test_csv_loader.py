@@ -2,7 +2,8 @@ from decimal import Decimal
 from pathlib import Path
 from textwrap import dedent
 
-from izzy_uploader.csv_loader import CsvRowError, load_vehicles_from_csv
+from izzy_uploader.csv_loader import CsvRowError, iter_vehicles_from_csv, load_vehicles_from_csv
+from izzy_uploader.timing import RunTimings
 
 
 def test_loads_valid_vehicle(tmp_path: Path) -> None:
@@ -109,3 +110,60 @@ def test_car_class_is_inferred_when_missing(tmp_path: Path) -> None:
         "BUSINESS",
         "SWEET",
     ]
+
+
+def test_iter_vehicles_streams_rows_and_reports_errors(tmp_path: Path) -> None:
+    csv_content = dedent(
+        """
+        configurationNumber,vin,category,make,model,manufactureYear,mileage,engineCode,cubicCapacity,acceleration,fuelType,power,transmissionType,driveWheels,type,doors,color,pricing_listPrice,pricing_salesPrice
+        CONF-1,VIN-1,PASSENGER,BMW,Seria 3,2020,15000,B48,1998,7.2,PETROL,184,AUTOMATIC,REAR,SALOON,4,Blue,200000.00,189999.99
+        CONF-2,,PASSENGER,BMW,Seria 3,2020,15000,B48,1998,7.2,PETROL,184,AUTOMATIC,REAR,SALOON,4,Blue,200000.00,189999.99
+        CONF-3,VIN-3,PASSENGER,BMW,Seria 3,2020,15000,B48,1998,7.2,PETROL,184,AUTOMATIC,REAR,SALOON,4,Blue,200000.00,189999.99
+        """
+    ).strip()
+    path = tmp_path / "vehicles.csv"
+    path.write_text(csv_content, encoding="utf-8")
+
+    errors: list[CsvRowError] = []
+    stream = iter_vehicles_from_csv(path, on_error=errors.append)
+
+    assert next(stream).vin == "VIN-1"
+    assert not errors
+    assert next(stream).vin == "VIN-3"
+    assert [error.line_number for error in errors] == [3]
+    assert list(stream) == []
+
+
+def test_parallel_loader_matches_serial_loader(tmp_path: Path) -> None:
+    header = "configurationNumber,vin,category,make,model,manufactureYear,mileage,engineCode,cubicCapacity,acceleration,fuelType,power,transmissionType,driveWheels,type,doors,color,pricing_listPrice,pricing_salesPrice"
+    lines = [header]
+    for index in range(25):
+        vin = "" if index % 7 == 3 else f"VIN-{index:03d}"
+        lines.append(
+            f"CONF-{index},{vin},osobowy,BMW,Seria 3,2020,{1000 + index},B48,1998.00,7.2,"
+            f"ETYLINA,184.00,Automatyczna,Na przednie koła,Kombi,5,Blue,200000.00,18{index:04d}.00"
+        )
+    path = tmp_path / "vehicles.csv"
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    serial = load_vehicles_from_csv(path)
+    parallel = load_vehicles_from_csv(path, workers=2, chunk_size=4)
+
+    assert parallel == serial
+    assert [error.line_number for error in parallel[1]] == [5, 12, 19, 26]
+    assert len(parallel[0]) == 21
+
+
+def test_loader_records_parse_and_normalisation_time(tmp_path: Path) -> None:
+    header = "configurationNumber,vin,category,make,model,manufactureYear,mileage,engineCode,cubicCapacity,acceleration,fuelType,power,transmissionType,driveWheels,type,doors,color,pricing_listPrice,pricing_salesPrice"
+    row = "CONF-1,VIN-1,osobowy,BMW,Seria 3,2020,1000,B48,1998.00,7.2,ETYLINA,184.00,Automatyczna,Na przednie koła,Kombi,5,Blue,200000.00,180000.00"
+    path = tmp_path / "vehicles.csv"
+    path.write_text("\n".join([header, row]), encoding="utf-8")
+
+    timings = RunTimings()
+    vehicles, errors = load_vehicles_from_csv(path, timings=timings)
+
+    assert len(vehicles) == 1 and not errors
+    stages = timings.as_dict()["stages"]
+    assert set(stages) == {"csv_parse", "normalisation"}
+    assert all(seconds > 0 for seconds in stages.values())
@@ -0,0 +1,161 @@
+import io
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+
+from izzy_uploader_web.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, JobRunner  # noqa: E402
+
+
+def test_queue_runs_one_job_at_a_time(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    first = queue.enqueue(tmp_path / "a.csv", {"force": True})
+    second = queue.enqueue(tmp_path / "b.csv", {})
+
+    claimed = queue.claim_next()
+    assert claimed is not None and claimed.id == first
+    assert claimed.status == RUNNING
+    assert claimed.options == {"force": True}
+    # A second worker must wait until the running job finishes.
+    assert queue.claim_next() is None
+
+    queue.complete(first, {"summary": {"created": 1}})
+    assert queue.get(first).status == DONE
+    assert queue.get(first).result == {"summary": {"created": 1}}
+
+    claimed = queue.claim_next()
+    assert claimed is not None and claimed.id == second
+
+
+def test_runner_executes_jobs_in_background(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+
+    def handler(job):
+        if job.options.get("explode"):
+            raise RuntimeError("boom")
+        return {"csv": job.csv_path}
+
+    runner = JobRunner(queue, handler, poll_interval=0.05)
+    ok = queue.enqueue(tmp_path / "a.csv", {})
+    broken = queue.enqueue(tmp_path / "b.csv", {"explode": True})
+    assert queue.get(ok).status == QUEUED
+
+    runner.start()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not queue.get(broken).finished:
+            time.sleep(0.05)
+    finally:
+        runner.stop()
+
+    assert queue.get(ok).result == {"csv": str(tmp_path / "a.csv")}
+    assert queue.get(broken).status == FAILED
+    assert queue.get(broken).error == "boom"
+
+
+def test_job_of_a_dead_worker_is_failed_once_its_heartbeat_stops(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    orphan = queue.enqueue(tmp_path / "a.csv", {})
+    queue.claim_next()  # claimed by a worker that is then killed
+    waiting = queue.enqueue(tmp_path / "b.csv", {})
+    assert queue.fail_stale(heartbeat_timeout=60) == 0
+    assert queue.claim_next() is None
+
+    runner = JobRunner(
+        queue, lambda job: {}, poll_interval=0.05, heartbeat_interval=0.05, heartbeat_timeout=0.3
+    )
+    runner.start()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not queue.get(waiting).finished:
+            time.sleep(0.05)
+    finally:
+        runner.stop()
+
+    assert queue.get(orphan).status == FAILED
+    assert queue.get(waiting).status == DONE
+
+
+def test_heartbeat_keeps_a_long_job_alive(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    job_id = queue.enqueue(tmp_path / "a.csv", {})
+    stale_checks = []
+
+    def handler(job):
+        for _ in range(6):
+            time.sleep(0.1)
+            stale_checks.append(JobQueue(tmp_path / "jobs.sqlite").fail_stale(heartbeat_timeout=0.25))
+        return {}
+
+    runner = JobRunner(queue, handler, poll_interval=0.05, heartbeat_interval=0.05)
+    runner.start()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not queue.get(job_id).finished:
+            time.sleep(0.05)
+    finally:
+        runner.stop()
+
+    assert stale_checks == [0] * 6
+    assert queue.get(job_id).status == DONE
+
+
+def test_stale_job_loses_its_upload_and_stays_failed(tmp_path: Path) -> None:
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    upload = tmp_path / "a.csv"
+    upload.write_text("vin\nVIN-1\n", encoding="utf-8")
+    job_id = queue.enqueue(upload, {})
+    queue.claim_next()
+
+    assert queue.fail_stale(heartbeat_timeout=-1) == 1
+    assert not upload.exists()
+    # The worker was only slow: its late result must not overwrite the failure.
+    assert queue.complete(job_id, {"summary": {"created": 1}}) is False
+
+    job = queue.get(job_id)
+    assert job.status == FAILED and job.result == {}
+
+
+def test_job_events_stream_progress_until_done(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("IZZY_UPLOADER_DATA_DIR", str(tmp_path))
+    from izzy_uploader_web.app import create_app
+
+    app = create_app(start_worker=False)
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    job_id = queue.enqueue(tmp_path / "a.csv", {})
+    queue.claim_next()
+    queue.update_progress(job_id, {"processed": 3, "total": 10})
+    assert queue.get(job_id).progress == {"processed": 3, "total": 10}
+    queue.complete(job_id, {})
+
+    response = app.test_client().get(f"/jobs/{job_id}/events")
+
+    assert response.mimetype == "text/event-stream"
+    body = response.get_data(as_text=True)
+    assert 'event: progress\ndata: {"processed": 3, "total": 10}\n\n' in body
+    assert body.endswith('event: done\ndata: {"status": "done"}\n\n')
+    assert app.test_client().get("/jobs/missing/events").status_code == 404
+
+
+def test_upload_enqueues_job_and_redirects_to_it(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("IZZY_UPLOADER_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("IZZYLEASE_API_BASE_URL", "https://api.invalid")
+    monkeypatch.setenv("IZZYLEASE_CLIENT_ID", "id")
+    monkeypatch.setenv("IZZYLEASE_CLIENT_SECRET", "secret")
+    from izzy_uploader_web.app import create_app
+
+    app = create_app(start_worker=False)
+    response = app.test_client().post(
+        "/upload",
+        data={"file": (io.BytesIO(b"vin\nVIN-1\n"), "feed.csv"), "force": "on"},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 302
+    job_id = response.headers["Location"].rsplit("/jobs/", 1)[1]
+    job = JobQueue(tmp_path / "jobs.sqlite").get(job_id)
+    assert job is not None and job.status == QUEUED
+    assert job.options["force"] is True
+    assert Path(job.csv_path).read_bytes() == b"vin\nVIN-1\n"
@@ -0,0 +1,90 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from izzy_uploader import normalizers
+
+
+@pytest.fixture()
+def location_map(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "location_map.json"
+    path.write_text(json.dumps({"P1": "uuid-1"}), encoding="utf-8")
+    monkeypatch.setenv(normalizers.LOCATION_MAP_ENV, str(path))
+    normalizers.refresh_location_map()
+    yield path
+    normalizers.refresh_location_map()
+
+
+def test_location_lookups_share_one_read_only_snapshot(location_map: Path) -> None:
+    first = normalizers._load_location_map()
+    assert normalizers._map_location(" P1 ") == "uuid-1"
+    assert normalizers._load_location_map() is first
+    with pytest.raises(TypeError):
+        first["P2"] = "uuid-2"  # type: ignore[index]
+
+    copy = normalizers.load_location_map()
+    copy["P2"] = "uuid-2"
+    assert normalizers._map_location("P2") == ""
+
+
+def test_location_lookups_resolve_the_path_once_per_interval(
+    location_map: Path, monkeypatch
+) -> None:
+    calls = []
+    resolve = normalizers.get_location_map_path
+
+    def counting_path() -> Path:
+        calls.append(1)
+        return resolve()
+
+    monkeypatch.setattr(normalizers, "get_location_map_path", counting_path)
+    assert [normalizers._map_location("P1") for _ in range(1000)] == ["uuid-1"] * 1000
+    assert len(calls) == 1
+
+
+def test_location_map_reloads_when_file_changes(location_map: Path, monkeypatch) -> None:
+    monkeypatch.setattr(normalizers, "LOCATION_MAP_CHECK_INTERVAL", 0.0)
+    assert normalizers._map_location("P2") == ""
+
+    # Simulate another worker saving the map: a new file replaces the old one.
+    replacement = location_map.with_suffix(".new")
+    replacement.write_text(json.dumps({"P1": "uuid-1", "P2": "uuid-2"}), encoding="utf-8")
+    os.replace(replacement, location_map)
+
+    assert normalizers._map_location("P2") == "uuid-2"
+
+
+def test_save_location_map_is_visible_immediately(location_map: Path) -> None:
+    normalizers._load_location_map()
+    normalizers.save_location_map({"P3": "uuid-3"})
+
+    assert normalizers._map_location("P3") == "uuid-3"
+    assert json.loads(location_map.read_text(encoding="utf-8")) == {"P3": "uuid-3"}
+    assert list(location_map.parent.glob("*.tmp")) == []
+
+
+def test_enum_resolution_is_memoised() -> None:
+    normalizers.clear_enum_cache()
+    row = {
+        "category": "Osobowy",
+        "fuelType": "Olej napędowy",
+        "transmissionType": "Automatyczna dwusprzęgłowa (DCT, DSG)",
+        "driveWheels": "4x4 (stały)",
+        "type": "Kombi",
+        "carClass": "",
+    }
+
+    first = normalizers.clean_row(row)
+    misses = normalizers.enum_cache_info()["misses"]
+    second = normalizers.clean_row(row)
+
+    assert first == second
+    assert (first["category"], first["fuelType"], first["type"]) == ("PASSENGER", "DIESEL", "ESTATE")
+    assert (first["transmissionType"], first["driveWheels"]) == ("AUTOMATIC", "FOUR")
+    info = normalizers.enum_cache_info()
+    assert info["misses"] == misses == 5
+    assert info["hits"] == 5
+    assert normalizers._map_enum("Unknown fuel", "fuel") == "UNKNOWN FUEL"
+    assert normalizers._map_enum("whatever", "car_class", default_upper=False) == ""
@@ -1,10 +1,18 @@
-from decimal import Decimal
+import sys
+import time
 from pathlib import Path
 from typing import Dict, List
 
+import pytest
+from click.testing import CliRunner
+
+from izzy_uploader.cli import cli
+from izzy_uploader.journal import RunJournal
 from izzy_uploader.models import Vehicle
 from izzy_uploader.pipelines.import_pipeline import PipelineReport, VehicleSynchronizer
-from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.state import SqliteVehicleStateStore, VehicleStateStore
+from izzy_uploader.timing import RunTimings, percentile
+from conftest import make_vehicle
 
 
 class FakeClient:
@@ -25,30 +33,6 @@ class FakeClient:
         self.deleted.append(car_id)
 
 
-def make_vehicle(vin: str, sales_price: str, *, configuration_number: str | None = None) -> Vehicle:
-    return Vehicle(
-        configuration_number=configuration_number,
-        vin=vin,
-        category="PASSENGER",
-        make="Test",
-        model="Model",
-        manufacture_year=2020,
-        mileage=1000,
-        engine_code="ECODE",
-        cubic_capacity=1998.0,
-        acceleration=7.2,
-        fuel_type="PETROL",
-        power=180,
-        transmission_type="AUTOMATIC",
-        drive_wheels="FRONT",
-        vehicle_type="SALOON",
-        doors=4,
-        color="Blue",
-        list_price=Decimal("200000"),
-        sales_price=Decimal(sales_price),
-    )
-
-
 def test_pipeline_creates_and_updates(tmp_path: Path) -> None:
     client = FakeClient()
     state_store = VehicleStateStore(tmp_path / "state.json")
@@ -163,3 +147,313 @@ def test_pipeline_recreates_vehicle_if_remote_missing(tmp_path: Path) -> None:
     assert report.created_vehicles == [{"vin": "VIN-A", "car_id": "new-VIN-A"}]
     assert state_store.get_car_id("VIN-A") == "new-VIN-A"
     assert "VIN-A" in list(state_store.known_vins())
+
+
+def test_pipeline_runs_concurrently_with_sorted_details(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    for index in range(0, 40, 2):
+        state_store.upsert(f"VIN-{index:03d}", f"id-VIN-{index:03d}", None)
+
+    synchronizer = VehicleSynchronizer(client, state_store, max_workers=4)
+    vehicles = [make_vehicle(f"VIN-{index:03d}", "150000") for index in reversed(range(40))]
+
+    report = synchronizer.run(vehicles)
+
+    assert report.created == 20
+    assert report.updated == 20
+    assert report.errors == []
+    created_vins = [item["vin"] for item in report.created_vehicles]
+    assert created_vins == sorted(created_vins)
+    updated_vins = [item["vin"] for item in report.updated_vehicles]
+    assert updated_vins == sorted(updated_vins)
+    assert all(state_store.get_car_id(f"VIN-{index:03d}") for index in range(40))
+
+
+def test_pipeline_skips_unchanged_vehicles(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    synchronizer = VehicleSynchronizer(client, state_store)
+
+    first = synchronizer.run([make_vehicle("VIN-A", "150000"), make_vehicle("VIN-B", "160000")])
+    assert first.created == 2
+
+    second = synchronizer.run([make_vehicle("VIN-A", "150000"), make_vehicle("VIN-B", "155000")])
+    assert second.unchanged == 1
+    assert second.updated == 1
+    assert second.unchanged_vehicles == [{"vin": "VIN-A", "car_id": "id-VIN-A"}]
+    assert list(client.updated) == ["id-VIN-B"]
+
+    # The fingerprint survives a reload of the state file.
+    reloaded = VehicleSynchronizer(client, VehicleStateStore(tmp_path / "state.json"))
+    third = reloaded.run([make_vehicle("VIN-A", "150000"), make_vehicle("VIN-B", "155000")])
+    assert third.unchanged == 2
+
+    forced = reloaded.run(
+        [make_vehicle("VIN-A", "150000"), make_vehicle("VIN-B", "155000")], force=True
+    )
+    assert forced.unchanged == 0
+    assert forced.updated == 2
+
+
+def test_pipeline_streaming_mode_skips_duplicates(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    state_store.upsert("VIN-OLD", "id-VIN-OLD", None)
+    synchronizer = VehicleSynchronizer(client, state_store)
+
+    def feed():
+        yield make_vehicle("VIN-A", "150000")
+        # The first vehicle is already synchronised before the generator resumes.
+        assert "VIN-A" in client.created
+        yield make_vehicle("VIN-A", "150000")
+        yield make_vehicle("VIN-B", "150000")
+
+    report = synchronizer.run(feed(), close_missing=True, stream=True)
+
+    assert report.created == 2
+    assert report.closed == 1
+    assert report.error_details == [
+        {
+            "vin": "VIN-A",
+            "car_id": None,
+            "error_message": "Duplicate vehicle VIN detected: VIN-A",
+        }
+    ]
+
+
+def test_pipeline_with_sqlite_state_store(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = SqliteVehicleStateStore(tmp_path / "state.sqlite")
+    state_store.upsert("VIN-B", "id-VIN-B", "B")
+
+    synchronizer = VehicleSynchronizer(client, state_store, max_workers=2)
+    report = synchronizer.run(
+        [make_vehicle("VIN-A", "150000"), make_vehicle("VIN-B", "150000")],
+        close_missing=True,
+    )
+
+    assert report.created == 1
+    assert report.updated == 1
+    assert state_store.get_car_id("VIN-A") == "id-VIN-A"
+    state_store.close()
+
+
+def test_pipeline_reports_retry_counts(tmp_path: Path) -> None:
+    class RetryingClient(FakeClient):
+        last_retry_count = 2
+
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    synchronizer = VehicleSynchronizer(RetryingClient(), state_store)
+
+    report = synchronizer.run([make_vehicle("VIN-A", "150000")])
+
+    assert report.created_vehicles == [{"vin": "VIN-A", "car_id": "id-VIN-A", "retries": 2}]
+
+
+def test_pipeline_reports_progress(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    state_store.upsert("VIN-GONE", "id-VIN-GONE", None)
+    snapshots = []
+
+    synchronizer = VehicleSynchronizer(
+        client, state_store, max_workers=2, progress_callback=snapshots.append, progress_interval=0
+    )
+    vehicles = [make_vehicle(f"VIN-{index:03d}", "150000") for index in range(5)]
+    synchronizer.run(vehicles, close_missing=True)
+
+    assert [snapshot.processed for snapshot in snapshots[:-1]] == [1, 2, 3, 4, 5, 6]
+    final = snapshots[-1]
+    assert final.finished
+    assert (final.processed, final.total) == (6, 6)
+    assert (final.created, final.closed, final.errors) == (5, 1, 0)
+    assert final.eta == 0
+
+
+def test_pipeline_reports_stage_timings_and_api_latency(tmp_path: Path) -> None:
+    class SlowClient(FakeClient):
+        def create_vehicle(self, vehicle: Vehicle) -> str:
+            if vehicle.vin == "VIN-SLOW":
+                time.sleep(0.05)
+            return super().create_vehicle(vehicle)
+
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    state_store.upsert("VIN-GONE", "id-VIN-GONE", None)
+    timings = RunTimings()
+    timings.add_stage("csv_parse", 0.25)
+    synchronizer = VehicleSynchronizer(SlowClient(), state_store)
+
+    vehicles = [make_vehicle(f"VIN-{index}", "150000") for index in range(3)]
+    report = synchronizer.run(
+        vehicles + [make_vehicle("VIN-SLOW", "150000")], close_missing=True, timings=timings
+    )
+
+    payload = report.as_dict(include_details=True)["timings"]
+    assert set(payload["stages"]) == {"csv_parse", "sync", "state_save"}
+    assert payload["stages"]["csv_parse"] == 0.25
+    assert payload["total_seconds"] >= payload["stages"]["sync"] >= 0.05
+    assert payload["api_latency"]["create"]["count"] == 4
+    assert payload["api_latency"]["create"]["max"] >= 0.05
+    assert payload["api_latency"]["delete"]["count"] == 1
+    assert payload["slowest_calls"][0]["vin"] == "VIN-SLOW"
+    assert "timings" not in report.as_dict()
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([3.0], 0.99) == 3.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_plan_matches_run_without_calling_api(tmp_path: Path) -> None:
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    state_store.upsert("VIN-SAME", "id-VIN-SAME", None)
+    state_store.upsert("VIN-CHANGED", "id-VIN-CHANGED", None, payload_hash="outdated")
+    state_store.upsert("VIN-GONE", "id-VIN-GONE", None)
+    vehicles = [
+        make_vehicle("VIN-NEW", "150000"),
+        make_vehicle("VIN-SAME", "150000"),
+        make_vehicle("VIN-CHANGED", "150000"),
+    ]
+    state_store.set_payload_hash("VIN-SAME", vehicles[1].payload_fingerprint())
+    client = FakeClient()
+    synchronizer = VehicleSynchronizer(client, state_store)
+
+    plan = synchronizer.plan(vehicles, close_missing=True)
+
+    assert client.created == {} and client.updated == {} and client.deleted == []
+    assert [op.vin for op in plan.creates] == ["VIN-NEW"]
+    assert [op.vin for op in plan.updates] == ["VIN-CHANGED"]
+    assert [op.vin for op in plan.skips] == ["VIN-SAME"]
+    assert [(op.vin, op.car_id) for op in plan.deletes] == [("VIN-GONE", "id-VIN-GONE")]
+    assert plan.request_count == 3
+    assert plan.estimate_duration(latency=0.5) == 1.5
+    assert plan.estimate_duration(rate_limit=1.0, rate_burst=1.0, concurrency=8) == 2.0
+    assert synchronizer.plan(vehicles, force=True).as_dict()["update"] == 2
+
+    report = synchronizer.run(vehicles, close_missing=True)
+    assert (report.created, report.updated, report.unchanged, report.closed) == (1, 1, 1, 1)
+
+
+class CrashingClient(FakeClient):
+    def __init__(self, crash_after: int) -> None:
+        super().__init__()
+        self.crash_after = crash_after
+
+    def create_vehicle(self, vehicle: Vehicle) -> str:
+        if len(self.created) == self.crash_after:
+            raise SystemExit("killed")
+        return super().create_vehicle(vehicle)
+
+
+def test_interrupted_run_resumes_from_journal(tmp_path: Path) -> None:
+    vehicles = [make_vehicle(f"VIN-{index}", "150000") for index in range(5)]
+    journal = RunJournal.create(tmp_path / "runs", {"close_missing": False})
+    crashing = CrashingClient(crash_after=3)
+
+    with pytest.raises(SystemExit):
+        VehicleSynchronizer(crashing, VehicleStateStore(tmp_path / "state.json")).run(
+            vehicles, journal=journal
+        )
+    journal.close()
+    with journal.path.open("a", encoding="utf-8") as handle:
+        handle.write('{"action": "crea')  # line cut short by the crash
+    # The JSON state was never saved, but the journal kept the created ids.
+    assert not (tmp_path / "state.json").exists()
+
+    resumed = RunJournal.resume(tmp_path / "runs", journal.run_id)
+    assert resumed.completed_count == 3
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    report = VehicleSynchronizer(client, state_store).run(vehicles, journal=resumed)
+    reopened = RunJournal.resume(tmp_path / "runs", journal.run_id)
+    assert reopened.completed_count == 5
+    reopened.close()
+    resumed.finish()
+
+    assert sorted(client.created) == ["VIN-3", "VIN-4"]
+    assert report.created == 5
+    assert all(state_store.get_car_id(f"VIN-{index}") == f"id-VIN-{index}" for index in range(5))
+    assert state_store.get_payload_hash("VIN-0") == vehicles[0].payload_fingerprint()
+    assert not resumed.path.exists()
+
+
+@pytest.fixture()
+def sync_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("IZZYLEASE_API_BASE_URL", "https://api.invalid")
+    monkeypatch.setenv("IZZYLEASE_CLIENT_ID", "id")
+    monkeypatch.setenv("IZZYLEASE_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("IZZYLEASE_STATE_FILE", str(tmp_path / "state.json"))
+    for name in ("first.csv", "second.csv"):
+        (tmp_path / name).write_text("vin\n", encoding="utf-8")
+    return tmp_path / "runs"
+
+
+def test_resume_rejects_a_different_csv(tmp_path: Path, sync_env: Path) -> None:
+    journal = RunJournal.create(sync_env, {"csv": str(tmp_path / "first.csv")})
+    journal.close()
+
+    result = CliRunner().invoke(
+        cli, ["sync", str(tmp_path / "second.csv"), "--resume", journal.run_id]
+    )
+
+    assert result.exit_code == 2
+    assert f"Run {journal.run_id} was started with" in result.output
+    assert RunJournal.resume(sync_env, journal.run_id).completed_count == 0
+
+
+def test_failed_csv_load_leaves_no_journal(
+    tmp_path: Path, sync_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broken_load(*args, **kwargs):
+        raise OSError("unreadable")
+
+    monkeypatch.setattr(sys.modules["izzy_uploader.cli"], "load_vehicles_from_csv", broken_load)
+
+    result = CliRunner().invoke(cli, ["sync", str(tmp_path / "first.csv")])
+
+    assert isinstance(result.exception, OSError)
+    assert not sync_env.exists() or not any(sync_env.iterdir())
+
+
+def test_close_missing_deletes_concurrently_within_ratio(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    for index in range(10):
+        state_store.upsert(f"VIN-{index}", f"id-VIN-{index}", None)
+    vehicles = [make_vehicle(f"VIN-{index}", "150000") for index in range(7)]
+
+    report = VehicleSynchronizer(client, state_store, max_workers=4).run(
+        vehicles, close_missing=True, max_delete_ratio=0.3
+    )
+
+    assert report.errors == []
+    assert sorted(client.deleted) == ["id-VIN-7", "id-VIN-8", "id-VIN-9"]
+    assert [item["vin"] for item in report.deleted_vehicles] == ["VIN-7", "VIN-8", "VIN-9"]
+
+
+def test_close_missing_aborts_before_any_request_over_ratio(tmp_path: Path) -> None:
+    client = FakeClient()
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    for index in range(10):
+        state_store.upsert(f"VIN-{index}", f"id-VIN-{index}", None)
+    truncated = [make_vehicle("VIN-0", "150000"), make_vehicle("VIN-NEW", "150000")]
+    synchronizer = VehicleSynchronizer(client, state_store, max_workers=4)
+
+    report = synchronizer.run(truncated, close_missing=True, max_delete_ratio=0.5)
+
+    assert client.created == {} and client.updated == {} and client.deleted == []
+    assert report.errors and "Refusing to close 9 of 10 vehicles" in report.errors[0]
+    plan = synchronizer.plan(truncated, close_missing=True, max_delete_ratio=0.5)
+    assert plan.request_count == 0 and len(plan.errors) == 1
+
+    # Streaming cannot check up front, but still refuses before deleting anything.
+    streamed = synchronizer.run(truncated, close_missing=True, max_delete_ratio=0.5, stream=True)
+    assert client.deleted == []
+    assert streamed.created == 1
+    assert "Refusing to close" in streamed.errors[0]
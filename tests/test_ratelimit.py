@@ -0,0 +1,47 @@
+from typing import List
+
+from izzy_uploader.ratelimit import TokenBucket
+from conftest import FakeClock
+
+
+def test_bucket_allows_burst_then_paces_requests() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    clock.now = 5.0
+    assert bucket.reserve() == 0.0
+
+
+def test_acquire_sleeps_for_reserved_delay() -> None:
+    clock = FakeClock()
+    sleeps: List[float] = []
+    bucket = TokenBucket(rate=4.0, burst=1, clock=clock, sleep=sleeps.append)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert sleeps == [0.25]
+
+
+def test_bucket_backs_off_on_throttling_and_recovers() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10.0, clock=clock, recovery_step=1.0)
+
+    bucket.on_throttled()
+    assert bucket.rate == 5.0
+    # Further 429s within the cooldown come from requests already in flight.
+    bucket.on_throttled()
+    assert bucket.rate == 5.0
+
+    clock.now = 2.0
+    bucket.on_throttled()
+    assert bucket.rate == 2.5
+
+    for _ in range(200):
+        bucket.on_success()
+    assert bucket.rate == 10.0
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask")
+
+from izzy_uploader_web.reports import ReportStore  # noqa: E402
+
+
+def test_report_store_round_trip_and_pagination(tmp_path: Path) -> None:
+    store = ReportStore(tmp_path / "reports.sqlite")
+    ids = [store.add({"created": index, "detail": {}}, {"created": index}) for index in range(5)]
+
+    entry, body = store.get(ids[2])
+    assert json.loads(body) == {"created": 2, "detail": {}}
+    assert entry.filename == f"report_{ids[2]}.json"
+    assert entry.summary == {"created": 2}
+
+    # Another store instance (another gunicorn worker) sees the same reports.
+    other = ReportStore(tmp_path / "reports.sqlite")
+    first_page, total = other.list_reports(page=1, per_page=2)
+    assert total == 5
+    assert [item.summary["created"] for item in first_page] == [4, 3]
+    last_page, _ = other.list_reports(page=3, per_page=2)
+    assert [item.summary["created"] for item in last_page] == [0]
+    assert other.get("missing") is None
+
+
+def test_report_store_evicts_oldest_and_expired(tmp_path: Path) -> None:
+    store = ReportStore(tmp_path / "reports.sqlite", max_reports=2)
+    ids = [store.add({"index": index}, {}) for index in range(3)]
+
+    assert store.get(ids[0]) is None
+    assert store.get(ids[2]) is not None
+    assert store.list_reports()[1] == 2
+
+    expired = ReportStore(tmp_path / "reports.sqlite", ttl=-1)
+    assert expired.get(ids[2]) is None
+    assert expired.evict() == 2
+
+
+def test_report_store_compresses_reports(tmp_path: Path) -> None:
+    store = ReportStore(tmp_path / "reports.sqlite")
+    report = {"errors": ["update failed: status 500"] * 500}
+    report_id = store.add(report, {})
+
+    entry, body = store.get(report_id)
+    assert entry.size < len(body) / 10
+    assert json.loads(body) == report
+
+
+def test_reports_are_listed_and_downloadable_from_any_app(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("IZZY_UPLOADER_DATA_DIR", str(tmp_path))
+    from izzy_uploader_web.app import create_app
+
+    report_id = ReportStore(tmp_path / "reports.sqlite").add(
+        {"created": 7}, {"created": 7, "updated": 0, "unchanged": 0, "closed": 0, "errors": 0}
+    )
+    client = create_app(start_worker=False).test_client()
+
+    listing = client.get("/reports")
+    assert listing.status_code == 200
+    assert f"/download/{report_id}" in listing.get_data(as_text=True)
+
+    download = client.get(f"/download/{report_id}")
+    assert download.status_code == 200
+    assert json.loads(download.data) == {"created": 7}
+    assert client.get("/download/unknown").status_code == 302
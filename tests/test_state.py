@@ -0,0 +1,59 @@
+import sqlite3
+from pathlib import Path
+
+from izzy_uploader.state import (
+    SqliteVehicleStateStore,
+    VehicleStateStore,
+    migrate_json_state,
+    open_state_store,
+)
+
+
+def test_sqlite_store_commits_each_change(tmp_path: Path) -> None:
+    path = tmp_path / "state.sqlite"
+    store = SqliteVehicleStateStore(path)
+    store.upsert("VIN-A", "id-A", "CONF-A", payload_hash="hash-a")
+    store.upsert("VIN-B", "id-B", "CONF-B")
+    store.mark_deleted("VIN-B")
+
+    # Another connection sees the rows without any call to save().
+    with sqlite3.connect(str(path)) as conn:
+        rows = conn.execute("SELECT vin, car_id, active FROM vehicles ORDER BY vin").fetchall()
+    assert rows == [("VIN-A", "id-A", 1), ("VIN-B", "id-B", 0)]
+
+    assert store.get_payload_hash("VIN-A") == "hash-a"
+    assert store.get_payload_hash("VIN-B") is None
+    assert list(store.known_vins()) == ["VIN-A"]
+    assert store.vin_for_configuration_number("CONF-B") == "VIN-B"
+    store.close()
+
+
+def test_open_state_store_selects_backend_by_suffix(tmp_path: Path) -> None:
+    json_store = open_state_store(tmp_path / "state.json")
+    sqlite_store = open_state_store(tmp_path / "state.db")
+    forced_store = open_state_store(tmp_path / "state.json", "sqlite")
+
+    assert isinstance(json_store, VehicleStateStore)
+    assert isinstance(sqlite_store, SqliteVehicleStateStore)
+    assert isinstance(forced_store, SqliteVehicleStateStore)
+    sqlite_store.close()
+    forced_store.close()
+
+
+def test_migrate_json_state_copies_entries(tmp_path: Path) -> None:
+    source = tmp_path / "state.json"
+    json_store = VehicleStateStore(source)
+    json_store.upsert("VIN-A", "id-A", "CONF-A", payload_hash="hash-a")
+    json_store.upsert("VIN-B", "id-B", None)
+    json_store.mark_deleted("VIN-B")
+    json_store.save()
+
+    migrated = migrate_json_state(source, tmp_path / "state.sqlite")
+
+    assert migrated == 2
+    store = SqliteVehicleStateStore(tmp_path / "state.sqlite")
+    assert store.get_car_id("VIN-A") == "id-A"
+    assert store.get_car_id("VIN-B") == "id-B"
+    assert store.get_payload_hash("VIN-A") == "hash-a"
+    assert list(store.known_vins()) == ["VIN-A"]
+    store.close()
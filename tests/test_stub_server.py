@@ -0,0 +1,142 @@
+import http.client
+import json
+import random
+import threading
+from pathlib import Path
+from typing import Iterator, List
+from urllib import request
+
+import pytest
+
+from izzy_uploader.client import ApiError, IzzyleaseClient
+from izzy_uploader.pipelines.import_pipeline import VehicleSynchronizer
+from izzy_uploader.retry import RetryPolicy
+from izzy_uploader.state import VehicleStateStore
+from izzy_uploader.stub_server import FaultInjection, LatencyModel, StubApiServer
+from conftest import make_vehicle
+
+
+@pytest.fixture()
+def stub() -> Iterator[StubApiServer]:
+    with StubApiServer(seed=7) as server:
+        yield server
+
+
+def test_pipeline_round_trip_through_stub(stub: StubApiServer, tmp_path: Path) -> None:
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    vehicles = [make_vehicle(f"VIN-{index}", "150000") for index in range(6)]
+
+    with IzzyleaseClient(stub.service_config(tmp_path / "state.json")) as client:
+        synchronizer = VehicleSynchronizer(client, state_store, max_workers=3)
+        first = synchronizer.run(vehicles)
+        changed = vehicles[:5] + [make_vehicle("VIN-5", "140000")]
+        second = synchronizer.run(changed[1:], close_missing=True)
+
+    assert first.created == 6 and first.errors == []
+    assert (second.updated, second.unchanged, second.closed) == (1, 4, 1)
+    assert len(stub.cars) == 5
+    stats = stub.stats.snapshot()
+    assert stats["tokens_issued"] == 1
+    assert stats["requests"] == {
+        "POST /oauth/token": 1,
+        "POST /external/cars": 6,
+        "PUT /external/cars/{id}": 1,
+        "DELETE /external/cars/{id}": 1,
+    }
+    with request.urlopen(f"{stub.url}/__stats") as response:
+        assert json.loads(response.read())["total_requests"] == 9
+
+
+def test_stub_rejects_unknown_tokens_and_cars(stub: StubApiServer, tmp_path: Path) -> None:
+    with IzzyleaseClient(stub.service_config(tmp_path / "state.json")) as client:
+        with pytest.raises(ApiError) as excinfo:
+            client.update_vehicle("missing", make_vehicle("VIN-1", "150000"))
+    assert excinfo.value.status == 404
+
+    req = request.Request(f"{stub.url}/external/cars", data=b"{}", method="POST")
+    with pytest.raises(Exception) as unauthorised:
+        request.urlopen(req)
+    assert getattr(unauthorised.value, "code", None) == 401
+
+
+def test_injected_faults_are_retried(tmp_path: Path) -> None:
+    faults = FaultInjection(server_error_rate=0.3, throttle_rate=0.2, retry_after=0)
+    with StubApiServer(faults=faults, seed=3) as stub:
+        config = stub.service_config(tmp_path / "state.json")
+        client = IzzyleaseClient(
+            config, retry_policy=RetryPolicy(max_attempts=8, base_delay=0), sleep=lambda _: None
+        )
+        with client:
+            report = VehicleSynchronizer(client, VehicleStateStore(tmp_path / "s.json")).run(
+                [make_vehicle(f"VIN-{index}", "150000") for index in range(10)]
+            )
+        stats = stub.stats.snapshot()
+
+    # Creates are POSTs: retried after 429s, but not after a 503 without Retry-After.
+    assert report.created + len(report.errors) == 10
+    assert stats["injected_faults"]
+    assert stats["statuses"]["201"] == report.created
+
+
+def test_revoked_token_is_refreshed_once_and_requests_replayed(
+    stub: StubApiServer, tmp_path: Path
+) -> None:
+    state_store = VehicleStateStore(tmp_path / "state.json")
+    with IzzyleaseClient(stub.service_config(tmp_path / "state.json")) as client:
+        synchronizer = VehicleSynchronizer(client, state_store, max_workers=4)
+        synchronizer.run([make_vehicle("VIN-0", "150000")])
+        stub.revoke_tokens()
+        report = synchronizer.run(
+            [make_vehicle(f"VIN-{index}", "140000") for index in range(12)]
+        )
+
+    stats = stub.stats.snapshot()
+    assert report.errors == []
+    assert (report.created, report.updated) == (11, 1)
+    assert stats["tokens_issued"] == 2
+    assert 1 <= stats["statuses"]["401"] <= 4  # at most one per worker in flight
+
+
+def test_stub_accepts_a_burst_of_concurrent_connections() -> None:
+    errors: List[str] = []
+    with StubApiServer(latency=LatencyModel("fixed", 0.1)) as stub:
+        host, port = stub.url.rsplit("/", 1)[1].split(":")
+        barrier = threading.Barrier(100)
+
+        def fetch_token() -> None:
+            barrier.wait()
+            connection = http.client.HTTPConnection(host, int(port), timeout=5)
+            try:
+                connection.request(
+                    "POST",
+                    "/oauth/token",
+                    body=f"grant_type=client_credentials&client_id={stub.client_id}"
+                    f"&client_secret={stub.client_secret}",
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                )
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append(str(response.status))
+            except OSError as exc:
+                errors.append(repr(exc))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=fetch_token) for _ in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+
+
+def test_latency_models() -> None:
+    rng = random.Random(1)
+    assert LatencyModel.parse("0.25").sample(rng) == 0.25
+    assert 0.01 <= LatencyModel.parse("uniform:0.01,0.02").sample(rng) <= 0.02
+    samples = [LatencyModel.parse("lognormal:0.05,0.5").sample(rng) for _ in range(200)]
+    assert min(samples) > 0 and sorted(samples)[100] == pytest.approx(0.05, rel=0.3)
+    with pytest.raises(ValueError):
+        LatencyModel.parse("bogus:1,2,3")